@@ -4,16 +4,69 @@ with one slide per Viva Goals object.
 """
 
 import os
-from pptx import Presentation
-from openpyxl import load_workbook
-from pptx.dml.color import RGBColor
-from pptx.util import Inches, Pt
-from pptx.enum.shapes import MSO_CONNECTOR
-from pptx.enum.text import MSO_AUTO_SIZE
-from pptx.enum.shapes import MSO_SHAPE
+from operator import attrgetter, itemgetter
 import re
 import json
-import argparse
+import hashlib
+import time
+from contextlib import contextmanager
+from biz_plan_cache import DiskCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, file_digest
+
+
+class LazyImport:
+    """
+    A name from python-pptx or openpyxl that is imported the first time it is called or used.
+
+    Importing those libraries takes most of the startup time, so they are only imported once a
+    stage needs them; --help, argument errors and importing this module do not pay for them.
+    Once imported, the module global holding the LazyImport is replaced by the real object.
+
+    Args:
+        module (str): The module the name is imported from.
+        name (str): The name of the module global, which is also the imported name.
+    """
+    __slots__ = ('module', 'name')
+
+    def __init__(self, module, name):
+        self.module = module
+        self.name = name
+
+    def resolve(self):
+        """Import the name, and replace this LazyImport by it in the module globals."""
+        from importlib import import_module
+
+        value = getattr(import_module(self.module), self.name)
+        if globals().get(self.name) is self:
+            globals()[self.name] = value
+        return value
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attribute):
+        if attribute.startswith('__'):
+            raise AttributeError(attribute)
+        return getattr(self.resolve(), attribute)
+
+    def __repr__(self):
+        return f"LazyImport({self.module!r}, {self.name!r})"
+
+
+Presentation = LazyImport('pptx', 'Presentation')
+load_workbook = LazyImport('openpyxl', 'load_workbook')
+RGBColor = LazyImport('pptx.dml.color', 'RGBColor')
+Inches = LazyImport('pptx.util', 'Inches')
+Pt = LazyImport('pptx.util', 'Pt')
+MSO_CONNECTOR = LazyImport('pptx.enum.shapes', 'MSO_CONNECTOR')
+MSO_AUTO_SIZE = LazyImport('pptx.enum.text', 'MSO_AUTO_SIZE')
+MSO_SHAPE = LazyImport('pptx.enum.shapes', 'MSO_SHAPE')
+
+
+def import_dependencies():
+    """Import every lazily imported name now, such as in a worker process that is started ahead of its jobs."""
+    for value in list(globals().values()):
+        if isinstance(value, LazyImport):
+            value.resolve()
 
 SOURCE_WORKBOOK = 'VivaGoals.xlsx'
 TEMPLATE_POWERPOINT = 'template.pptx'
@@ -22,6 +75,64 @@ INITIATIVE_IMAGE = 'initiative.png'
 OUTCOME_IMAGE = 'outcome.png'
 TARGET_BIZPLAN_POWERPOINT = 'bizplan.pptx'
 
+# Workbook readers
+OPENPYXL_READER = 'openpyxl'
+NATIVE_READER = 'native'
+WORKBOOK_READERS = [OPENPYXL_READER, NATIVE_READER]
+
+# Slide render engines
+SHAPES_ENGINE = 'shapes'
+PROTOTYPE_ENGINE = 'prototype'
+RENDER_ENGINES = [SHAPES_ENGINE, PROTOTYPE_ENGINE]
+
+# Conversion stages reported to main's progress callback
+LOADED_STAGE = 'loaded'
+SORTED_STAGE = 'sorted'
+RENDERED_STAGE = 'rendered'
+SAVED_STAGE = 'saved'
+
+# Conversion phases timed by ConversionHooks.phase, in the order main runs them
+LOAD_PHASE = 'load'
+SORT_PHASE = 'sort'
+TEMPLATE_PHASE = 'template'
+RENDER_PHASE = 'render'
+SAVE_PHASE = 'save'
+PHASES = (LOAD_PHASE, SORT_PHASE, TEMPLATE_PHASE, RENDER_PHASE, SAVE_PHASE)
+
+# Events of ConversionHooks
+PHASE_STARTED_EVENT = 'phase_started'
+PHASE_FINISHED_EVENT = 'phase_finished'
+SLIDE_RENDERED_EVENT = 'slide_rendered'
+HOOK_EVENTS = (PHASE_STARTED_EVENT, PHASE_FINISHED_EVENT, SLIDE_RENDERED_EVENT)
+
+# Hot-path operations counted while count_operations is active, so tests can check how they scale
+REGEX_EVALUATIONS = 'regex_evaluations'
+GOAL_LOOKUPS = 'goal_lookups'
+SHAPES_CREATED = 'shapes_created'
+FILE_READS = 'file_reads'
+SLIDE_LIST_SCANS = 'slide_list_scans'
+OPERATIONS = (REGEX_EVALUATIONS, GOAL_LOOKUPS, SHAPES_CREATED, FILE_READS, SLIDE_LIST_SCANS)
+
+# Bump when parsing or ordering changes, so goals cached by earlier versions are not used
+PARSER_VERSION = 3
+
+# Bump when slide rendering changes, so incremental runs do not copy slides made by older versions
+RENDER_VERSION = 1
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = '.manifest.json'
+# Goal fields that show on a slide, besides the alignment text; a goal whose slide text is unchanged
+# keeps its slide in incremental runs
+FINGERPRINT_FIELDS = ('tag', 'title', 'object_type', 'metric_name', 'target', 'owner', 'schedule', 'status',
+                      'description', 'okr_link')
+
+# Workbooks at least this big are streamed in read-only mode unless told otherwise
+LARGE_WORKBOOK_BYTES = 5 * 1024 * 1024
+
+# Most goals in one shard rendered by a worker process, and shards in flight per worker, which bound
+# the rendered slides that wait in the parent process to be merged
+WORKER_SHARD_GOALS = 250
+SHARDS_IN_FLIGHT_PER_WORKER = 2
+
 THEME_TAG = "Theme"
 
 OBJECTIVE_TYPE = "Objective"
@@ -33,8 +144,60 @@ THEME_SLIDE_MASTER_LAYOUT = 3
 OKR_SLIDE_MASTER = 2
 OKR_SLIDE_MASTER_LAYOUT = 11
 
+# Columns of the Viva Goals export read into each VivaGoal
+GOAL_COLUMNS = ['Id', 'Title', 'Tag', 'Owner', 'Period', 'Start Date', 'End Date', 'Description',
+                'Aligned To (weight, Objective ID)', 'Metric Name', 'Target', 'Object Type', 'Status']
+
+OKR_ID_PATTERN = re.compile(r'"(.*?)"')
+ALIGNMENT_PATTERN = re.compile(r"\(weight: \d+(?:\.\d+)?%, Id: (\d+)\)")
+
+# Font color of the MWB alignment line
+MWB_COLOR = (0, 176, 240)
+
+# Sort key priorities, see goal_sort_key
+FIRST_PRIORITY = 0
+SECOND_PRIORITY = 1
+
 # Global variables
 goals_dict = {}
+# Operation counts while count_operations is active, otherwise None
+_operation_counts = None
+
+
+def count_operation(operation, count=1):
+    """Add to the count of one of OPERATIONS while count_operations is active."""
+    if _operation_counts is not None:
+        _operation_counts[operation] += count
+
+
+@contextmanager
+def count_operations():
+    """
+    Count the hot-path operations of conversions run in the block, in every thread of this process.
+
+    Operations of worker processes are not counted. Blocks may be nested; an outer block also
+    counts the operations of inner ones.
+
+    Yields:
+        Counter: The count of each of OPERATIONS, updated as the block runs.
+    """
+    global _operation_counts
+    from collections import Counter
+
+    outer = _operation_counts
+    counts = _operation_counts = Counter()
+    try:
+        yield counts
+    finally:
+        _operation_counts = outer
+        if outer is not None:
+            outer.update(counts)
+
+
+def _file_digest(path):
+    """Return file_digest(path), counted as a file read."""
+    count_operation(FILE_READS)
+    return file_digest(path)
 
 
 class SquareDimensions:
@@ -52,32 +215,76 @@ class LineDimensions:
         self.width = Inches(width)
 
 
+class ColumnMap:
+    """
+    Positions of the GOAL_COLUMNS in a header row, resolved once per sheet.
+
+    Args:
+        headers (list): The header row of the sheet.
+
+    Raises:
+        ValueError: If one of the GOAL_COLUMNS is missing from the header row.
+    """
+    __slots__ = ('positions', 'values')
+
+    def __init__(self, headers):
+        positions = []
+        for name in GOAL_COLUMNS:
+            try:
+                positions.append(headers.index(name))
+            except ValueError:
+                raise ValueError(f"Column not found in header row: {name}")
+        self.positions = tuple(positions)
+        # Returns the GOAL_COLUMNS values of a row, in order
+        self.values = itemgetter(*self.positions)
+
+
 class VivaGoal:
+    __slots__ = ('okr_id', 'title', 'tag', 'owner', 'schedule', 'start_date', 'end_date', 'description',
+                 'alignment', 'metric_name', 'target', 'object_type', 'status', 'row_number',
+                 'okr_link', 'goal_id')
+    _slot_values = attrgetter(*__slots__)
+
     def __init__(self, row, headers, row_number):
-        self.okr_id = row[headers.index('Id')]
-        self.title = row[headers.index('Title')]
-        self.tag = row[headers.index('Tag')]
-        self.owner = row[headers.index('Owner')]
-        self.schedule = row[headers.index('Period')]
-        self.start_date = row[headers.index('Start Date')]
-        self.end_date = row[headers.index('End Date')]
-        self.description = row[headers.index('Description')]
-        self.alignment = row[headers.index('Aligned To (weight, Objective ID)')]
-        self.metric_name = row[headers.index('Metric Name')]
-        self.target = row[headers.index('Target')]
-        self.object_type = row[headers.index('Object Type')]
-        self.status = row[headers.index('Status')]
+        columns = headers if isinstance(headers, ColumnMap) else ColumnMap(headers)
+        (self.okr_id, self.title, self.tag, self.owner, self.schedule, self.start_date, self.end_date,
+         self.description, self.alignment, self.metric_name, self.target, self.object_type,
+         self.status) = columns.values(row)
         self.row_number = row_number  # Add row number attribute
+        # The Id cell holds the goal link and id; parse it once here instead of on every use
+        self.okr_link, self.goal_id = OKRId.parse(self.okr_id)
+
+    # Pickle as a plain tuple of slot values, which is much faster to load from the cache
+    # than the default {slot: value} state
+    def __getstate__(self):
+        return VivaGoal._slot_values(self)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
 
 class OKRId:
+    __slots__ = ('okr_link', 'okr_id')
+
     def __init__(self, okr_id_str):
-        matches = re.findall(r'"(.*?)"', okr_id_str)
+        self.okr_link, self.okr_id = self.parse(okr_id_str)
+
+    @staticmethod
+    def parse(okr_id_str):
+        """
+        Parse the link and id out of a Viva Goals Id cell.
+
+        Args:
+            okr_id_str (str): The Id cell value, e.g. '=HYPERLINK("https://...", "123")'.
+
+        Returns:
+            tuple: The link and the id, or two empty strings if the value has no link and id.
+        """
+        count_operation(REGEX_EVALUATIONS)
+        matches = OKR_ID_PATTERN.findall(okr_id_str)
         if len(matches) == 2:
-            self.okr_link = matches[0]
-            self.okr_id = matches[1]
-        else:
-            self.okr_link = ""
-            self.okr_id = ""
+            return matches[0], matches[1]
+        return "", ""
 
 def flip_bool_attribute(obj, attribute):
     """
@@ -134,53 +341,144 @@ def add_paragraph_with_text(text_frame, text, bold=False, font_size=14, level=0,
     p.level = level
     return p
 
-def add_text_block_to_slide(text_frame, text_block_json):
+class TextBlock:
     """
-    Add a text block to a slide from a JSON string.
+    A text block that is parsed and validated once and can then be added to any number of text frames.
+
+    Each element is a paragraph, or a run when "is_run" is true, with optional "bold", "font_size",
+    "level" and "font_color" ([r, g, b]) keys. Its text is either fixed ("text") or the name of a
+    value supplied when the block is added ("field"). The paragraphs are built once with
+    add_paragraph_with_text and add_run_with_text and copied into each text frame, so adding a
+    block only fills in the field values.
+
+    Args:
+        elements (list): The element dicts of the text block.
+
+    Raises:
+        ValueError: If the first element is a run or an element is malformed.
+    """
+    __slots__ = ('elements', 'fields', '_paragraphs')
+
+    def __init__(self, elements):
+        for index, element in enumerate(elements):
+            if not isinstance(element, dict):
+                raise ValueError(f"Text block element {index} must be an object")
+            if index == 0 and element.get('is_run', False):
+                raise ValueError("The first element cannot be a run. Add a paragraph first.")
+            if ('text' in element) == ('field' in element):
+                raise ValueError(f"Text block element {index} must have either a text or a field")
+            if 'font_color' in element and len(element['font_color']) != 3:
+                raise ValueError(f"Text block element {index} font_color must be [r, g, b]")
+        self.elements = [dict(element) for element in elements]
+        self.fields = tuple(dict.fromkeys(element['field'] for element in self.elements if 'field' in element))
+        self._paragraphs = None
+
+    @classmethod
+    def from_json(cls, text_block_json):
+        """
+        Parse a text block from a JSON string of the form {"elements": [...]}.
+
+        Args:
+            text_block_json (str): The JSON string representing the text block.
+
+        Raises:
+            json.JSONDecodeError: If the string is not valid JSON.
+            KeyError: If the JSON has no "elements" array.
+            ValueError: If the first element is a run or an element is malformed.
+
+        Returns:
+            TextBlock: The text block.
+        """
+        return cls(json.loads(text_block_json)['elements'])
+
+    def _compile(self):
+        """Build the paragraph XML of the block, with empty runs where field values go."""
+        from pptx.oxml.text import CT_TextBody
+        from pptx.text.text import TextFrame
+
+        text_frame = TextFrame(CT_TextBody.new_a_txBody(), None)
+        paragraphs = []
+        p = None
+        for element in self.elements:
+            text = element.get('text', "")
+            if element.get('is_run', False):
+                run = add_run_with_text(p, text, element.get('bold', False), element.get('font_size', 14))
+                if 'font_color' in element:
+                    run.font.fill.solid()
+                    run.font.fill.fore_color.rgb = RGBColor(*element['font_color'])
+                run_index = len(p._p.r_lst) - 1
+            else:
+                p = add_paragraph_with_text(text_frame, text, element.get('bold', False), element.get('font_size', 14), element.get('level', 0))
+                if 'font_color' in element:
+                    p.font.fill.solid()
+                    p.font.fill.fore_color.rgb = RGBColor(*element['font_color'])
+                paragraphs.append((p._p, []))
+                run_index = 0
+            if 'field' in element:
+                paragraphs[-1][1].append((run_index, element['field']))
+        return paragraphs
+
+    def add_to(self, text_frame, values=None):
+        """
+        Add the text block to a text frame.
+
+        Args:
+            text_frame (TextFrame): The text frame to which the text block is to be added.
+            values (dict, optional): The text for each field of the block. Defaults to None.
+
+        Raises:
+            ValueError: If a field of the block has no value.
+        """
+        from copy import deepcopy
+
+        if self._paragraphs is None:
+            self._paragraphs = self._compile()
+        values = values or {}
+        txBody = text_frame._txBody
+        for p_template, slots in self._paragraphs:
+            p = deepcopy(p_template)
+            if slots:
+                runs = p.r_lst
+                for run_index, field in slots:
+                    try:
+                        runs[run_index].text = values[field]
+                    except KeyError:
+                        raise ValueError(f"No value for text block field: {field}")
+            txBody.append(p)
+
+def add_text_block_to_slide(text_frame, text_block, values=None):
+    """
+    Add a text block to a slide.
     The motivation of this function is to express content to be adding more descriptively rather than imperatively.
 
     Args:
         text_frame (TextFrame): The text frame to which the text block is to be added.
-        text_block_json (str): The JSON string representing the text block.
+        text_block (TextBlock or str): The text block, or a JSON string representing it.
+        values (dict, optional): The text for each field of the block. Defaults to None.
 
     Raises:
         ValueError: If the first element in the text block is a run.
     """
-    text_block = json.loads(text_block_json)
-    p = None
-    for element in text_block['elements']:
-        if element.get('is_run', False):
-            if p is None:
-                raise ValueError("The first element cannot be a run. Add a paragraph first.")
-            run = add_run_with_text(p, element['text'], element.get('bold', False), element.get('font_size', 14))
-            if 'font_color' in element:
-                run.font.fill.solid()
-                run.font.fill.fore_color.rgb = RGBColor(*element['font_color'])
-        else:
-            p = add_paragraph_with_text(
-                text_frame,
-                element['text'],
-                element.get('bold', False),
-                element.get('font_size', 14),
-                element.get('level', 0)
-            )
-            if 'font_color' in element:
-                p.font.fill.solid()
-                p.font.fill.fore_color.rgb = RGBColor(*element['font_color'])
-
-def get_goal_by_id(okr_id):
+    if isinstance(text_block, str):
+        text_block = TextBlock.from_json(text_block)
+    text_block.add_to(text_frame, values)
+
+def get_goal_by_id(okr_id, context=None):
     """
     Get a goal by its OKR ID.
 
     Args:
         okr_id (str): The OKR ID of the goal.
+        context (ConversionContext, optional): The conversion to look in. Defaults to None,
+            which looks in the module-level goals_dict.
 
     Returns:
         VivaGoal: The goal object if found, otherwise None.
     """
-    global goals_dict
+    count_operation(GOAL_LOOKUPS)
+    goals_by_id = goals_dict if context is None else context.goals_by_id
     try:
-        return goals_dict[okr_id]
+        return goals_by_id[okr_id]
     except KeyError:
         return None
 
@@ -199,52 +497,39 @@ def get_theme_goal_by_id(goals):
             return goal
     return None
 
-def get_parent_goals_from_alignment(goal):
+def get_parent_goals_from_alignment(goal, context=None):
     """
     Get the parent goals from the alignment string of a goal.
 
     Args:
         goal (VivaGoal): The goal object.
+        context (ConversionContext, optional): The conversion to look the parents up in.
+            Defaults to None, which looks in the module-level goals_dict.
 
     Returns:
         list: A list of parent goal objects.
     """
     parent_goals = []
-    pattern = r"\(weight: \d+(\.\d+)?%, Id: (\d+)\)"
-    matches = re.findall(pattern, goal.alignment)
+    count_operation(REGEX_EVALUATIONS)
+    matches = ALIGNMENT_PATTERN.findall(goal.alignment)
     for match in matches:
-        parent_goal = get_goal_by_id(match[1])
+        parent_goal = get_goal_by_id(match, context)
         if parent_goal:
             parent_goals.append(parent_goal)
     return parent_goals
 
-def goal_sort_key(goal):
+def _local_sort_key(goal, parent_goals):
     """
-    Custom sorting function to ensure goals are shown in the following order:
-    Theme, [Outcome,] Objective, [Outcome,] Action [, Theme, [Outcome,] Objective, [Outcome,] Action]
-    Notice if there's Objective and Outcome linked to the same Theme, Outcome is shown first.
-    If there's Outcome and Action linked to the same Objective, Outcome is shown first.
-
-    Args:
-        goal (VivaGoal): The goal object to be sorted.
+    Return the sort key of a goal that does not depend on its parent's key, or None if it does.
 
     Raises:
-        ValueError: If more than one parent goal is found in alignment for an outcome or action.
-        ValueError: If no parent goal is found in alignment for an action.
-        ValueError: If object_type is not one of the valid types (Objective, Outcome, Action).
-
-    Returns:
-        tuple: A tuple representing the sort key for the goal.
+        ValueError: If the goal's object type or alignment is invalid.
     """
-    FIRST_PRIORITY = 0
-    SECOND_PRIORITY = 1
-
     # Validate object type
     valid_types = [OBJECTIVE_TYPE, OUTCOME_TYPE, ACTION_TYPE]
     if goal.object_type not in valid_types:
         raise ValueError(f"Invalid object type: {goal.object_type}. Must be one of {valid_types}")
 
-    parent_goals = get_parent_goals_from_alignment(goal)
     if goal.object_type == OBJECTIVE_TYPE:
         theme = get_theme_goal_by_id(parent_goals)
         if theme:
@@ -253,46 +538,530 @@ def goal_sort_key(goal):
         theme = get_theme_goal_by_id(parent_goals)
         if theme:
             return (theme.row_number, FIRST_PRIORITY, goal.row_number) + (FIRST_PRIORITY,) * 2
-        if parent_goals and len(parent_goals) > 1:
+        if not parent_goals:
+            raise ValueError("No parent goal found in alignment for outcome: " + goal.title)
+        if len(parent_goals) > 1:
             raise ValueError("More than one parent goal found in alignment for outcome: " + goal.title)
-        key = goal_sort_key(parent_goals[0])
-        return (*key[:3], FIRST_PRIORITY, goal.row_number)
+        return None
     elif goal.object_type == ACTION_TYPE:
-        if parent_goals is None or len(parent_goals) == 0:
+        if not parent_goals:
             raise ValueError("No parent goal found in alignment for action: " + goal.title)
-        if parent_goals and len(parent_goals) > 1:
+        if len(parent_goals) > 1:
             raise ValueError("More than one parent goal found in alignment for action: " + goal.title)
-        key = goal_sort_key(parent_goals[0])
-        return (*key[:3], SECOND_PRIORITY, goal.row_number)
+        return None
     return (goal.row_number,) + (FIRST_PRIORITY,) * 4  # For root-level Themes the code will get to this point
 
-def get_workbook(workbook_path):
-    """Helper function to load a workbook - makes mocking easier"""
+def _resolve_sort_key(goal, parents_of, keys):
+    """
+    Resolve the sort key of a goal by walking up its parent chain without recursion.
+
+    Outcomes and Actions take their key from their parent, so the walk climbs until it reaches
+    a goal with a known or self-contained key and then fills in the keys on the way back down.
+
+    Args:
+        goal (VivaGoal): The goal to resolve.
+        parents_of (callable): Returns the parent goals of a goal.
+        keys (dict): Memo of resolved keys by goal row number; updated in place.
+
+    Raises:
+        ValueError: If a goal on the chain is invalid, or if the alignments form a cycle.
+
+    Returns:
+        tuple: The sort key of the goal.
+    """
+    chain = []
+    on_chain = {}
+    current = goal
+    key = keys.get(current.row_number)
+    while key is None:
+        if current.row_number in on_chain:
+            cycle = chain[on_chain[current.row_number]:] + [current]
+            raise ValueError("Alignment cycle between goals: " + " -> ".join(str(g.goal_id) for g in cycle))
+        parent_goals = parents_of(current)
+        key = _local_sort_key(current, parent_goals)
+        if key is not None:
+            keys[current.row_number] = key
+            break
+        on_chain[current.row_number] = len(chain)
+        chain.append(current)
+        current = parent_goals[0]
+        key = keys.get(current.row_number)
+
+    for pending in reversed(chain):
+        priority = FIRST_PRIORITY if pending.object_type == OUTCOME_TYPE else SECOND_PRIORITY
+        key = (*key[:3], priority, pending.row_number)
+        keys[pending.row_number] = key
+    return key
+
+def goal_sort_key(goal, context=None):
+    """
+    Custom sorting function to ensure goals are shown in the following order:
+    Theme, [Outcome,] Objective, [Outcome,] Action [, Theme, [Outcome,] Objective, [Outcome,] Action]
+    Notice if there's Objective and Outcome linked to the same Theme, Outcome is shown first.
+    If there's Outcome and Action linked to the same Objective, Outcome is shown first.
+
+    Keys are resolved without recursion but not memoized between calls; use GoalGraph
+    or ConversionContext to order many goals.
+
+    Args:
+        goal (VivaGoal): The goal object to be sorted.
+        context (ConversionContext, optional): The conversion to look parent goals up in.
+            Defaults to None, which looks in the module-level goals_dict.
+
+    Raises:
+        ValueError: If more than one parent goal is found in alignment for an outcome or action.
+        ValueError: If no parent goal is found in alignment for an outcome or action.
+        ValueError: If object_type is not one of the valid types (Objective, Outcome, Action).
+        ValueError: If the alignments of the goal's ancestors form a cycle.
+
+    Returns:
+        tuple: A tuple representing the sort key for the goal.
+    """
+    return _resolve_sort_key(goal, lambda goal: get_parent_goals_from_alignment(goal, context), {})
+
+class GoalGraph:
+    """
+    Parent/child index of goals, built by parsing every alignment once.
+
+    Sort keys are the same as goal_sort_key but are computed from the index and
+    memoized per goal, and ordered() lays the goals out in slide order with one pass over
+    the goals instead of a comparison sort.
+
+    Args:
+        goals (list): The goals, in workbook order.
+        goals_by_id (dict): The goals keyed by their OKR ID.
+        state (tuple, optional): The parent rows and sort keys of the goals, as returned by
+            state(), so the alignments are not parsed again. Defaults to None.
+    """
+
+    def __init__(self, goals, goals_by_id, state=None):
+        self.goals = list(goals)
+        self.goals_by_id = goals_by_id
+        self._parents = {}
+        self._children = None
+        self._keys = {}
+        if state is not None:
+            parent_rows, self._keys = state
+            goals_by_row = {goal.row_number: goal for goal in self.goals}
+            self._parents = {row: [goals_by_row[parent] for parent in parents] for row, parents in parent_rows.items()}
+        else:
+            for goal in self.goals:
+                self._index(goal)
+
+    def _index(self, goal):
+        lookup = self.goals_by_id.get
+        parent_ids = ALIGNMENT_PATTERN.findall(goal.alignment or '')
+        count_operation(REGEX_EVALUATIONS)
+        count_operation(GOAL_LOOKUPS, len(parent_ids))
+        parents = [parent for parent in map(lookup, parent_ids) if parent is not None]
+        self._parents[goal.row_number] = parents
+        return parents
+
+    def state(self):
+        """
+        Return what the graph has resolved, which can be pickled and passed back as state.
+
+        Returns:
+            tuple: The row numbers of the parents of each goal, and the sort keys computed so far,
+                both keyed by row number.
+        """
+        parent_rows = {row: [parent.row_number for parent in parents] for row, parents in self._parents.items()}
+        return parent_rows, dict(self._keys)
+
+    def parents_of(self, goal):
+        """Return the goals that a goal is aligned to, in alignment order."""
+        parents = self._parents.get(goal.row_number)
+        if parents is None:
+            parents = self._index(goal)
+        return parents
+
+    def children_of(self, goal):
+        """Return the goals aligned to a goal, in workbook order."""
+        if self._children is None:
+            # Ordering only walks up the tree, so the child lists are built on first use
+            self._children = {}
+            for child in self.goals:
+                for parent in self._parents[child.row_number]:
+                    self._children.setdefault(parent.row_number, []).append(child)
+        return self._children.get(goal.row_number, [])
+
+    def sort_key(self, goal):
+        """
+        Return the sort key of a goal, equal to goal_sort_key(goal).
+
+        Keys are memoized per goal, so resolving every goal costs one step per goal
+        however deep the hierarchy is.
+
+        Raises:
+            ValueError: For the same invalid goals and alignments as goal_sort_key, including cycles.
+        """
+        key = self._keys.get(goal.row_number)
+        if key is None:
+            key = _resolve_sort_key(goal, self.parents_of, self._keys)
+        return key
+
+    def ordered(self, goals=None):
+        """
+        Return goals in slide order, the same order as sorting by goal_sort_key.
+
+        A sort key is (group row, group priority, group goal row, priority, row). Goals are
+        bucketed by the first three parts, and because rows are walked in increasing order
+        each bucket and each list of buckets fills up already sorted.
+
+        Args:
+            goals (list, optional): The goals to order. Defaults to all goals of the graph.
+
+        Raises:
+            ValueError: For the same invalid goals and alignments as goal_sort_key.
+
+        Returns:
+            list: The goals in slide order.
+        """
+        goals = self.goals if goals is None else goals
+        by_row = sorted(goals, key=attrgetter('row_number'))  # already sorted for workbook order
+
+        sort_key = self.sort_key
+        keys = [sort_key(goal) for goal in by_row]
+
+        # Bucket = (goals keyed (.., 0, 0), other first priority goals, second priority goals)
+        buckets = {}
+        for goal, key in zip(by_row, keys):
+            bucket = buckets.get(key[:3])
+            if bucket is None:
+                bucket = buckets[key[:3]] = ([], [], [])
+            if key[3] == SECOND_PRIORITY:
+                bucket[2].append(goal)
+            elif key[4] == FIRST_PRIORITY:
+                bucket[0].append(goal)
+            else:
+                bucket[1].append(goal)
+
+        # A group (row, priority, goal row) is opened by the goal at that goal row, so visiting goals
+        # by row lists the groups of each (row, priority) in order; goal row 0 always comes first
+        groups = {}
+        for goal, key in zip(by_row, keys):
+            if key[2] == 0:
+                group_list = groups.setdefault(key[:2], [])
+                if not group_list or group_list[0] != key[:3]:
+                    group_list.insert(0, key[:3])
+            elif key[2] == goal.row_number:
+                groups.setdefault(key[:2], []).append(key[:3])
+
+        ordered_goals = []
+        group_rows = [goal.row_number for goal in by_row]
+        # Groups may hang off goals that are not being ordered
+        missing_rows = {row for row, _ in groups}.difference(group_rows)
+        if missing_rows:
+            group_rows = sorted(missing_rows.union(group_rows))
+        for row in group_rows:
+            for priority in (FIRST_PRIORITY, SECOND_PRIORITY):
+                for prefix in groups.get((row, priority), ()):
+                    for part in buckets[prefix]:
+                        ordered_goals.extend(part)
+        return ordered_goals
+
+def selection_key(value):
+    """Return the form of a goal field or filter value that selections compare: trimmed and case-folded."""
+    return "" if value is None else str(value).strip().casefold()
+
+class GoalIndex:
+    """
+    Goals by the values selections filter on, built in one pass over the goals.
+
+    Args:
+        goals (list): The goals, in workbook order.
+    """
+    # Selection filters on goal fields, and the field each one reads
+    FIELD_FILTERS = {'owners': 'owner', 'periods': 'schedule', 'statuses': 'status'}
+
+    def __init__(self, goals):
+        self.by_field = {name: {} for name in self.FIELD_FILTERS}
+        self.themes = {}
+        self.by_goal_id = {}
+        for goal in goals:
+            for name, field in self.FIELD_FILTERS.items():
+                self.by_field[name].setdefault(selection_key(getattr(goal, field)), []).append(goal)
+            if goal.goal_id:
+                self.by_goal_id.setdefault(selection_key(goal.goal_id), []).append(goal)
+            if goal.tag == THEME_TAG:
+                # Themes are selected by title or by id
+                self.themes.setdefault(selection_key(goal.title), []).append(goal)
+                if goal.goal_id:
+                    self.themes.setdefault(selection_key(goal.goal_id), []).append(goal)
+
+class ConversionContext:
+    """
+    The goals of one conversion, their lookup by OKR ID and their ordering state.
+
+    A conversion that keeps its goals in a context shares no state with other conversions,
+    so several can run at once in one process, for example from a thread pool. The
+    module-level goals_dict, and the functions that read it when no context is given,
+    remain for callers that load one workbook at a time.
+
+    Args:
+        goals (list): The goals, in workbook order.
+        goals_by_id (dict, optional): The goals keyed by their OKR ID. Defaults to keying goals by goal_id.
+        ordered_goals (list, optional): The goals in slide order, if already known. Defaults to None.
+        graph_state (tuple, optional): The state of the GoalGraph of the goals, as returned by
+            GoalGraph.state, if already known. Defaults to None.
+    """
+
+    def __init__(self, goals, goals_by_id=None, ordered_goals=None, graph_state=None):
+        self.goals = list(goals)
+        self.goals_by_id = {goal.goal_id: goal for goal in self.goals} if goals_by_id is None else goals_by_id
+        self._graph = None
+        self._graph_state = graph_state
+        self._ordered_goals = ordered_goals
+        self._index = None
+
+    @classmethod
+    def from_workbook(cls, workbook_path, read_only=None, reader=OPENPYXL_READER, errors=None):
+        """
+        Load the goals of an Excel workbook into a new context, leaving goals_dict alone.
+
+        Args:
+            workbook_path (str): Path to the Excel workbook.
+            read_only (bool, optional): Forwarded to get_workbook. Defaults to None (decide by file size).
+            reader (str, optional): The workbook reader. Defaults to OPENPYXL_READER.
+            errors (list, optional): Collects the errors of rows that fail to parse, which are
+                otherwise printed. Defaults to None.
+
+        Returns:
+            ConversionContext: The context.
+        """
+        return cls(*_collect_goals(workbook_path, read_only, reader, errors))
+
+    def get_goal_by_id(self, okr_id):
+        """Return the goal with an OKR ID, or None."""
+        count_operation(GOAL_LOOKUPS)
+        return self.goals_by_id.get(okr_id)
+
+    def parents_of(self, goal):
+        """Return the goals that a goal is aligned to, in alignment order."""
+        return self.graph.parents_of(goal)
+
+    def children_of(self, goal):
+        """Return the goals aligned to a goal, in workbook order."""
+        return self.graph.children_of(goal)
+
+    def sort_key(self, goal):
+        """Return the sort key of a goal, equal to goal_sort_key(goal, self)."""
+        return self.graph.sort_key(goal)
+
+    @property
+    def graph(self):
+        """The GoalGraph of the goals, built on first use, so reading known ordered_goals does not need it."""
+        if self._graph is None:
+            self._graph = GoalGraph(self.goals, self.goals_by_id, self._graph_state)
+            self._graph_state = None
+        return self._graph
+
+    @property
+    def index(self):
+        """The GoalIndex of the goals, built on first use."""
+        if self._index is None:
+            self._index = GoalIndex(self.goals)
+        return self._index
+
+    def _subtrees(self, roots):
+        """Return the row numbers of the given goals and of every goal aligned to them, directly or not."""
+        rows = set()
+        pending = list(roots)
+        while pending:
+            goal = pending.pop()
+            if goal.row_number not in rows:
+                rows.add(goal.row_number)
+                pending.extend(self.graph.children_of(goal))
+        return rows
+
+    def select(self, themes=(), goal_ids=(), owners=(), periods=(), statuses=()):
+        """
+        Return the selected goals, and the goals they are aligned to for context, in slide order.
+
+        Themes and goal ids select the goals with their whole subtrees; owners, periods and statuses
+        select the goals with those values. The values of one filter are alternatives, and a goal
+        must pass every filter that is given. Values are compared trimmed and case-insensitively.
+        Only the selected goals and their ancestors are sorted.
+
+        Args:
+            themes (list, optional): Titles or ids of Themes. Defaults to ().
+            goal_ids (list, optional): Ids of goals. Defaults to ().
+            owners (list, optional): Owners. Defaults to ().
+            periods (list, optional): Periods. Defaults to ().
+            statuses (list, optional): Statuses. Defaults to ().
+
+        Raises:
+            ValueError: If a theme or goal id is not in the workbook, no goal passes the filters,
+                or the selected goals are invalid as for goal_sort_key.
+
+        Returns:
+            list: The goals in slide order.
+        """
+        index = self.index
+        selections = []
+        for values, goals_by_value, kind in ((themes, index.themes, 'Theme'), (goal_ids, index.by_goal_id, 'goal id')):
+            if values:
+                roots = []
+                for value in values:
+                    matches = goals_by_value.get(selection_key(value))
+                    if not matches:
+                        raise ValueError(f"No {kind} in the workbook matches: {value}")
+                    roots.extend(matches)
+                selections.append(self._subtrees(roots))
+        for name, values in (('owners', owners), ('periods', periods), ('statuses', statuses)):
+            if values:
+                goals_by_value = index.by_field[name]
+                selections.append({goal.row_number for value in values
+                                   for goal in goals_by_value.get(selection_key(value), ())})
+        if not selections:
+            return self.ordered_goals
+        selected = set.intersection(*selections)
+        if not selected:
+            raise ValueError("No goals match the selection")
+
+        # Add the ancestors of the selected goals, which their slides refer to
+        keep = set()
+        pending = [goal for goal in self.goals if goal.row_number in selected]
+        while pending:
+            goal = pending.pop()
+            if goal.row_number not in keep:
+                keep.add(goal.row_number)
+                pending.extend(self.graph.parents_of(goal))
+        if self._ordered_goals is not None:
+            return [goal for goal in self._ordered_goals if goal.row_number in keep]
+        return self.graph.ordered([goal for goal in self.goals if goal.row_number in keep])
+
+    @property
+    def ordered_goals(self):
+        """
+        The goals in slide order, computed on first use.
+
+        Raises:
+            ValueError: For the same invalid goals and alignments as goal_sort_key.
+        """
+        if self._ordered_goals is None:
+            self._ordered_goals = self.graph.ordered()
+        return self._ordered_goals
+
+def get_workbook(workbook_path, read_only=None):
+    """
+    Helper function to load a workbook - makes mocking easier.
+
+    Args:
+        workbook_path (str): Path to the Excel workbook.
+        read_only (bool, optional): Whether to open the workbook in openpyxl's streaming read-only mode.
+            Defaults to None, which streams workbooks of at least LARGE_WORKBOOK_BYTES.
+
+    Raises:
+        ValueError: If the workbook file does not exist.
+
+    Returns:
+        Workbook: The loaded workbook.
+    """
     if not os.path.exists(workbook_path):
         raise ValueError(f"Workbook file does not exist: {workbook_path}")
+    if read_only is None:
+        read_only = os.path.getsize(workbook_path) >= LARGE_WORKBOOK_BYTES
+    count_operation(FILE_READS)
+    if read_only:
+        return load_workbook(workbook_path, read_only=True)
     return load_workbook(workbook_path)
 
 def create_goal(row, headers, idx):
-    """Create a single goal object from a row of data."""
+    """Create a single goal object from a row of data; headers may be a prebuilt ColumnMap."""
     goal = VivaGoal(row, headers, idx)
-    okr_id = OKRId(goal.okr_id).okr_id
-    return okr_id, goal
-
-def load_goals_from_workbook(workbook_path):
-    """Load goals from the given Excel workbook."""
-    wb = get_workbook(workbook_path)
-    ws = wb.active
-    headers = [cell.value for cell in next(ws.iter_rows(min_row=1, max_row=1))]
-    goals = []
-    local_goals_dict = {}
+    return goal.goal_id, goal
+
+def _iter_openpyxl_rows(workbook_path, read_only=None):
+    """Yield the header row and then each data row of the active sheet through openpyxl."""
+    # Leave the mode out when undecided so get_workbook picks it from the file size
+    if read_only is None:
+        wb = get_workbook(workbook_path)
+    else:
+        wb = get_workbook(workbook_path, read_only=read_only)
+    try:
+        ws = wb.active
+        headers = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), None)
+        if headers is None:
+            return
+        yield list(headers)
+        yield from ws.iter_rows(min_row=2, values_only=True)
+    finally:
+        close = getattr(wb, 'close', None)
+        if close is not None:
+            close()
+
+def _iter_native_rows(workbook_path):
+    """Yield the header row and then each data row, reading only GOAL_COLUMNS with xlsx_reader."""
+    if not os.path.exists(workbook_path):
+        raise ValueError(f"Workbook file does not exist: {workbook_path}")
+    from xlsx_reader import iter_sheet_rows
+
+    count_operation(FILE_READS)
+    rows = iter_sheet_rows(workbook_path, GOAL_COLUMNS)
+    yield list(next(rows))
+    yield from rows
 
-    for idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True)):
+def _iter_workbook_goals(workbook_path, read_only=None, reader=OPENPYXL_READER, errors=None):
+    """
+    Yield (okr_id, goal) pairs row by row; rows that fail to parse are reported and skipped.
+    With an errors list, the reports are appended to it instead of printed.
+    """
+    if reader == NATIVE_READER:
+        rows = _iter_native_rows(workbook_path)
+    elif reader == OPENPYXL_READER:
+        rows = _iter_openpyxl_rows(workbook_path, read_only)
+    else:
+        raise ValueError(f"Invalid workbook reader: {reader}. Must be one of {WORKBOOK_READERS}")
+
+    headers = next(rows, None)
+    if headers is None:
+        return
+    width = len(headers)
+    columns = ColumnMap(headers)
+    for idx, row in enumerate(rows):
+        # Read-only sheets without dimension info may yield ragged rows
+        if len(row) < width:
+            row = tuple(row) + (None,) * (width - len(row))
         try:
-            okr_id, goal = create_goal(row, headers, idx)
-            local_goals_dict[okr_id] = goal
-            goals.append(goal)
+            yield create_goal(row, columns, idx)
         except Exception as e:
-            print(f"Error processing row {idx + 2}: {e}")
+            if errors is None:
+                print(f"Error processing row {idx + 2}: {e}")
+            else:
+                errors.append(f"Error processing row {idx + 2}: {e}")
+
+def iter_goals_from_workbook(workbook_path, read_only=None, reader=OPENPYXL_READER):
+    """
+    Stream goals from the given Excel workbook one row at a time.
+
+    Only the current row is held in memory, so callers that consume the goals
+    incrementally keep memory bounded regardless of the workbook size.
+
+    Args:
+        workbook_path (str): Path to the Excel workbook.
+        read_only (bool, optional): Forwarded to get_workbook. Defaults to None (decide by file size).
+        reader (str, optional): OPENPYXL_READER, or NATIVE_READER to parse the sheet XML directly
+            with xlsx_reader. Defaults to OPENPYXL_READER.
+
+    Yields:
+        VivaGoal: The goal for each data row, numbered as in load_goals_from_workbook.
+    """
+    for _, goal in _iter_workbook_goals(workbook_path, read_only, reader):
+        yield goal
+
+def _collect_goals(workbook_path, read_only=None, reader=OPENPYXL_READER, errors=None):
+    """Return the goals of a workbook in workbook order and a new dict of them by OKR ID."""
+    goals = []
+    goals_by_id = {}
+    for okr_id, goal in _iter_workbook_goals(workbook_path, read_only, reader, errors):
+        goals_by_id[okr_id] = goal
+        goals.append(goal)
+    return goals, goals_by_id
+
+def load_goals_from_workbook(workbook_path, read_only=None, reader=OPENPYXL_READER):
+    """Load goals from the given Excel workbook into the module-level goals_dict."""
+    goals, local_goals_dict = _collect_goals(workbook_path, read_only, reader)
 
     global goals_dict
     goals_dict.clear()
@@ -300,6 +1069,70 @@ def load_goals_from_workbook(workbook_path):
 
     return goals, goals_dict
 
+def load_conversion_context(workbook_path, reader=OPENPYXL_READER, cache=None, errors=None):
+    """
+    Load the goals of an Excel workbook into a new ConversionContext, ordered for slides.
+    With a cache, goals parsed and ordered by an earlier run from the same workbook
+    contents and parser version are reused, with their resolved parents and sort keys.
+    The errors of rows that failed to parse are cached with them and reported again.
+
+    Args:
+        workbook_path (str): Path to the workbook.
+        reader (str, optional): The workbook reader. Defaults to OPENPYXL_READER.
+        cache (DiskCache, optional): Cache for the parsed goals. Defaults to None.
+        errors (list, optional): Collects the errors of rows that fail to parse, which are
+            otherwise printed. Defaults to None.
+
+    Raises:
+        ValueError: For invalid goals and alignments, as goal_sort_key.
+
+    Returns:
+        ConversionContext: The context, with its ordered_goals known.
+    """
+    key = None
+    if cache is not None and os.path.isfile(workbook_path):
+        key = f"goals:{PARSER_VERSION}:{reader}:{_file_digest(workbook_path)}"
+        count_operation(FILE_READS)
+        cached = cache.get(key)
+        if cached is not None:
+            ordered_goals, goals_by_id, graph_state, row_errors = cached
+            _report_row_errors(row_errors, errors)
+            return ConversionContext(sorted(ordered_goals, key=attrgetter('row_number')), goals_by_id, ordered_goals,
+                                     graph_state)
+
+    row_errors = []
+    context = ConversionContext.from_workbook(workbook_path, reader=reader, errors=row_errors)
+    _report_row_errors(row_errors, errors)
+    if key is not None:
+        cache.set(key, (context.ordered_goals, context.goals_by_id, context.graph.state(), row_errors))
+    return context
+
+def _report_row_errors(row_errors, errors=None):
+    """Append the errors of rows that failed to parse to errors, or print them as parsing does without a list."""
+    if errors is not None:
+        errors.extend(row_errors)
+        return
+    for error in row_errors:
+        print(error)
+
+def load_ordered_goals(workbook_path, reader=OPENPYXL_READER, cache=None):
+    """
+    Load goals from the given Excel workbook in slide order into the module-level goals_dict.
+    See load_conversion_context, which leaves goals_dict alone.
+
+    Args:
+        workbook_path (str): Path to the workbook.
+        reader (str, optional): The workbook reader. Defaults to OPENPYXL_READER.
+        cache (DiskCache, optional): Cache for the parsed goals. Defaults to None.
+
+    Returns:
+        tuple: The goals in slide order and the dict of goals by OKR ID.
+    """
+    context = load_conversion_context(workbook_path, reader, cache)
+    goals_dict.clear()
+    goals_dict.update(context.goals_by_id)
+    return context.ordered_goals, goals_dict
+
 def create_slide(prs, layout_index, title):
     """
     Create a new slide in the presentation with the given layout and title.
@@ -315,12 +1148,29 @@ def create_slide(prs, layout_index, title):
     try:
         slide_layout = prs.slide_masters[layout_index[0]].slide_layouts[layout_index[1]]
         slide = prs.slides.add_slide(slide_layout)
+        if _operation_counts is not None:
+            count_operation(SHAPES_CREATED, len(slide.shapes))
         title_shape = slide.shapes.title
         title_shape.text = title
         return slide
     except Exception as e:
         raise ValueError(f"Error creating slide: {e}")
 
+GOAL_DETAILS_BLOCK = TextBlock([
+    {"text": "Type: ", "bold": True, "font_size": 18, "level": 1},
+    {"field": "object_type", "font_size": 18, "level": 1, "is_run": True},
+    {"text": ", Metric: ", "bold": True, "font_size": 18, "level": 1, "is_run": True},
+    {"field": "metric_name", "font_size": 18, "level": 1, "is_run": True},
+    {"text": ", Target: ", "bold": True, "font_size": 18, "level": 1, "is_run": True},
+    {"field": "target", "font_size": 18, "level": 1, "is_run": True},
+    {"text": "Owner: ", "bold": True, "font_size": 18, "level": 1},
+    {"field": "owner", "font_size": 18, "level": 1, "is_run": True},
+    {"text": "Schedule: ", "bold": True, "font_size": 18, "level": 1},
+    {"field": "schedule", "font_size": 18, "level": 1, "is_run": True},
+    {"text": "Status: ", "bold": True, "font_size": 18, "level": 1},
+    {"field": "status", "font_size": 18, "level": 1, "is_run": True}
+])
+
 def add_goal_details_to_slide(slide, goal):
     """
     Add goal details to the given slide.
@@ -329,33 +1179,77 @@ def add_goal_details_to_slide(slide, goal):
         slide (Slide): The slide object.
         goal (VivaGoal): The goal object containing details to be added to the slide.
     """
+    add_details_to_slide(slide, {field: getattr(goal, field) for field in GOAL_DETAILS_BLOCK.fields})
+
+def add_details_to_slide(slide, values):
+    """
+    Add a text box with the GOAL_DETAILS_BLOCK to the given slide.
+
+    Args:
+        slide (Slide): The slide object.
+        values (dict): The text for each field of GOAL_DETAILS_BLOCK.
+    """
     try:
         dimensions = SquareDimensions(left=0.5, top=0.8, width=12, height=3.5)
         text_box = slide.shapes.add_textbox(dimensions.left, dimensions.top, dimensions.width, dimensions.height)
+        count_operation(SHAPES_CREATED)
         text_frame = text_box.text_frame
         text_frame.word_wrap = True
 
-        text_block_json = json.dumps({
-            "elements": [
-                {"text": "Type: ", "bold": True, "font_size": 18, "level": 1},
-                {"text": goal.object_type, "font_size": 18, "level": 1, "is_run": True},
-                {"text": ", Metric: ", "bold": True, "font_size": 18, "level": 1, "is_run": True},
-                {"text": goal.metric_name, "font_size": 18, "level": 1, "is_run": True},
-                {"text": ", Target: ", "bold": True, "font_size": 18, "level": 1, "is_run": True},
-                {"text": goal.target, "font_size": 18, "level": 1, "is_run": True},
-                {"text": "Owner: ", "bold": True, "font_size": 18, "level": 1},
-                {"text": goal.owner, "font_size": 18, "level": 1, "is_run": True},
-                {"text": "Schedule: ", "bold": True, "font_size": 18, "level": 1},
-                {"text": goal.schedule, "font_size": 18, "level": 1, "is_run": True},
-                {"text": "Status: ", "bold": True, "font_size": 18, "level": 1},
-                {"text": goal.status, "font_size": 18, "level": 1, "is_run": True}
-            ]
-        })
-        add_text_block_to_slide(text_frame, text_block_json)
+        add_text_block_to_slide(text_frame, GOAL_DETAILS_BLOCK, values)
     except Exception as e:
         raise ValueError(f"Error adding goal details to slide: {e}")
 
-def add_goal_image(slide, goal, image_path):
+class ImagePartCache:
+    """
+    Image parts for picture files, created once per presentation and shared by every slide.
+
+    The first picture of a file in a presentation is added with python-pptx's add_picture, which
+    reads the file and creates the image part. Later pictures of the same file relate the slide to
+    that part directly, so the file is not read, hashed or looked up among the package parts again.
+    """
+
+    def __init__(self):
+        self._parts = {}
+
+    def add_picture(self, slide, image_path, left, top, width, height):
+        """
+        Add a picture of an image file to a slide.
+
+        Args:
+            slide (Slide): The slide object.
+            image_path (str): Path to the image file.
+            left (Length): Left position of the picture.
+            top (Length): Top position of the picture.
+            width (Length): Width of the picture.
+            height (Length): Height of the picture.
+
+        Raises:
+            ValueError: If the image file does not exist.
+
+        Returns:
+            Picture: The created picture shape.
+        """
+        count_operation(SHAPES_CREATED)
+        key = (slide.part.package, image_path)
+        image_part = self._parts.get(key)
+        if image_part is None:
+            if not os.path.exists(image_path):
+                raise ValueError(f"Image file does not exist: {image_path}")
+            count_operation(FILE_READS)
+            pic = slide.shapes.add_picture(image_path, left, top, width, height)
+            self._parts[key] = slide.part.related_part(pic._element.blip_rId)
+            return pic
+
+        from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+        rId = slide.part.relate_to(image_part, RT.IMAGE)
+        shapes = slide.shapes
+        pic = shapes._add_pic_from_image_part(image_part, rId, left, top, width, height)
+        shapes._recalculate_extents()
+        return shapes._shape_factory(pic)
+
+def add_goal_image(slide, goal, image_path, image_cache=None):
     """
     Add an image representing the goal type to the given slide.
 
@@ -363,12 +1257,27 @@ def add_goal_image(slide, goal, image_path):
         slide (Slide): The slide object.
         goal (VivaGoal): The goal object.
         image_path (str): Path to the image file.
+        image_cache (ImagePartCache, optional): Image parts to share between slides. Defaults to None,
+            which reads the image file for this slide.
+    """
+    add_image_to_slide(slide, image_path, goal.okr_link, image_cache)
+
+def add_image_to_slide(slide, image_path, hyperlink, image_cache=None):
+    """
+    Add the goal type icon to the given slide, linking to the goal.
+
+    Args:
+        slide (Slide): The slide object.
+        image_path (str): Path to the image file.
+        hyperlink (str): Address the image links to.
+        image_cache (ImagePartCache, optional): Image parts to share between slides. Defaults to None,
+            which reads the image file for this slide.
     """
     try:
         dimensions = SquareDimensions(left=0.34, top=1.13, width=0.5, height=0.5)
-        pic = slide.shapes.add_picture(image_path, dimensions.left, dimensions.top, dimensions.width, dimensions.height)
-        okr_id = OKRId(goal.okr_id)
-        pic.click_action.hyperlink.address = okr_id.okr_link
+        image_cache = image_cache or ImagePartCache()
+        pic = image_cache.add_picture(slide, image_path, dimensions.left, dimensions.top, dimensions.width, dimensions.height)
+        pic.click_action.hyperlink.address = hyperlink
     except Exception as e:
         raise ValueError(f"Error adding goal image to slide: {e}")
 
@@ -380,16 +1289,28 @@ def add_goal_description(slide, goal):
         slide (Slide): The slide object.
         goal (VivaGoal): The goal object.
     """
+    add_description_to_slide(slide, goal.description)
+
+def add_description_to_slide(slide, description):
+    """
+    Add a line and a text box with a goal description to the given slide.
+
+    Args:
+        slide (Slide): The slide object.
+        description (str): The goal description.
+    """
     try:
         line = LineDimensions(left=0.5, top=4, width=12)
         slide.shapes.add_connector(MSO_CONNECTOR.STRAIGHT, line.left, line.top, line.left + line.width, line.top)
+        count_operation(SHAPES_CREATED)
 
         dimensions = SquareDimensions(left=0.5, top=4, width=12, height=3.4)
         text_box = slide.shapes.add_textbox(dimensions.left, dimensions.top, dimensions.width, dimensions.height)
+        count_operation(SHAPES_CREATED)
         text_frame = text_box.text_frame
         add_paragraph_with_text(text_frame, "Description:", bold=True, font_size=18)
         p = add_paragraph_with_text(text_frame, "")
-        add_run_with_text(p, goal.description, font_size=14)
+        add_run_with_text(p, description, font_size=14)
 
         text_frame.auto_size = MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
         text_frame.word_wrap = True
@@ -397,63 +1318,1332 @@ def add_goal_description(slide, goal):
     except Exception as e:
         raise ValueError(f"Error adding goal description to slide: {e}")
 
-def main(source_workbook=SOURCE_WORKBOOK, template_powerpoint=TEMPLATE_POWERPOINT,
-         target_bizplan_powerpoint=TARGET_BIZPLAN_POWERPOINT, theme_slide_master=THEME_SLIDE_MASTER,
-         theme_slide_master_layout=THEME_SLIDE_MASTER_LAYOUT, okr_slide_master=OKR_SLIDE_MASTER,
-         okr_slide_master_layout=OKR_SLIDE_MASTER_LAYOUT):
-    global goals_dict
-    goals, goals_dict = load_goals_from_workbook(source_workbook)
+def split_alignment(goal):
+    """
+    Split the alignment of a goal into the parent text shown on its slide.
+
+    Args:
+        goal (VivaGoal): The goal object.
+
+    Returns:
+        tuple: The alignment without weights and ids, and for Objectives the parent plan theme
+            and the MWB alignment parts of it (empty strings otherwise).
+    """
+    count_operation(REGEX_EVALUATIONS)
+    cleaned_alignment = ALIGNMENT_PATTERN.sub("", goal.alignment or "")
+    alignment, mwb = "", ""
+    if goal.object_type == OBJECTIVE_TYPE:
+        for part in cleaned_alignment.split(" / "):
+            if part.startswith("MWB:"):
+                mwb = part
+            else:
+                alignment = part
+    return cleaned_alignment, alignment, mwb
+
+def get_goal_image_path(goal):
+    """Return the path of the icon shown on the slide of a goal."""
+    if goal.object_type == OBJECTIVE_TYPE:
+        return OBJECTIVE_IMAGE
+    return INITIATIVE_IMAGE if goal.object_type == ACTION_TYPE else OUTCOME_IMAGE
+
+def alignment_paragraphs(goal):
+    """
+    Return the parent alignment lines shown under the goal details of a goal.
+
+    Returns:
+        list: A (label, text, font color as [r, g, b] or None) tuple per line, with None for an
+            empty line.
+    """
+    cleaned_alignment, alignment, mwb = split_alignment(goal)
+    if goal.object_type != OBJECTIVE_TYPE:
+        return [("Parent objective: ", cleaned_alignment, None)]
+    paragraphs = []
+    if alignment:
+        paragraphs.append(("Parent plan theme: ", alignment, None))
+    if mwb:
+        paragraphs.append(None)
+        paragraphs.append(("Parent MWB alignment: ", mwb, MWB_COLOR))
+    return paragraphs
+
+def add_alignment_to_slide(slide, paragraphs):
+    """
+    Add alignment lines to the goal details on the given slide.
+
+    Args:
+        slide (Slide): The slide object, with the goal details as its last shape.
+        paragraphs (list): The lines, as returned by alignment_paragraphs.
+    """
+    text_frame = slide.shapes[-1].text_frame
+    for paragraph in paragraphs:
+        if paragraph is None:
+            add_paragraph_with_text(text_frame, "")
+            continue
+        label, text, color = paragraph
+        p = add_paragraph_with_text(text_frame, label, True, 18, 1, RGBColor(*color) if color else -1)
+        add_run_with_text(p, text, False, 18)
+
+def add_title_bar(slide):
+    """Add a dark bar behind the title of the given slide."""
+    dimensions = SquareDimensions(left=0.5, top=0.3, width=12.5, height=0.75)
+    title_rect = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, dimensions.left, dimensions.top, dimensions.width, dimensions.height)
+    count_operation(SHAPES_CREATED)
+    title_rect.fill.solid()
+    title_rect.fill.fore_color.rgb = RGBColor(0, 43, 72)
+    title_rect.line.color.rgb = RGBColor(0, 0, 255)
+    spTree = slide.shapes._spTree
+    spTree.remove(title_rect._element)
+    spTree.insert(2, title_rect._element)
+
+def add_goal_alignment(slide, goal):
+    """
+    Add the parent alignment of a goal to the goal details on the given slide.
+    Objective slides also get a title bar behind the title.
+
+    Args:
+        slide (Slide): The slide object, with the goal details as its last shape.
+        goal (VivaGoal): The goal object.
+    """
+    add_alignment_to_slide(slide, alignment_paragraphs(goal))
+    if goal.object_type == OBJECTIVE_TYPE:
+        add_title_bar(slide)
+
+def render_goal_slide(prs, goal, theme_layout, okr_layout, image_cache=None):
+    """
+    Add the slide for a goal to the presentation.
+
+    Args:
+        prs (Presentation): The PowerPoint presentation object.
+        goal (VivaGoal): The goal object.
+        theme_layout (tuple): Slide master index and layout index for Theme slides.
+        okr_layout (tuple): Slide master index and layout index for Objective, Outcome and Action slides.
+        image_cache (ImagePartCache, optional): Image parts to share between slides. Defaults to None.
+
+    Returns:
+        Slide: The created slide object.
+    """
+    if goal.tag == THEME_TAG:
+        return create_slide(prs, theme_layout, goal.title)
+
+    slide = create_slide(prs, okr_layout, goal.title)
+    add_goal_details_to_slide(slide, goal)
+    add_goal_alignment(slide, goal)
+    add_goal_image(slide, goal, get_goal_image_path(goal), image_cache)
+    add_goal_description(slide, goal)
+    return slide
+
+class SlideRenderer:
+    """
+    Render goals as slides, building every shape with python-pptx.
+
+    Args:
+        prs (Presentation): The PowerPoint presentation object.
+        theme_layout (tuple): Slide master index and layout index for Theme slides.
+        okr_layout (tuple): Slide master index and layout index for Objective, Outcome and Action slides.
+    """
+
+    def __init__(self, prs, theme_layout, okr_layout):
+        self.prs = prs
+        self.theme_layout = theme_layout
+        self.okr_layout = okr_layout
+        self.image_cache = ImagePartCache()
+
+    def render(self, goal):
+        """Add the slide for a goal to the presentation and return it."""
+        return render_goal_slide(self.prs, goal, self.theme_layout, self.okr_layout, self.image_cache)
+
+class _SlidePrototype:
+    """A finished slide with the positions of the goal text in it."""
+    __slots__ = ('element', 'rels', 'title_index', 'run_slots', 'link_rId', 'shape_count')
+
+    def __init__(self, element, rels, title_index, run_slots, link_rId, shape_count):
+        self.element = element
+        self.rels = rels
+        self.title_index = title_index
+        self.run_slots = run_slots
+        self.link_rId = link_rId
+        self.shape_count = shape_count
+
+class SlideAppender:
+    """
+    Append finished slide XML to a presentation as new slides.
+
+    python-pptx's add_slide and relate_to scan every existing slide for each slide added, which
+    makes building large decks quadratic; this keeps the next slide id and the slide count itself and adds the
+    presentation relationship directly.
+
+    Args:
+        prs (Presentation): The PowerPoint presentation object.
+    """
+
+    def __init__(self, prs):
+        self.prs = prs
+        self._sldIdLst = prs.slides._sldIdLst
+        self._next_slide_id = None
+        self._slide_count = None
+        self._last_sldId = None
+        self._before_last_sldId = None
+
+    def resync(self):
+        """Pick up slides added or removed by other code before the next append."""
+        self._next_slide_id = None
+        self._slide_count = None
+        self._last_sldId = None
+        self._before_last_sldId = None
+
+    def append(self, element):
+        """
+        Add a slide part holding the given p:sld element after the last slide.
+
+        Args:
+            element (CT_Slide): The slide XML, owned by the new part from now on.
+
+        Returns:
+            SlidePart: The new slide part, still without relationships of its own.
+        """
+        from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+        from pptx.opc.packuri import PackURI
+        from pptx.parts.slide import SlidePart
+
+        last = self._last_sldId
+        if last is not None and last.getparent() is None and next(reversed(self._sldIdLst), None) is self._before_last_sldId:
+            # A streaming writer took the last appended slide out again
+            self._slide_count -= 1
+        elif last is None or last.getparent() is not self._sldIdLst or last.getnext() is not None:
+            # First append, or other slides were added or taken out since the last one (by add_slide or
+            # another appender); counting the slide list walks all of it, so it is only done then
+            self._count_slides()
+        partname = PackURI("/ppt/slides/slide%d.xml" % (self._slide_count + 1))
+        slide_part = SlidePart(partname, CT.PML_SLIDE, self.prs.part.package, element)
+        rId = self.prs.part.rels._add_relationship(RT.SLIDE, slide_part)
+        self._last_sldId = self._sldIdLst._add_sldId(id=self._next_slide_id, rId=rId)
+        self._before_last_sldId = self._last_sldId.getprevious()
+        self._next_slide_id += 1
+        self._slide_count += 1
+        return slide_part
+
+    def _count_slides(self):
+        count_operation(SLIDE_LIST_SCANS)
+        self._next_slide_id = max(self._next_slide_id or 0, self._sldIdLst._next_id)
+        self._slide_count = len(self._sldIdLst)
+
+    @staticmethod
+    def relate(slide_part, rels):
+        """
+        Recreate the relationships of a copied slide, keeping the slide XML's references valid.
+
+        Args:
+            slide_part (SlidePart): The slide part, as returned by append.
+            rels (list): (rId, reltype, target, is_external) tuples in the slide XML's rId order;
+                target is a Part, or a URL for external relationships.
+        """
+        renamed = {}
+        for rId, reltype, target, is_external in rels:
+            new_rId = slide_part.relate_to(target, reltype, is_external)
+            if new_rId != rId:
+                renamed[rId] = new_rId
+        if renamed:
+            from pptx.opc.constants import NAMESPACE
+
+            prefix = "{%s}" % NAMESPACE.OFC_RELATIONSHIPS
+            for node in slide_part._element.iter():
+                for name, value in node.attrib.items():
+                    if name.startswith(prefix) and value in renamed:
+                        node.set(name, renamed[value])
+
+class PrototypeRenderer(SlideRenderer):
+    """
+    Render goals by copying a finished prototype slide and filling in the goal text.
+
+    One prototype is built per slide variant (Theme, or object type plus which alignment lines
+    and hyperlink the slide has) with render_goal_slide and marker text, then taken out of the
+    deck. Every goal slide is a deep copy of its prototype's XML with the runs, title and
+    hyperlink replaced, so slides come out identical to SlideRenderer's.
+
+    Args:
+        prs (Presentation): The PowerPoint presentation object.
+        theme_layout (tuple): Slide master index and layout index for Theme slides.
+        okr_layout (tuple): Slide master index and layout index for Objective, Outcome and Action slides.
+    """
+    SLOT_FIELDS = ('title', 'metric_name', 'target', 'owner', 'schedule', 'status', 'description', 'alignment', 'mwb')
+    MARKERS = {field: f"\ue000{field}\ue000" for field in SLOT_FIELDS}
+    MARKERS['mwb'] = "MWB:" + MARKERS['mwb']  # split_alignment only treats "MWB:..." parts as MWB alignment
+    LINK_MARKER = "https://prototype.invalid/okr"
+
+    def __init__(self, prs, theme_layout, okr_layout):
+        super().__init__(prs, theme_layout, okr_layout)
+        self._prototypes = {}
+        self._appender = SlideAppender(prs)
+
+    @staticmethod
+    def _slide_values(goal):
+        cleaned_alignment, alignment, mwb = split_alignment(goal)
+        if goal.object_type != OBJECTIVE_TYPE:
+            alignment = cleaned_alignment
+        return {
+            'title': goal.title, 'metric_name': goal.metric_name, 'target': goal.target, 'owner': goal.owner,
+            'schedule': goal.schedule, 'status': goal.status, 'description': goal.description,
+            'alignment': alignment, 'mwb': mwb,
+        }
+
+    @staticmethod
+    def _variant(goal, values):
+        if goal.tag == THEME_TAG:
+            return (THEME_TAG,)
+        has_alignment = goal.object_type != OBJECTIVE_TYPE or bool(values['alignment'])
+        return (goal.object_type, has_alignment, bool(values['mwb']), bool(goal.okr_link))
+
+    def _build_prototype(self, variant):
+        from types import SimpleNamespace
+        from pptx.oxml.ns import qn
+
+        markers = self.MARKERS
+        if variant[0] == THEME_TAG:
+            tag, object_type, alignment, link = THEME_TAG, OBJECTIVE_TYPE, "", ""
+        else:
+            object_type, has_alignment, has_mwb, has_link = variant
+            tag, link = "", self.LINK_MARKER if has_link else ""
+            if object_type == OBJECTIVE_TYPE:
+                parts = ([markers['alignment']] if has_alignment else []) + ([markers['mwb']] if has_mwb else [])
+                alignment = " / ".join(parts)
+            else:
+                alignment = markers['alignment']
+        goal = SimpleNamespace(tag=tag, object_type=object_type, alignment=alignment, okr_link=link,
+                               **{field: markers[field] for field in self.SLOT_FIELDS if field not in ('alignment', 'mwb')})
+
+        slide = render_goal_slide(self.prs, goal, self.theme_layout, self.okr_layout, self.image_cache)
+
+        # Take the prototype back out of the deck; it stays alive only as a source to copy
+        sldIdLst = self.prs.slides._sldIdLst
+        sldId = sldIdLst[-1]
+        sldIdLst.remove(sldId)
+        self.prs.part.drop_rel(sldId.rId)
+        self._appender.resync()
+
+        element = slide.part._element
+        spTree = element.cSld.spTree
+        title_sp = slide.shapes.title._element
+        field_by_marker = {marker: field for field, marker in markers.items() if field != 'title'}
+        run_slots = []
+        for index, run in enumerate(element.iter(qn('a:r'))):
+            field = field_by_marker.get(run.text)
+            if field is not None:
+                run_slots.append((index, field))
+
+        rels = []
+        link_rId = None
+        for rel in sorted(slide.part.rels.values(), key=lambda rel: int(rel.rId[3:])):
+            target = rel.target_ref if rel.is_external else rel.target_part
+            if rel.is_external and target == self.LINK_MARKER:
+                link_rId = rel.rId
+            rels.append((rel.rId, rel.reltype, target, rel.is_external))
+        return _SlidePrototype(element, rels, spTree.index(title_sp), run_slots, link_rId, len(slide.shapes))
+
+    def render(self, goal):
+        """Add the slide for a goal to the presentation, copied from its prototype, and return it."""
+        from copy import deepcopy
+        from pptx.oxml.ns import qn
+        from pptx.text.text import TextFrame
+
+        values = self._slide_values(goal)
+        variant = self._variant(goal, values)
+        prototype = self._prototypes.get(variant)
+        if prototype is None:
+            prototype = self._prototypes[variant] = self._build_prototype(variant)
+
+        element = deepcopy(prototype.element)
+        count_operation(SHAPES_CREATED, prototype.shape_count)
+        slide_part = self._appender.append(element)
+        rels = prototype.rels
+        if prototype.link_rId is not None:
+            rels = [(rId, reltype, goal.okr_link if rId == prototype.link_rId else target, is_external)
+                    for rId, reltype, target, is_external in rels]
+        self._appender.relate(slide_part, rels)
+
+        try:
+            if prototype.run_slots:
+                runs = list(element.iter(qn('a:r')))
+                for index, field in prototype.run_slots:
+                    runs[index].text = values[field]
+            title_sp = element.cSld.spTree[prototype.title_index]
+            TextFrame(title_sp.get_or_add_txBody(), None).text = goal.title
+        except Exception as e:
+            raise ValueError(f"Error rendering slide for goal {goal.title}: {e}")
+        return slide_part.slide
+
+def make_renderer(render_engine, prs, theme_layout, okr_layout):
+    """
+    Create the slide renderer for a render engine.
+
+    Args:
+        render_engine (str): SHAPES_ENGINE or PROTOTYPE_ENGINE.
+        prs (Presentation): The PowerPoint presentation object.
+        theme_layout (tuple): Slide master index and layout index for Theme slides.
+        okr_layout (tuple): Slide master index and layout index for Objective, Outcome and Action slides.
+
+    Raises:
+        ValueError: If the render engine is unknown.
+
+    Returns:
+        SlideRenderer: The renderer.
+    """
+    if render_engine == SHAPES_ENGINE:
+        return SlideRenderer(prs, theme_layout, okr_layout)
+    if render_engine == PROTOTYPE_ENGINE:
+        return PrototypeRenderer(prs, theme_layout, okr_layout)
+    raise ValueError(f"Invalid render engine: {render_engine}. Must be one of {RENDER_ENGINES}")
+
+def export_slide(slide_part, template_partnames):
+    """
+    Export a rendered slide so it can be pickled and merged into another presentation made from the same template.
+
+    Args:
+        slide_part (SlidePart): The part of the rendered slide.
+        template_partnames (set): Partnames of the parts that came with the template.
+
+    Raises:
+        ValueError: If the slide relates to a part that is neither an image nor part of the template.
+
+    Returns:
+        tuple: The (slide XML, relationships) of the slide and a dict of the bytes of its images by SHA1,
+            in the format of render_shard.
+    """
+    from pptx.parts.image import ImagePart
+
+    rels, images = [], {}
+    for rel in sorted(slide_part.rels.values(), key=lambda rel: int(rel.rId[3:])):
+        if rel.is_external:
+            rels.append((rel.rId, rel.reltype, 'external', rel.target_ref))
+        elif isinstance(rel.target_part, ImagePart):
+            images[rel.target_part.sha1] = rel.target_part.blob
+            rels.append((rel.rId, rel.reltype, 'image', rel.target_part.sha1))
+        elif str(rel.target_part.partname) in template_partnames:
+            rels.append((rel.rId, rel.reltype, 'part', str(rel.target_part.partname)))
+        else:
+            raise ValueError(f"Cannot export slide relationship to {rel.target_part.partname}")
+    return (slide_part.blob, rels), images
+
+def render_shard(template_powerpoint, goals, theme_layout, okr_layout, render_engine=SHAPES_ENGINE, slide_cache=None):
+    """
+    Render goals into a presentation made from the template and export the new slides.
+    This runs in worker processes, so everything it returns can be pickled.
+
+    Args:
+        template_powerpoint (str): Path to the template PowerPoint file.
+        goals (list): The goal objects, in slide order.
+        theme_layout (tuple): Slide master index and layout index for Theme slides.
+        okr_layout (tuple): Slide master index and layout index for Objective, Outcome and Action slides.
+        render_engine (str, optional): The render engine. Defaults to SHAPES_ENGINE.
+        slide_cache (SlideCache, optional): Cache of slides rendered earlier. Defaults to None.
+
+    Raises:
+        ValueError: If a slide relates to a part that is neither an image nor part of the template.
+
+    Returns:
+        tuple: A list of (slide XML, relationships) per slide and a dict of image bytes by SHA1.
+            Each relationship is (rId, reltype, kind, target), where kind is 'external' (target is
+            a URL), 'image' (target is a SHA1) or 'part' (target is a template partname).
+    """
+    count_operation(FILE_READS)
     prs = Presentation(template_powerpoint)
-    goals.sort(key=goal_sort_key)
+    template_partnames = {str(part.partname) for part in prs.part.package.iter_parts()}
+    renderer = make_renderer(render_engine, prs, theme_layout, okr_layout)
+    if slide_cache is not None:
+        renderer = CachingRenderer(renderer, slide_cache)
+    slides, images = [], {}
+    for goal in goals:
+        slide, slide_images = export_slide(renderer.render(goal).part, template_partnames)
+        slides.append(slide)
+        images.update(slide_images)
+    if slide_cache is not None:
+        slide_cache.flush()
+    return slides, images
+
+class SlideMerger:
+    """
+    Append exported slides, as returned by render_shard, to a presentation made from the same template.
+    Each image is added to the presentation once, however many slides and merges use it.
 
+    Args:
+        prs (Presentation): The PowerPoint presentation object.
+        writer (StreamingPresentationWriter, optional): Writer to stream each merged slide to. Defaults to None.
+    """
+
+    def __init__(self, prs, writer=None):
+        self.prs = prs
+        self.writer = writer
+        self._appender = SlideAppender(prs)
+        self._parts_by_name = {str(part.partname): part for part in prs.part.package.iter_parts()}
+        self._image_parts = {}
+
+    def merge(self, rendered):
+        """
+        Append the exported slides after the last slide, in order.
+
+        Args:
+            rendered (tuple): Slides and images as returned by render_shard.
+
+        Raises:
+            ValueError: If a slide relates to a part that is not in the presentation.
+
+        Returns:
+            list: The merged slides.
+        """
+        import io
+        from pptx.oxml import parse_xml
+
+        slides, images = rendered
+        package = self.prs.part.package
+        merged = []
+        for slide_xml, rels in slides:
+            slide_part = self._appender.append(parse_xml(slide_xml))
+            targets = []
+            for rId, reltype, kind, target in rels:
+                if kind == 'image':
+                    image_part = self._image_parts.get(target)
+                    if image_part is None:
+                        image_part = self._image_parts[target] = package.get_or_add_image_part(io.BytesIO(images[target]))
+                    target = image_part
+                elif kind == 'part':
+                    if target not in self._parts_by_name:
+                        raise ValueError(f"Template part not found while merging slides: {target}")
+                    target = self._parts_by_name[target]
+                targets.append((rId, reltype, target, kind == 'external'))
+            self._appender.relate(slide_part, targets)
+            if self.writer is not None:
+                self.writer.add_slide(slide_part.slide)
+            merged.append(slide_part.slide)
+        return merged
+
+class SlideCache:
+    """
+    Slides rendered in earlier runs, stored in a DiskCache and looked up by the fields each
+    slide shows, so goals with the same content share one entry across runs and decks.
+    Entries are only shared between runs with the same template, layouts and icons. Images
+    are stored once by SHA1 rather than with every slide that shows them.
+
+    A slide takes several KB, so a large deck can need more than the store's size limit, and
+    its last slides would evict its first ones. Slides are only stored until those stored by
+    this cache take half the size limit; later slides are counted in skipped and not stored,
+    and the other half is left to parsed goals and other decks.
+
+    Args:
+        cache (DiskCache): The on-disk store.
+        settings (dict): The render settings, as returned by render_settings.
+    """
+
+    def __init__(self, cache, settings):
+        self.cache = cache
+        settings_digest = hashlib.sha1(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()
+        self.prefix = f"slide:{settings_digest}:"
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self.stored_bytes = 0
+        self.budget_bytes = cache.max_bytes // 2
+        self._images = {}
+
+    def get(self, goal):
+        """
+        Return the cached slide for a goal.
+
+        Args:
+            goal (VivaGoal): The goal object.
+
+        Returns:
+            tuple: The slide and its images, in the format of export_slide, or None if not cached.
+        """
+        count_operation(FILE_READS)
+        slide = self.cache.get(self.prefix + goal_fingerprint(goal))
+        images = {}
+        if slide is not None:
+            for _, _, kind, sha1 in slide[1]:
+                if kind != 'image':
+                    continue
+                blob = self._images.get(sha1)
+                if blob is None:
+                    count_operation(FILE_READS)
+                    blob = self.cache.get(f"image:{sha1}")
+                    if blob is None:
+                        slide = None
+                        break
+                    self._images[sha1] = blob
+                images[sha1] = blob
+        if slide is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return slide, images
+
+    def set(self, goal, exported):
+        """
+        Store the slide rendered for a goal, unless the budget of this cache is used up.
+        Eviction waits for flush.
+
+        Args:
+            goal (VivaGoal): The goal object.
+            exported (tuple): The slide and its images, as returned by export_slide.
+        """
+        if self.stored_bytes >= self.budget_bytes:
+            self.skipped += 1
+            return
+        slide, images = exported
+        for sha1, blob in images.items():
+            if sha1 not in self._images:
+                self.stored_bytes += self.cache.set(f"image:{sha1}", blob, evict=False)
+                self._images[sha1] = blob
+        self.stored_bytes += self.cache.set(self.prefix + goal_fingerprint(goal), slide, evict=False)
+
+    def flush(self):
+        """Evict the least recently used entries if the store grew over its size limit."""
+        self.cache.evict()
+
+    def share(self, count):
+        """Return a copy for one of count worker processes, with an equal part of the budget left."""
+        import copy
+
+        shared = copy.copy(self)
+        shared.hits = shared.misses = shared.skipped = shared.stored_bytes = 0
+        shared._images = {}
+        shared.budget_bytes = max(0, self.budget_bytes - self.stored_bytes) // count
+        return shared
+
+class CachingRenderer:
+    """
+    Renderer that copies a goal's slide from the slide cache when it was rendered before,
+    and otherwise renders it with another renderer and stores the result.
+
+    Args:
+        renderer (SlideRenderer): Renderer for goals that are not cached.
+        slide_cache (SlideCache): The slide cache.
+    """
+
+    def __init__(self, renderer, slide_cache):
+        self.renderer = renderer
+        self.slide_cache = slide_cache
+        self.prs = renderer.prs
+        self._merger = SlideMerger(renderer.prs)
+        self._template_partnames = set(self._merger._parts_by_name)
+
+    def render(self, goal):
+        """Add the slide for a goal to the presentation and return it."""
+        cached = self.slide_cache.get(goal)
+        if cached is not None:
+            slide, images = cached
+            return self._merger.merge(([slide], images))[0]
+        slide = self.renderer.render(goal)
+        self.slide_cache.set(goal, export_slide(slide.part, self._template_partnames))
+        return slide
+
+class ConversionHooks:
+    """
+    Callbacks that embedding code subscribes to the events of a conversion, passed to main as hooks.
+
+    Callbacks are called in the conversion thread with keyword arguments:
+    - PHASE_STARTED_EVENT: phase, one of PHASES.
+    - PHASE_FINISHED_EVENT: phase, wall_seconds and cpu_seconds (CPU time of the conversion thread).
+    - SLIDE_RENDERED_EVENT: goal, slide and seconds, for each slide rendered in the conversion
+      process; slides rendered by worker processes or copied by an incremental run have no event.
+    """
+
+    def __init__(self):
+        self._subscribers = {event: [] for event in HOOK_EVENTS}
+
+    def subscribe(self, event, callback):
+        """
+        Call callback on every event of a kind.
+
+        Args:
+            event (str): One of HOOK_EVENTS.
+            callback (callable): Called with the keyword arguments of the event.
+
+        Raises:
+            ValueError: If the event is unknown.
+
+        Returns:
+            callable: The callback, so this can be used as a decorator factory.
+        """
+        if event not in self._subscribers:
+            raise ValueError(f"Unknown hook event: {event}. Must be one of {HOOK_EVENTS}")
+        self._subscribers[event].append(callback)
+        return callback
+
+    def unsubscribe(self, event, callback):
+        """Stop calling a callback subscribed to an event."""
+        self._subscribers[event].remove(callback)
+
+    def wants(self, event):
+        """Return whether any callback is subscribed to an event."""
+        return bool(self._subscribers[event])
+
+    def emit(self, event, **details):
+        """Call the callbacks subscribed to an event."""
+        for callback in list(self._subscribers[event]):
+            callback(**details)
+
+    @contextmanager
+    def phase(self, phase):
+        """Emit PHASE_STARTED_EVENT and, when the block finishes without an error, PHASE_FINISHED_EVENT."""
+        self.emit(PHASE_STARTED_EVENT, phase=phase)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        yield
+        self.emit(PHASE_FINISHED_EVENT, phase=phase, wall_seconds=time.perf_counter() - wall,
+                  cpu_seconds=time.thread_time() - cpu)
+
+class HookedRenderer:
+    """
+    Renderer that times each slide of another renderer and emits SLIDE_RENDERED_EVENT for it.
+
+    Args:
+        renderer (SlideRenderer): The renderer.
+        hooks (ConversionHooks): The hooks to emit to.
+    """
+
+    def __init__(self, renderer, hooks):
+        self.renderer = renderer
+        self.hooks = hooks
+        self.prs = renderer.prs
+
+    def render(self, goal):
+        """Add the slide for a goal to the presentation and return it."""
+        start = time.perf_counter()
+        slide = self.renderer.render(goal)
+        self.hooks.emit(SLIDE_RENDERED_EVENT, goal=goal, slide=slide, seconds=time.perf_counter() - start)
+        return slide
+
+def render_in_workers(prs, goals, template_powerpoint, theme_layout, okr_layout, render_engine, workers, writer=None,
+                      slide_cache=None, on_slide=None):
+    """
+    Render goals in worker processes and merge the slides into the presentation in goal order.
+
+    The goals are split into contiguous shards of at most WORKER_SHARD_GOALS goals, and at least
+    one per worker. At most SHARDS_IN_FLIGHT_PER_WORKER shards per worker are rendered or wait to
+    be merged at a time, and the next shard is submitted as each one is merged, so with a writer
+    the rendered slides held in memory do not grow with the deck.
+
+    Args:
+        prs (Presentation): The PowerPoint presentation object, made from template_powerpoint.
+        goals (list): The goal objects, in slide order.
+        template_powerpoint (str): Path to the template PowerPoint file.
+        theme_layout (tuple): Slide master index and layout index for Theme slides.
+        okr_layout (tuple): Slide master index and layout index for Objective, Outcome and Action slides.
+        render_engine (str): The render engine.
+        workers (int): Number of worker processes.
+        writer (StreamingPresentationWriter, optional): Writer to stream each merged slide to. Defaults to None.
+        slide_cache (SlideCache, optional): Cache of slides rendered earlier. Each shard uses a share of
+            it, and their hit and miss counters stay with the workers. Defaults to None.
+        on_slide (callable, optional): Called with the number of slides added so far, after each
+            shard is merged. Defaults to None.
+    """
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    shard_size = max(1, min(WORKER_SHARD_GOALS, -(-len(goals) // workers)))
+    shards = [goals[start:start + shard_size] for start in range(0, len(goals), shard_size)]
+    if not shards:
+        return
+    merger = SlideMerger(prs, writer)
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+        def submit(shard):
+            return executor.submit(render_shard, template_powerpoint, shard, theme_layout, okr_layout, render_engine,
+                                   slide_cache.share(len(shards)) if slide_cache is not None else None)
+
+        in_flight = workers * SHARDS_IN_FLIGHT_PER_WORKER
+        futures = deque(submit(shard) for shard in shards[:in_flight])
+        done = 0
+        for shard in shards[in_flight:] + [None] * len(futures):
+            # Merged in goal order; each merged shard makes room for the next one
+            done += len(merger.merge(futures.popleft().result()))
+            if shard is not None:
+                futures.append(submit(shard))
+            if on_slide is not None:
+                on_slide(done)
+
+def render_goals(prs, goals, template_powerpoint, theme_layout, okr_layout, render_engine=SHAPES_ENGINE, workers=1, writer=None,
+                 slide_cache=None, on_slide=None, hooks=None):
+    """
+    Add the slides for goals to the presentation, in order.
+
+    Args:
+        prs (Presentation): The PowerPoint presentation object, made from template_powerpoint.
+        goals (list): The goal objects, in slide order.
+        template_powerpoint (str): Path to the template PowerPoint file.
+        theme_layout (tuple): Slide master index and layout index for Theme slides.
+        okr_layout (tuple): Slide master index and layout index for Objective, Outcome and Action slides.
+        render_engine (str, optional): The render engine. Defaults to SHAPES_ENGINE.
+        workers (int, optional): Number of worker processes; 1 renders in this process. Defaults to 1.
+        writer (StreamingPresentationWriter, optional): Writer to stream each slide to. Defaults to None.
+        slide_cache (SlideCache, optional): Cache of slides rendered earlier. Defaults to None.
+        on_slide (callable, optional): Called with the number of slides added so far, after each
+            slide, or after each shard with workers. Defaults to None.
+        hooks (ConversionHooks, optional): Hooks to emit SLIDE_RENDERED_EVENT to, for slides rendered
+            in this process. Defaults to None.
+    """
+    if workers > 1:
+        render_in_workers(prs, goals, template_powerpoint, theme_layout, okr_layout, render_engine, workers, writer,
+                          slide_cache, on_slide)
+        return
+    renderer = make_renderer(render_engine, prs, theme_layout, okr_layout)
+    if slide_cache is not None:
+        renderer = CachingRenderer(renderer, slide_cache)
+    if hooks is not None and hooks.wants(SLIDE_RENDERED_EVENT):
+        renderer = HookedRenderer(renderer, hooks)
+    for done, goal in enumerate(goals, start=1):
+        slide = renderer.render(goal)
+        if writer is not None:
+            writer.add_slide(slide)
+        if on_slide is not None:
+            on_slide(done)
+    if slide_cache is not None:
+        slide_cache.flush()
+
+def split_goals_by_theme(goals, sort_key):
+    """
+    Split goals in slide order into the goals of each Theme, and the goals that are under no Theme.
+
+    Args:
+        goals (list): The goal objects, in slide order.
+        sort_key (callable): Returns the sort key of a goal, such as ConversionContext.sort_key.
+
+    Returns:
+        list: (Theme, goals) for each Theme in slide order, each list of goals starting with its
+            Theme, followed by (None, goals) for the goals under no Theme if there are any.
+    """
+    parts, unthemed = [], []
+    group_row, part = None, None
     for goal in goals:
-        if goal.tag == THEME_TAG:
-            slide = create_slide(prs, (theme_slide_master, theme_slide_master_layout), goal.title)
-            continue
+        # Goals of a Theme share the first part of their sort key, the row of the Theme
+        row = sort_key(goal)[0]
+        if row != group_row:
+            group_row = row
+            if goal.tag == THEME_TAG:
+                part = []
+                parts.append((goal, part))
+            else:
+                part = unthemed
+        part.append(goal)
+    if unthemed:
+        parts.append((None, unthemed))
+    return parts
+
+def theme_deck_path(target_path, number, theme, count):
+    """
+    Return the path of the split deck of a Theme: the target path with its number and title added.
+
+    Args:
+        target_path (str): Path to the index deck.
+        number (int): The 1-based position of the deck.
+        theme (VivaGoal): The Theme, or None for the deck of goals under no Theme.
+        count (int): The number of split decks, which sets the width of the number.
+
+    Returns:
+        str: The path, next to target_path.
+    """
+    stem, extension = os.path.splitext(target_path)
+    slug = re.sub(r'[^a-z0-9]+', '-', theme.title.casefold()).strip('-')[:40] if theme is not None else 'other'
+    return f"{stem}-{number:0{max(2, len(str(count)))}d}-{slug or 'theme'}{extension or '.pptx'}"
+
+def render_deck(template_powerpoint, goals, target_path, theme_layout, okr_layout, render_engine=SHAPES_ENGINE,
+                stream=False, slide_cache=None):
+    """
+    Render goals into a new presentation made from the template and save it.
+    This runs in worker processes for split decks, so its arguments and result can be pickled.
+
+    Args:
+        template_powerpoint (str): Path to the template PowerPoint file.
+        goals (list): The goal objects, in slide order.
+        target_path (str): Where to save the presentation.
+        theme_layout (tuple): Slide master index and layout index for Theme slides.
+        okr_layout (tuple): Slide master index and layout index for Objective, Outcome and Action slides.
+        render_engine (str, optional): The render engine. Defaults to SHAPES_ENGINE.
+        stream (bool, optional): Whether to write each slide as soon as it is rendered. Defaults to False.
+        slide_cache (SlideCache, optional): Cache of slides rendered earlier. Defaults to None.
+
+    Returns:
+        int: The number of slides rendered.
+    """
+    count_operation(FILE_READS)
+    prs = Presentation(template_powerpoint)
+    writer = None
+    if stream:
+        from pptx_writer import StreamingPresentationWriter
+
+        writer = StreamingPresentationWriter(prs, target_path)
+    try:
+        render_goals(prs, goals, template_powerpoint, theme_layout, okr_layout, render_engine, writer=writer,
+                     slide_cache=slide_cache)
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    if writer is not None:
+        writer.close()
+    else:
+        prs.save(target_path)
+    return len(goals)
+
+def add_index_slide(prs, theme_layout, title, deck_path, slide_count):
+    """
+    Add a slide linking to a split deck to the index deck.
+
+    Args:
+        prs (Presentation): The index deck.
+        theme_layout (tuple): Slide master index and layout index of the slide.
+        title (str): The title of the slide.
+        deck_path (str): Path to the split deck; the link is its file name, so the decks must stay
+            in one directory.
+        slide_count (int): The number of slides in the split deck.
+
+    Returns:
+        Slide: The created slide object.
+    """
+    slide = create_slide(prs, theme_layout, title)
+    link = os.path.basename(deck_path)
+    try:
+        for paragraph in slide.shapes.title.text_frame.paragraphs:
+            for run in paragraph.runs:
+                run.hyperlink.address = link
+        dimensions = SquareDimensions(left=0.5, top=6.4, width=12, height=0.6)
+        text_box = slide.shapes.add_textbox(dimensions.left, dimensions.top, dimensions.width, dimensions.height)
+        count_operation(SHAPES_CREATED)
+        p = add_paragraph_with_text(text_box.text_frame, f"{link} ({slide_count} slides)")
+        p.runs[0].hyperlink.address = link
+    except Exception as e:
+        raise ValueError(f"Error adding index slide: {e}")
+    return slide
+
+def render_theme_decks(prs, goals, sort_key, template_powerpoint, target_path, theme_layout, okr_layout,
+                       render_engine=SHAPES_ENGINE, workers=1, stream=False, slide_cache=None, on_slide=None):
+    """
+    Write the goals of each Theme to a deck of its own, and add a slide linking to each deck to prs.
+
+    The decks are rendered from the template by a pool of worker processes, one deck per task.
+    Each deck depends only on its goals, so the decks are the same whatever the number of workers.
+
+    Args:
+        prs (Presentation): The index deck, made from template_powerpoint.
+        goals (list): The goal objects, in slide order.
+        sort_key (callable): Returns the sort key of a goal, such as ConversionContext.sort_key.
+        template_powerpoint (str): Path to the template PowerPoint file.
+        target_path (str): Path to the index deck; the split decks are written next to it.
+        theme_layout (tuple): Slide master index and layout index for Theme and index slides.
+        okr_layout (tuple): Slide master index and layout index for Objective, Outcome and Action slides.
+        render_engine (str, optional): The render engine. Defaults to SHAPES_ENGINE.
+        workers (int, optional): Number of decks rendered at once; 1 renders them in this process.
+            Defaults to 1.
+        stream (bool, optional): Whether to write each slide as soon as it is rendered. Defaults to False.
+        slide_cache (SlideCache, optional): Cache of slides rendered earlier. With workers, each deck
+            uses a share of it. Defaults to None.
+        on_slide (callable, optional): Called with the number of goal slides written so far, after
+            each deck. Defaults to None.
+
+    Returns:
+        list: The path of each split deck, in slide order.
+    """
+    parts = split_goals_by_theme(goals, sort_key)
+    paths = [theme_deck_path(target_path, number, theme, len(parts))
+             for number, (theme, _) in enumerate(parts, start=1)]
+    tasks = [(template_powerpoint, part_goals, path, theme_layout, okr_layout, render_engine, stream, slide_cache)
+             for (_, part_goals), path in zip(parts, paths)]
+    executor = None
+    if workers > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(tasks)))
+        if slide_cache is not None:
+            tasks = [task[:-1] + (slide_cache.share(len(tasks)),) for task in tasks]
+        futures = [executor.submit(render_deck, *task) for task in tasks]
+    try:
+        done = 0
+        # Decks are waited for in slide order, so progress and the index deck do not depend on which finished first
+        for number, ((theme, part_goals), path) in enumerate(zip(parts, paths)):
+            if executor is not None:
+                futures[number].result()
+            else:
+                render_deck(*tasks[number])
+            done += len(part_goals)
+            if on_slide is not None:
+                on_slide(done)
+            add_index_slide(prs, theme_layout, theme.title if theme is not None else "Other goals", path,
+                            len(part_goals))
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return paths
+
+def goal_fingerprint(goal):
+    """Return a digest of the fields of a goal that show on its slide."""
+    values = repr(tuple(getattr(goal, field) for field in FINGERPRINT_FIELDS) + split_alignment(goal))
+    return hashlib.sha1(values.encode('utf-8')).hexdigest()
+
+def render_settings(template_powerpoint, theme_layout, okr_layout):
+    """
+    Describe everything besides the goals that decides how slides look, to tell whether
+    slides of an earlier run can be reused.
+
+    Args:
+        template_powerpoint (str): Path to the template PowerPoint file.
+        theme_layout (tuple): Slide master index and layout index for Theme slides.
+        okr_layout (tuple): Slide master index and layout index for Objective, Outcome and Action slides.
+
+    Returns:
+        dict: The settings, as stored in the manifest.
+    """
+    images = [OBJECTIVE_IMAGE, OUTCOME_IMAGE, INITIATIVE_IMAGE]
+    return {
+        'render_version': RENDER_VERSION,
+        'template': _file_digest(template_powerpoint),
+        'theme_layout': list(theme_layout),
+        'okr_layout': list(okr_layout),
+        'images': {path: _file_digest(path) for path in images if os.path.isfile(path)},
+    }
+
+def load_manifest(manifest_path, deck_path, settings):
+    """
+    Load the manifest of an earlier run that wrote deck_path.
+
+    Args:
+        manifest_path (str): Path to the manifest.
+        deck_path (str): Path to the deck the manifest describes.
+        settings (dict): The render settings of this run.
+
+    Returns:
+        dict: Slide positions in the deck by (goal id, fingerprint), or None if there is no manifest,
+            or the deck, template, layouts or icons changed since it was written.
+    """
+    try:
+        count_operation(FILE_READS)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION or manifest.get('settings') != settings:
+        return None
+    if not os.path.isfile(deck_path) or _file_digest(deck_path) != manifest.get('deck'):
+        return None
+    first_slide = manifest['first_slide']
+    return {(goal_id, fingerprint): first_slide + index for index, (goal_id, fingerprint) in enumerate(manifest['slides'])}
 
-        slide = create_slide(prs, (okr_slide_master, okr_slide_master_layout), goal.title)
-        add_goal_details_to_slide(slide, goal)
-
-        cleaned_alignment = re.sub(r"\(weight: \d+(\.\d+)?%, Id: \d+\)", "", goal.alignment)
-        if goal.object_type == OBJECTIVE_TYPE:
-            image_path = OBJECTIVE_IMAGE
-            parts = cleaned_alignment.split(" / ")
-            alignment, mwb = "", ""
-            for part in parts:
-                # no-dd-sa:python-best-practices/nested-blocks
-                if part.startswith("MWB:"):
-                    mwb = part
-                else:
-                    alignment = part
-            # no-dd-sa:python-best-practices/nested-blocks
-            if alignment:
-                p = add_paragraph_with_text(slide.shapes[-1].text_frame, "Parent plan theme: ", True, 18, 1)
-                add_run_with_text(p, alignment, False, 18)
-            # no-dd-sa:python-best-practices/nested-blocks
-            if mwb:
-                add_paragraph_with_text(slide.shapes[-1].text_frame, "")
-                p = add_paragraph_with_text(slide.shapes[-1].text_frame, "Parent MWB alignment: ", True, 18, 1, RGBColor(0, 176, 240))
-                add_run_with_text(p, mwb, False, 18)
-            dimensions = SquareDimensions(left=0.5, top=0.3, width=12.5, height=0.75)
-            title_rect = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, dimensions.left, dimensions.top, dimensions.width, dimensions.height)
-            title_rect.fill.solid()
-            title_rect.fill.fore_color.rgb = RGBColor(0, 43, 72)
-            title_rect.line.color.rgb = RGBColor(0, 0, 255)
-            spTree = slide.shapes._spTree
-            spTree.remove(title_rect._element)
-            spTree.insert(2, title_rect._element)
+def write_manifest(manifest_path, deck_path, settings, goals, first_slide):
+    """
+    Record which goal each slide of a finished deck shows, for the next incremental run.
+
+    Args:
+        manifest_path (str): Path to the manifest.
+        deck_path (str): Path to the finished deck.
+        settings (dict): The render settings of this run.
+        goals (list): The goal objects, in slide order.
+        first_slide (int): Position of the first goal slide, after the template's own slides.
+    """
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'settings': settings,
+        'deck': _file_digest(deck_path),
+        'first_slide': first_slide,
+        'slides': [[goal.goal_id, goal_fingerprint(goal)] for goal in goals],
+    }
+    temp_path = manifest_path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(temp_path, manifest_path)
+
+def render_goals_incrementally(prs, goals, renderer, deck, previous_slides, writer=None, on_slide=None):
+    """
+    Add the slides for goals to the presentation, copying the slides of goals that are unchanged
+    since the previous run from its deck and rendering the rest.
+    A slide does not depend on its position, so goals that only moved are copied too.
+
+    Args:
+        prs (Presentation): The PowerPoint presentation object.
+        goals (list): The goal objects, in slide order.
+        renderer (SlideRenderer): Renderer for new and changed goals.
+        deck (SlideArchive): The deck of the previous run.
+        previous_slides (dict): Slide positions in the deck by (goal id, fingerprint), from load_manifest.
+        writer (StreamingPresentationWriter, optional): Writer to stream each slide to. Defaults to None.
+        on_slide (callable, optional): Called with the number of slides added so far, after each slide.
+            Defaults to None.
+
+    Returns:
+        int: The number of slides rendered.
+    """
+    merger = SlideMerger(prs, writer)
+    rendered = 0
+    for done, goal in enumerate(goals, start=1):
+        index = previous_slides.get((goal.goal_id, goal_fingerprint(goal))) if goal.goal_id else None
+        if index is not None and index < len(deck):
+            merger.merge(deck.export([index]))
         else:
-            p = add_paragraph_with_text(slide.shapes[-1].text_frame, "Parent objective: ", True, 18, 1)
-            add_run_with_text(p, cleaned_alignment, False, 18)
-            image_path = INITIATIVE_IMAGE if goal.object_type == ACTION_TYPE else OUTCOME_IMAGE
+            slide = renderer.render(goal)
+            if writer is not None:
+                writer.add_slide(slide)
+            rendered += 1
+        if on_slide is not None:
+            on_slide(done)
+    return rendered
+
+def read_template_layouts(template_powerpoint):
+    """
+    Read the names of the slide layouts of each slide master of a template, straight from its zip.
 
-        add_goal_image(slide, goal, image_path)
-        add_goal_description(slide, goal)
+    This is much faster than opening the template with python-pptx, and masters and layouts
+    are in the order python-pptx indexes them.
 
-    prs.save(target_bizplan_powerpoint)
+    Args:
+        template_powerpoint (str): Path to the template PowerPoint file.
+
+    Raises:
+        ValueError: If the file is not a PowerPoint file.
+
+    Returns:
+        list: For each slide master, the list of the names of its layouts.
+    """
+    import posixpath
+    import zipfile
+    from xml.etree import ElementTree
+
+    namespaces = {
+        'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+        'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+        'rel': 'http://schemas.openxmlformats.org/package/2006/relationships',
+    }
+    rId = '{%s}id' % namespaces['r']
+
+    def related(package, partname):
+        # Targets of the relationships of a part by rId, as zip member names
+        rels_name = posixpath.join(posixpath.dirname(partname), '_rels', posixpath.basename(partname) + '.rels')
+        targets = {}
+        for rel in ElementTree.fromstring(package.read(rels_name)).findall('rel:Relationship', namespaces):
+            target = rel.get('Target')
+            if target.startswith('/'):
+                targets[rel.get('Id')] = target[1:]
+            else:
+                targets[rel.get('Id')] = posixpath.normpath(posixpath.join(posixpath.dirname(partname), target))
+        return targets
+
+    count_operation(FILE_READS)
+    try:
+        with zipfile.ZipFile(template_powerpoint) as package:
+            presentation_name = 'ppt/presentation.xml'
+            presentation = ElementTree.fromstring(package.read(presentation_name))
+            masters = related(package, presentation_name)
+            layouts = []
+            for master_id in presentation.findall('p:sldMasterIdLst/p:sldMasterId', namespaces):
+                master_name = masters[master_id.get(rId)]
+                master = ElementTree.fromstring(package.read(master_name))
+                master_layouts = related(package, master_name)
+                names = []
+                for layout_id in master.findall('p:sldLayoutIdLst/p:sldLayoutId', namespaces):
+                    layout = ElementTree.fromstring(package.read(master_layouts[layout_id.get(rId)]))
+                    names.append(layout.find('p:cSld', namespaces).get('name', ''))
+                layouts.append(names)
+            return layouts
+    except (OSError, KeyError, AttributeError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+        raise ValueError(f"Cannot read the slide layouts of {template_powerpoint}: {e}")
+
+def validate_conversion(source_workbook=SOURCE_WORKBOOK, template_powerpoint=TEMPLATE_POWERPOINT,
+                        theme_layout=(THEME_SLIDE_MASTER, THEME_SLIDE_MASTER_LAYOUT),
+                        okr_layout=(OKR_SLIDE_MASTER, OKR_SLIDE_MASTER_LAYOUT), reader=NATIVE_READER, select=None):
+    """
+    Check a conversion without rendering it: every goal, every alignment reference and the
+    layout indices in the template, collecting all problems instead of stopping at the first.
+
+    No shapes are built and python-pptx is not imported.
+
+    Args:
+        source_workbook (str, optional): Path to the source Excel workbook. Defaults to SOURCE_WORKBOOK.
+        template_powerpoint (str, optional): Path to the template PowerPoint file. Defaults to TEMPLATE_POWERPOINT.
+        theme_layout (tuple, optional): Slide master index and layout index for Theme slides.
+        okr_layout (tuple, optional): Slide master index and layout index for Objective, Outcome and Action slides.
+        reader (str, optional): The workbook reader. Defaults to NATIVE_READER, which does not import openpyxl.
+        select (dict, optional): Keyword arguments for ConversionContext.select; if the goals are
+            valid, only the selected goals are counted. Defaults to None.
+
+    Returns:
+        dict: 'goals', the number of goals in the workbook; 'layouts', the layout, its name (None
+            if not in the template) and slide count of each layout the deck uses; and 'problems',
+            one message per problem found, in workbook order.
+    """
+    problems = []
+    try:
+        context = ConversionContext.from_workbook(source_workbook, reader=reader, errors=problems)
+    except Exception as e:
+        context = ConversionContext([])
+        problems.append(f"Cannot read {source_workbook}: {e}")
+
+    # Each goal is checked on its own, so one bad goal is reported once and does not hide the others
+    seen_ids = {}
+    goal_errors = set()
+    for goal in context.goals:
+        where = f"Row {goal.row_number + 2} ({goal.title})"
+        if goal.goal_id in seen_ids:
+            problems.append(f"{where}: Duplicate goal id {goal.goal_id}, also on row {seen_ids[goal.goal_id] + 2}")
+        else:
+            seen_ids[goal.goal_id] = goal.row_number
+        count_operation(REGEX_EVALUATIONS)
+        for parent_id in ALIGNMENT_PATTERN.findall(goal.alignment or ''):
+            if parent_id not in context.goals_by_id:
+                problems.append(f"{where}: Aligned to unknown goal id {parent_id}")
+        try:
+            _local_sort_key(goal, context.parents_of(goal))
+        except ValueError as e:
+            problems.append(f"{where}: {e}")
+            goal_errors.add(str(e))
+    # Resolving whole parent chains then finds the alignment cycles; other errors on a chain were reported above
+    cycles = set()
+    for goal in context.goals:
+        try:
+            context.sort_key(goal)
+        except ValueError as e:
+            if str(e) in goal_errors:
+                continue
+            # Chains are walked through first parents; report each cycle once, whichever goal leads into it
+            rows = []
+            current = goal
+            while current.row_number not in rows:
+                rows.append(current.row_number)
+                current = context.parents_of(current)[0]
+            cycle = frozenset(rows[rows.index(current.row_number):])
+            if cycle not in cycles:
+                cycles.add(cycle)
+                problems.append(f"Row {goal.row_number + 2} ({goal.title}): {e}")
+
+    goals = context.goals
+    if select and not problems:
+        try:
+            goals = context.select(**select)
+        except ValueError as e:
+            problems.append(str(e))
+
+    try:
+        template_layouts = read_template_layouts(template_powerpoint)
+    except ValueError as e:
+        template_layouts = None
+        problems.append(str(e))
+    names = {}
+    for kind, (master, layout) in (('Theme', theme_layout), ('OKR', okr_layout)):
+        if template_layouts is None:
+            names[master, layout] = None
+        elif not 0 <= master < len(template_layouts):
+            problems.append(f"Invalid {kind} slide master: {master}. The template has {len(template_layouts)}")
+            names[master, layout] = None
+        elif not 0 <= layout < len(template_layouts[master]):
+            problems.append(f"Invalid {kind} slide layout: {layout}. Slide master {master} has "
+                            f"{len(template_layouts[master])}")
+            names[master, layout] = None
+        else:
+            names[master, layout] = template_layouts[master][layout]
+
+    themes = sum(goal.tag == THEME_TAG for goal in goals)
+    slides = {}
+    for layout, count in ((tuple(theme_layout), themes), (tuple(okr_layout), len(goals) - themes)):
+        slides[layout] = slides.get(layout, 0) + count
+    return {
+        'goals': len(context.goals),
+        'layouts': [{'layout': list(layout), 'name': names[layout], 'slides': count} for layout, count in slides.items()],
+        'problems': problems,
+    }
+
+def main(source_workbook=SOURCE_WORKBOOK, template_powerpoint=TEMPLATE_POWERPOINT,
+         target_bizplan_powerpoint=TARGET_BIZPLAN_POWERPOINT, theme_slide_master=THEME_SLIDE_MASTER,
+         theme_slide_master_layout=THEME_SLIDE_MASTER_LAYOUT, okr_slide_master=OKR_SLIDE_MASTER,
+         okr_slide_master_layout=OKR_SLIDE_MASTER_LAYOUT, reader=OPENPYXL_READER, render_engine=SHAPES_ENGINE,
+         workers=1, stream=False, cache_dir=None, cache_max_bytes=DEFAULT_MAX_BYTES, incremental=False, prs=None,
+         progress=None, hooks=None, select=None, split_themes=False, cache_slides=False):
+    # progress, if given, is called with (stage, done, total) as each stage finishes and after each slide;
+    # hooks, if given, is a ConversionHooks told about each phase and rendered slide;
+    # select, if given, is a dict of keyword arguments for ConversionContext.select;
+    # split_themes writes each Theme to a deck of its own and the target to an index deck linking to them;
+    # cache_slides also caches rendered slides in cache_dir, which otherwise only caches parsed goals.
+    # Returns a dict with the number of slides, how many were rendered and how many copied from the
+    # previous target by an incremental run, the paths of the Theme decks written by split_themes
+    # (empty otherwise), and the slide cache hits, misses and skipped stores
+    if progress is None:
+        progress = lambda stage, done, total: None
+    if hooks is None:
+        hooks = ConversionHooks()
+    if workers < 1:
+        raise ValueError(f"Invalid number of workers: {workers}. Must be at least 1")
+    if split_themes and incremental:
+        raise ValueError("Split Theme decks cannot be rendered incrementally")
+    cache = DiskCache(cache_dir, cache_max_bytes) if cache_dir else None
+    with hooks.phase(LOAD_PHASE):
+        context = load_conversion_context(source_workbook, reader, cache)
+    progress(LOADED_STAGE, len(context.goals), len(context.goals))
+    with hooks.phase(SORT_PHASE):
+        goals = context.select(**select) if select else context.ordered_goals
+    progress(SORTED_STAGE, len(goals), len(goals))
+    on_slide = lambda done: progress(RENDERED_STAGE, done, len(goals))
+    with hooks.phase(TEMPLATE_PHASE):
+        if prs is None:
+            count_operation(FILE_READS)
+            prs = Presentation(template_powerpoint)
+
+    theme_layout = (theme_slide_master, theme_slide_master_layout)
+    okr_layout = (okr_slide_master, okr_slide_master_layout)
+    cache_slides = cache_slides and cache is not None
+    settings = render_settings(template_powerpoint, theme_layout, okr_layout) if incremental or cache_slides else None
+    slide_cache = SlideCache(cache, settings) if cache_slides else None
+    previous_slides = None
+    if incremental:
+        manifest_path = target_bizplan_powerpoint + MANIFEST_SUFFIX
+        previous_slides = load_manifest(manifest_path, target_bizplan_powerpoint, settings)
+        first_slide = len(prs.slides)
+
+    rendered = len(goals)
+    paths = []
+    writer = None
+    if stream and not split_themes:
+        from pptx_writer import StreamingPresentationWriter
+
+        writer = StreamingPresentationWriter(prs, target_bizplan_powerpoint)
+    try:
+        with hooks.phase(RENDER_PHASE):
+            if split_themes:
+                paths = render_theme_decks(prs, goals, context.sort_key, template_powerpoint, target_bizplan_powerpoint,
+                                           theme_layout, okr_layout, render_engine, workers, stream, slide_cache,
+                                           on_slide)
+            elif previous_slides is not None:
+                from pptx_writer import SlideArchive
+
+                count_operation(FILE_READS)
+                with SlideArchive(target_bizplan_powerpoint) as deck:
+                    renderer = make_renderer(render_engine, prs, theme_layout, okr_layout)
+                    if slide_cache is not None:
+                        renderer = CachingRenderer(renderer, slide_cache)
+                    if hooks.wants(SLIDE_RENDERED_EVENT):
+                        renderer = HookedRenderer(renderer, hooks)
+                    rendered = render_goals_incrementally(prs, goals, renderer, deck, previous_slides, writer, on_slide)
+                if slide_cache is not None:
+                    slide_cache.flush()
+            else:
+                render_goals(prs, goals, template_powerpoint, theme_layout, okr_layout, render_engine, workers, writer,
+                             slide_cache, on_slide, hooks)
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    with hooks.phase(SAVE_PHASE):
+        if writer is not None:
+            writer.close()
+        else:
+            prs.save(target_bizplan_powerpoint)
+
+    if incremental:
+        write_manifest(manifest_path, target_bizplan_powerpoint, settings, goals, first_slide)
+    progress(SAVED_STAGE, len(goals), len(goals))
+    return {
+        'slides': len(goals),
+        'rendered': rendered,
+        'copied': len(goals) - rendered,
+        'theme_decks': paths,
+        'slide_cache_hits': slide_cache.hits if slide_cache is not None else 0,
+        'slide_cache_misses': slide_cache.misses if slide_cache is not None else 0,
+        'slide_cache_skipped': slide_cache.skipped if slide_cache is not None else 0,
+    }
 
 
 if __name__ == "__main__":
+    import argparse
+
     parser = argparse.ArgumentParser(description='Transform Viva Goals Excel export into a PowerPoint file.')
     parser.add_argument('--source_workbook', type=str, default='VivaGoals.xlsx', help='Path to the source Excel workbook.')
     parser.add_argument('--template_powerpoint', type=str, default='template.pptx', help='Path to the template PowerPoint file.')
@@ -462,8 +2652,69 @@ if __name__ == "__main__":
     parser.add_argument('--theme_slide_master_layout', type=int, default=THEME_SLIDE_MASTER_LAYOUT, help='Index of the theme slide master layout.')
     parser.add_argument('--okr_slide_master', type=int, default=OKR_SLIDE_MASTER, help='Index of the OKR slide master.')
     parser.add_argument('--okr_slide_master_layout', type=int, default=OKR_SLIDE_MASTER_LAYOUT, help='Index of the OKR slide master layout.')
+    parser.add_argument('--reader', type=str, choices=WORKBOOK_READERS, default=None, help='Workbook reader: openpyxl, or native to parse the sheet XML directly. Defaults to openpyxl, or native with --dry-run.')
+    parser.add_argument('--render_engine', type=str, choices=RENDER_ENGINES, default=SHAPES_ENGINE, help='Slide render engine: shapes, or prototype to copy one finished slide per slide type.')
+    parser.add_argument('--workers', type=int, default=1, help='Number of processes rendering slides in parallel.')
+    parser.add_argument('--stream', action='store_true', help='Write each slide to the output file as soon as it is rendered, keeping memory flat.')
+    parser.add_argument('--cache_dir', type=str, default=DEFAULT_CACHE_DIR, help='Directory caching parsed workbooks, and rendered slides with --cache_slides, between runs.')
+    parser.add_argument('--cache_size_mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), help='Size limit of the cache directory in MB; least recently used entries are evicted.')
+    parser.add_argument('--no_cache', '--no-cache', action='store_true', help='Parse the workbook and render every slide without reading or writing the cache.')
+    parser.add_argument('--cache_slides', '--cache-slides', action='store_true', help='Also cache rendered slides in the cache directory, and copy the slides of goals rendered before.')
+    parser.add_argument('--incremental', action='store_true', help='Re-render only new and changed goals, copying the other slides from the previous target file.')
+    parser.add_argument('--split_themes', '--split-themes', action='store_true', help='Write each Theme and its goals to a deck of its own next to the target file, and the target file as an index deck linking to them. With --workers, that many decks are rendered at once.')
+    parser.add_argument('--dry_run', '--dry-run', action='store_true', help='Check every goal, alignment and layout index and print all problems and the slide count per layout, without rendering or writing a deck. Exits with 1 if there are problems.')
+    parser.add_argument('--profile', type=str, default=None, help='Write phase times, slide render times by slide type, slide and shape counts and peak memory to this JSON file. Memory is traced with tracemalloc, so the times are slower than an untraced run.')
+    parser.add_argument('--theme', action='append', default=[], help='Only convert this Theme, by title or id, and its goals. Can be repeated.')
+    parser.add_argument('--goal_id', '--goal-id', action='append', default=[], help='Only convert the goal with this id and the goals aligned to it. Can be repeated.')
+    parser.add_argument('--owner', action='append', default=[], help='Only convert goals with this owner. Can be repeated.')
+    parser.add_argument('--period', action='append', default=[], help='Only convert goals in this period. Can be repeated.')
+    parser.add_argument('--status', action='append', default=[], help='Only convert goals with this status. Can be repeated.')
+    parser.add_argument('--profile_dump', type=str, default=None, help='Also run the conversion under cProfile and write its stats to this file, for pstats or snakeviz. Without --profile, memory is not traced.')
 
     args = parser.parse_args()
-    main(source_workbook=args.source_workbook, template_powerpoint=args.template_powerpoint, target_bizplan_powerpoint=args.target_bizplan_powerpoint,
-         theme_slide_master=args.theme_slide_master, theme_slide_master_layout=args.theme_slide_master_layout,
-         okr_slide_master=args.okr_slide_master, okr_slide_master_layout=args.okr_slide_master_layout)
+    select = {'themes': args.theme, 'goal_ids': args.goal_id, 'owners': args.owner, 'periods': args.period,
+              'statuses': args.status}
+    if args.dry_run:
+        import sys
+
+        report = validate_conversion(args.source_workbook, args.template_powerpoint,
+                                     (args.theme_slide_master, args.theme_slide_master_layout),
+                                     (args.okr_slide_master, args.okr_slide_master_layout),
+                                     args.reader or NATIVE_READER, select)
+        print(f"{args.source_workbook}: {report['goals']} goals")
+        for layout in report['layouts']:
+            name = f" ({layout['name']})" if layout['name'] is not None else ""
+            print(f"Slide master {layout['layout'][0]}, layout {layout['layout'][1]}{name}: {layout['slides']} slides")
+        if report['problems']:
+            print(f"{len(report['problems'])} problems:")
+            for problem in report['problems']:
+                print(f"  {problem}")
+        sys.exit(1 if report['problems'] else 0)
+
+    profiler = None
+    if args.profile or args.profile_dump:
+        from biz_plan_profile import ConversionProfiler
+
+        profiler = ConversionProfiler(trace_memory=bool(args.profile), cprofile=bool(args.profile_dump))
+        profiler.start()
+    result = main(source_workbook=args.source_workbook, template_powerpoint=args.template_powerpoint, target_bizplan_powerpoint=args.target_bizplan_powerpoint,
+                  theme_slide_master=args.theme_slide_master, theme_slide_master_layout=args.theme_slide_master_layout,
+                  okr_slide_master=args.okr_slide_master, okr_slide_master_layout=args.okr_slide_master_layout,
+                  reader=args.reader or OPENPYXL_READER, render_engine=args.render_engine, workers=args.workers,
+                  stream=args.stream, cache_dir=None if args.no_cache else args.cache_dir,
+                  cache_max_bytes=args.cache_size_mb * 1024 * 1024, incremental=args.incremental, split_themes=args.split_themes,
+                  hooks=profiler.hooks if profiler is not None else None,
+                  select=select, cache_slides=args.cache_slides)
+    if args.split_themes:
+        print(f"Wrote {result['slides']} slides to {len(result['theme_decks'])} Theme decks indexed by {args.target_bizplan_powerpoint}")
+    if args.incremental:
+        print(f"Rendered {result['rendered']} new or changed slides, copied {result['copied']} from {args.target_bizplan_powerpoint}")
+    if result['slide_cache_hits'] + result['slide_cache_misses']:
+        skipped = f", {result['slide_cache_skipped']} not stored as the cache is full" if result['slide_cache_skipped'] else ""
+        print(f"Slide cache: {result['slide_cache_hits']} hits, {result['slide_cache_misses']} misses{skipped}")
+    if profiler is not None:
+        profiler.stop()
+        if args.profile:
+            profiler.write_report(args.profile)
+        if args.profile_dump:
+            profiler.dump_stats(args.profile_dump)
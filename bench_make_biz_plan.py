@@ -0,0 +1,379 @@
+"""
+Benchmarks for Make_Biz_Plan.
+
+Generates synthetic Viva Goals exports and times the conversion code against
+them. Results are printed as JSON so runs can be compared between versions.
+
+Usage:
+    python bench_make_biz_plan.py readers --goals 10000
+    python bench_make_biz_plan.py plan --goals 100000
+    python bench_make_biz_plan.py pipeline --sizes 1000 10000 100000 --output results.json
+    python bench_make_biz_plan.py pipeline --sizes 1000 --baseline results.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+import Make_Biz_Plan
+from Make_Biz_Plan import (GOAL_COLUMNS, LOADED_STAGE, NATIVE_READER, OPENPYXL_READER, PROTOTYPE_ENGINE,
+                           RENDER_ENGINES, RENDERED_STAGE, SAVED_STAGE, SORTED_STAGE, WORKBOOK_READERS)
+
+PIPELINE_SIZES = (1000, 10000, 100000)
+# Stages of the pipeline suite, in the order they run
+PIPELINE_STAGES = ('template', 'load', 'sort', 'render', 'save')
+
+OBJECTIVES_PER_THEME = 4
+OUTCOMES_PER_OBJECTIVE = 2
+ACTIONS_PER_OBJECTIVE = 3
+WORDS = ('deliver', 'customer', 'platform', 'growth', 'quality', 'reliability', 'partner', 'revenue',
+         'adoption', 'security', 'latency', 'onboarding', 'retention', 'efficiency', 'roadmap', 'launch')
+
+
+def _sentence(rng, min_words, max_words):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))).capitalize()
+
+
+def _goal_row(rng, goal_id, title, tag, object_type, alignment):
+    return [
+        f'=HYPERLINK("https://goals.microsoft.com/okrs/{goal_id}", "{goal_id}")',
+        title,
+        tag,
+        rng.choice(('Ana Diaz', 'Bo Chen', 'Kim Lee', 'Sam Roy', 'Uma Das')),
+        rng.choice(('FY25 Q1', 'FY25 Q2', 'FY25 H1', 'FY25')),
+        '2024-07-01',
+        '2025-06-30',
+        _sentence(rng, 10, 120),
+        alignment,
+        _sentence(rng, 2, 5),
+        f'{rng.randint(1, 100)}%',
+        object_type,
+        rng.choice(('On Track', 'At Risk', 'Behind', 'Not Started', 'Completed')),
+    ]
+
+
+def iter_synthetic_rows(goal_count, seed=0):
+    """
+    Yield rows of a synthetic Viva Goals export with a realistic goal hierarchy.
+
+    Each Theme has Objectives (some also aligned to an MWB), each Objective has Outcomes and
+    Actions, and some Outcomes align directly to the Theme. Rows are shuffled within each theme
+    so the sort has real work to do, and every alignment points at a goal in the export.
+
+    Args:
+        goal_count (int): Number of goal rows to generate.
+        seed (int, optional): Seed for the random generator. Defaults to 0.
+
+    Yields:
+        list: The header row followed by goal_count goal rows.
+    """
+    rng = random.Random(seed)
+    yield list(GOAL_COLUMNS)
+    next_id = 1
+    emitted = 0
+    while emitted < goal_count:
+        block = []
+        theme_id, next_id = next_id, next_id + 1
+        theme_title = f'Theme {theme_id}: {_sentence(rng, 2, 4)}'
+        block.append(_goal_row(rng, theme_id, theme_title, 'Theme', 'Objective', ''))
+        theme_alignment = f'{theme_title} (weight: 100%, Id: {theme_id})'
+
+        outcome_id, next_id = next_id, next_id + 1
+        block.append(_goal_row(rng, outcome_id, f'Outcome {outcome_id}', '', 'Outcome', theme_alignment))
+        for _ in range(OBJECTIVES_PER_THEME):
+            objective_id, next_id = next_id, next_id + 1
+            alignment = theme_alignment
+            if rng.random() < 0.3:
+                alignment += f' / MWB: {_sentence(rng, 2, 4)}'
+            block.append(_goal_row(rng, objective_id, f'Objective {objective_id}', '', 'Objective', alignment))
+            objective_alignment = f'Objective {objective_id} (weight: 100%, Id: {objective_id})'
+            for _ in range(OUTCOMES_PER_OBJECTIVE):
+                child_id, next_id = next_id, next_id + 1
+                block.append(_goal_row(rng, child_id, f'Outcome {child_id}', '', 'Outcome', objective_alignment))
+            for _ in range(ACTIONS_PER_OBJECTIVE):
+                child_id, next_id = next_id, next_id + 1
+                block.append(_goal_row(rng, child_id, f'Action {child_id}', '', 'Action', objective_alignment))
+
+        # Shuffle all but the theme; a block cut short keeps parents ahead of their children
+        if emitted + len(block) <= goal_count:
+            rest = block[1:]
+            rng.shuffle(rest)
+            block = [block[0]] + rest
+        for row in block:
+            if emitted == goal_count:
+                return
+            yield row
+            emitted += 1
+
+
+def write_synthetic_workbook(path, goal_count, seed=0):
+    """
+    Write a synthetic Viva Goals export to an .xlsx file.
+
+    Args:
+        path (str): Where to write the workbook.
+        goal_count (int): Number of goal rows.
+        seed (int, optional): Seed for the random generator. Defaults to 0.
+
+    Returns:
+        str: The path of the written workbook.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for row in iter_synthetic_rows(goal_count, seed):
+        ws.append(row)
+    wb.save(path)
+    return path
+
+
+def _timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def bench_readers(workbook_path, repeat=3):
+    """
+    Time load_goals_from_workbook with each workbook reader on the same workbook.
+
+    Args:
+        workbook_path (str): Path to the workbook.
+        repeat (int, optional): Runs per reader; the fastest is reported. Defaults to 3.
+
+    Returns:
+        dict: Best time in seconds and goal count per reader.
+    """
+    readers = {
+        'openpyxl': {'reader': OPENPYXL_READER, 'read_only': False},
+        'openpyxl_read_only': {'reader': OPENPYXL_READER, 'read_only': True},
+        'native': {'reader': NATIVE_READER},
+    }
+    results = {}
+    for name, options in readers.items():
+        best = None
+        for _ in range(repeat):
+            seconds, (goals, _) = _timed(Make_Biz_Plan.load_goals_from_workbook, workbook_path, **options)
+            best = seconds if best is None else min(best, seconds)
+        results[name] = {'seconds': round(best, 4), 'goals': len(goals)}
+    return results
+
+
+def bench_plan(workbook_path, repeat=3):
+    """
+    Time building the slide plan of the ordered goals of a workbook, without loading or sorting.
+
+    Args:
+        workbook_path (str): Path to the workbook.
+        repeat (int, optional): Runs; the fastest is reported. Defaults to 3.
+
+    Returns:
+        dict: The goal count, the best time in seconds and the goals planned per second.
+    """
+    from biz_plan_slides import build_slide_plan
+
+    goals = Make_Biz_Plan.load_conversion_context(workbook_path, NATIVE_READER).ordered_goals
+    best = min(_timed(build_slide_plan, goals)[0] for _ in range(repeat))
+    return {'goals': len(goals), 'seconds': round(best, 4), 'goals_per_second': round(len(goals) / best) if best else None}
+
+
+def write_synthetic_template(path):
+    """
+    Write a template with the default python-pptx layouts, Theme slides on layout 0 and goal slides on layout 1.
+
+    Args:
+        path (str): Where to write the template.
+
+    Returns:
+        str: The path of the written template.
+    """
+    Make_Biz_Plan.Presentation().save(path)
+    return path
+
+
+def bench_pipeline(workbook_path, template_path, target_path, render_engine=PROTOTYPE_ENGINE,
+                   reader=OPENPYXL_READER, trace_memory=False):
+    """
+    Run one conversion and time each stage of it.
+
+    The stages are the template parse, then the load, sort, render and save stages that
+    Make_Biz_Plan.main reports to its progress callback. Memory is traced with tracemalloc,
+    which slows Python down, so a traced run is best kept apart from the timed runs.
+
+    Args:
+        workbook_path (str): Path to the workbook.
+        template_path (str): Path to the template, as written by write_synthetic_template.
+        target_path (str): Where to write the deck.
+        render_engine (str, optional): The render engine. Defaults to PROTOTYPE_ENGINE.
+        reader (str, optional): The workbook reader. Defaults to OPENPYXL_READER.
+        trace_memory (bool, optional): Whether to record the peak traced memory of each stage.
+            Defaults to False.
+
+    Returns:
+        dict: Seconds per stage of PIPELINE_STAGES and in total, the slide count and, if
+            trace_memory, the peak traced memory in bytes per stage.
+    """
+    marks = {}
+    peaks = {}
+
+    def mark(stage):
+        marks[stage] = time.perf_counter()
+        if trace_memory:
+            peaks[stage] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+
+    def progress(stage, done, total):
+        # The render stage ends with its last slide, so its time is taken at every slide
+        mark({LOADED_STAGE: 'load', SORTED_STAGE: 'sort', RENDERED_STAGE: 'render', SAVED_STAGE: 'save'}[stage])
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        prs = Make_Biz_Plan.Presentation(template_path)
+        slide_count = len(prs.slides)
+        mark('template')
+        with redirect_stdout(io.StringIO()):
+            Make_Biz_Plan.main(workbook_path, template_path, target_path, 0, 0, 0, 1, reader=reader,
+                               render_engine=render_engine, prs=prs, progress=progress)
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    marks.setdefault('render', marks['sort'])
+    peaks.setdefault('render', 0)
+    seconds = {}
+    previous = start
+    for stage in PIPELINE_STAGES:
+        seconds[stage] = round(marks[stage] - previous, 4)
+        previous = marks[stage]
+    seconds['total'] = round(marks['save'] - start, 4)
+    result = {'seconds': seconds, 'slides': len(prs.slides) - slide_count}
+    if trace_memory:
+        result['peak_memory_bytes'] = {stage: peaks[stage] for stage in PIPELINE_STAGES}
+    return result
+
+
+def _max_rss_bytes():
+    """Return the peak resident set size of this process so far, or None where it is not available."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in kilobytes on Linux and in bytes on macOS
+    return max_rss if platform.system() == 'Darwin' else max_rss * 1024
+
+
+def bench_pipeline_sizes(sizes, temp_dir, render_engine=PROTOTYPE_ENGINE, reader=OPENPYXL_READER, repeat=1,
+                         trace_memory=True):
+    """
+    Benchmark the whole conversion on synthetic workbooks of each size.
+
+    Args:
+        sizes (list): Goal counts to benchmark.
+        temp_dir (str): Directory for the workbooks, template and decks.
+        render_engine (str, optional): The render engine. Defaults to PROTOTYPE_ENGINE.
+        reader (str, optional): The workbook reader. Defaults to OPENPYXL_READER.
+        repeat (int, optional): Timed runs per size; the fastest time of each stage is reported.
+            Defaults to 1.
+        trace_memory (bool, optional): Whether to make one more, traced run per size for the peak
+            memory of each stage. Defaults to True.
+
+    Returns:
+        list: One result per size, with the goal count, the workbook size in bytes, the result of
+            bench_pipeline and the peak resident set size of the process after that size. tracemalloc
+            only sees memory allocated by Python, not the lxml trees of the slides, which the resident
+            set size includes; it never goes down, so sizes are best run smallest first.
+    """
+    template_path = write_synthetic_template(os.path.join(temp_dir, 'template.pptx'))
+    results = []
+    for goal_count in sizes:
+        workbook_path = write_synthetic_workbook(os.path.join(temp_dir, f'goals{goal_count}.xlsx'), goal_count)
+        target_path = os.path.join(temp_dir, f'bizplan{goal_count}.pptx')
+        runs = [bench_pipeline(workbook_path, template_path, target_path, render_engine, reader)
+                for _ in range(repeat)]
+        result = {'goals': goal_count, 'workbook_bytes': os.path.getsize(workbook_path), 'slides': runs[0]['slides'],
+                  'seconds': {stage: min(run['seconds'][stage] for run in runs) for stage in runs[0]['seconds']}}
+        max_rss = _max_rss_bytes()
+        if max_rss is not None:
+            result['max_rss_bytes'] = max_rss
+        if trace_memory:
+            traced = bench_pipeline(workbook_path, template_path, target_path, render_engine, reader, trace_memory=True)
+            result['peak_memory_bytes'] = traced['peak_memory_bytes']
+        results.append(result)
+    return results
+
+
+def compare_pipeline(baseline, results):
+    """
+    Compare pipeline results with those of an earlier run.
+
+    Args:
+        baseline (list): The 'pipeline' results of the earlier run.
+        results (list): The 'pipeline' results of this run.
+
+    Returns:
+        dict: For each goal count in both runs, the ratio of this run's seconds to the baseline's
+            per stage; above 1 is slower. Stages the baseline did not time are left out.
+    """
+    baseline_by_size = {result['goals']: result for result in baseline}
+    comparison = {}
+    for result in results:
+        before = baseline_by_size.get(result['goals'])
+        if before is None:
+            continue
+        comparison[str(result['goals'])] = {
+            stage: round(seconds / before['seconds'][stage], 2) if before['seconds'][stage] else None
+            for stage, seconds in result['seconds'].items() if stage in before['seconds']}
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Make_Biz_Plan on synthetic Viva Goals exports.')
+    parser.add_argument('suite', choices=['readers', 'plan', 'pipeline'], help='Benchmark to run: the workbook readers, slide planning, or each stage of the whole conversion.')
+    parser.add_argument('--goals', type=int, default=10000, help='Number of goals in the synthetic workbook of the readers and plan suites.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(PIPELINE_SIZES), help='Goal counts of the pipeline suite.')
+    parser.add_argument('--render_engine', type=str, choices=RENDER_ENGINES, default=PROTOTYPE_ENGINE, help='Render engine of the pipeline suite.')
+    parser.add_argument('--reader', type=str, choices=WORKBOOK_READERS, default=OPENPYXL_READER, help='Workbook reader of the pipeline suite.')
+    parser.add_argument('--repeat', type=int, default=None, help='Runs per measurement; the fastest is reported. Defaults to 3 for readers and plan, and 1 for pipeline.')
+    parser.add_argument('--no_memory', '--no-memory', action='store_true', help='Skip the traced run that records the peak memory of each pipeline stage.')
+    parser.add_argument('--baseline', type=str, default=None, help='JSON results of an earlier pipeline run to compare against.')
+    parser.add_argument('--output', type=str, default=None, help='Write the JSON results to this file.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.suite == 'readers':
+            workbook_path = write_synthetic_workbook(os.path.join(temp_dir, 'VivaGoals.xlsx'), args.goals)
+            results = {'suite': args.suite, 'goals': args.goals,
+                       'readers': bench_readers(workbook_path, args.repeat or 3)}
+        elif args.suite == 'plan':
+            workbook_path = write_synthetic_workbook(os.path.join(temp_dir, 'VivaGoals.xlsx'), args.goals)
+            results = {'suite': args.suite, 'plan': bench_plan(workbook_path, args.repeat or 3)}
+        else:
+            results = {'suite': args.suite, 'python': platform.python_version(),
+                       'parser_version': Make_Biz_Plan.PARSER_VERSION, 'render_version': Make_Biz_Plan.RENDER_VERSION,
+                       'render_engine': args.render_engine, 'reader': args.reader,
+                       'pipeline': bench_pipeline_sizes(args.sizes, temp_dir, args.render_engine, args.reader,
+                                                        args.repeat or 1, not args.no_memory)}
+            if args.baseline:
+                with open(args.baseline) as f:
+                    results['compared_to_baseline'] = compare_pipeline(json.load(f)['pipeline'], results['pipeline'])
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    print(report)
+
+
+if __name__ == '__main__':
+    main()
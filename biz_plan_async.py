@@ -0,0 +1,109 @@
+"""
+Asyncio API for Make_Biz_Plan.
+
+convert runs a conversion in an executor thread so the event loop stays
+responsive while the workbook is loaded, the slides are rendered and the deck is
+saved. Progress events are delivered on the event loop, a cancelled conversion
+stops at its next slide, and a shared semaphore limits how many conversions run
+at once.
+
+Usage:
+    limit = asyncio.Semaphore(4)
+    await convert('VivaGoals.xlsx', 'template.pptx', 'bizplan.pptx', progress=print, limit=limit)
+"""
+
+import asyncio
+import functools
+import threading
+from contextlib import nullcontext
+
+import Make_Biz_Plan
+from Make_Biz_Plan import LOADED_STAGE, RENDERED_STAGE, SAVED_STAGE, SORTED_STAGE
+
+STAGES = (LOADED_STAGE, SORTED_STAGE, RENDERED_STAGE, SAVED_STAGE)
+
+
+class ConversionCancelled(Exception):
+    """Raised in the conversion thread to stop a conversion whose task was cancelled."""
+
+
+class ProgressEvent:
+    """
+    A step of a conversion.
+
+    Args:
+        stage (str): LOADED_STAGE, SORTED_STAGE, RENDERED_STAGE or SAVED_STAGE.
+        done (int): Goals loaded or sorted, or slides rendered or saved so far.
+        total (int): Goals or slides in the whole conversion.
+    """
+    __slots__ = ('stage', 'done', 'total')
+
+    def __init__(self, stage, done, total):
+        self.stage = stage
+        self.done = done
+        self.total = total
+
+    def __eq__(self, other):
+        if not isinstance(other, ProgressEvent):
+            return NotImplemented
+        return (self.stage, self.done, self.total) == (other.stage, other.done, other.total)
+
+    def __repr__(self):
+        return f"ProgressEvent({self.stage!r}, {self.done}, {self.total})"
+
+
+async def convert(source_workbook, template_powerpoint, target_bizplan_powerpoint, progress=None, limit=None,
+                  executor=None, slides_per_event=1, **options):
+    """
+    Convert a Viva Goals export to a PowerPoint file without blocking the event loop.
+
+    Cancelling the task stops the conversion at its next slide, or once the current stage
+    finishes; the task waits for that so a cancelled conversion no longer holds its slot of
+    limit. A streamed target file is then left as it was. The deck is not streamed otherwise,
+    and a conversion cancelled while it saves the deck finishes saving it, so the task raises
+    CancelledError although the target file was written.
+
+    Args:
+        source_workbook (str): Path to the source Excel workbook.
+        template_powerpoint (str): Path to the template PowerPoint file.
+        target_bizplan_powerpoint (str): Path to the target PowerPoint file.
+        progress (callable, optional): Called on the event loop with a ProgressEvent for each
+            step. Defaults to None.
+        limit (asyncio.Semaphore, optional): Shared by conversions to limit how many run at once.
+            Defaults to None.
+        executor (concurrent.futures.Executor, optional): Thread pool to run the conversion in.
+            Defaults to None, which uses the event loop's default executor.
+        slides_per_event (int, optional): Report every this many rendered slides, and the last one.
+            Defaults to 1.
+        **options: Other keyword arguments for Make_Biz_Plan.main, such as the layout indices,
+            render_engine or workers.
+
+    Raises:
+        ValueError: If slides_per_event is less than 1, or the conversion rejects its input.
+        asyncio.CancelledError: If the task was cancelled, even once the deck is being saved.
+    """
+    if slides_per_event < 1:
+        raise ValueError(f"Invalid slides per event: {slides_per_event}. Must be at least 1")
+    loop = asyncio.get_running_loop()
+    cancelled = threading.Event()
+
+    def report(stage, done, total):
+        # Runs in the conversion thread; the deck is complete once it is saved, so that step is not cancelled
+        if cancelled.is_set() and stage != SAVED_STAGE:
+            raise ConversionCancelled()
+        if progress is not None and (stage != RENDERED_STAGE or done % slides_per_event == 0 or done == total):
+            loop.call_soon_threadsafe(progress, ProgressEvent(stage, done, total))
+
+    async with (limit if limit is not None else nullcontext()):
+        future = loop.run_in_executor(executor, functools.partial(
+            Make_Biz_Plan.main, source_workbook, template_powerpoint, target_bizplan_powerpoint,
+            progress=report, **options))
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancelled.set()
+            try:
+                await future
+            except Exception:
+                pass  # The task was cancelled, so how the conversion ended is not reported
+            raise
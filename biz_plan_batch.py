@@ -0,0 +1,159 @@
+"""
+Batch conversions for Make_Biz_Plan.
+
+Runs every job of a manifest in a ConversionPool, so the imports and parsed
+templates of each worker process are shared by the jobs it runs. A failed job
+is reported and the batch carries on.
+
+A manifest lists the arguments of Make_Biz_Plan.main for each job, as a JSON
+list of objects, a YAML list of mappings (needs PyYAML) or a CSV file with one
+column per argument. Relative paths are relative to the manifest.
+
+Usage:
+    python biz_plan_batch.py jobs.csv --jobs 4
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+from biz_plan_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from biz_plan_pool import DEFAULT_JOBS, JOB_FIELD_TYPES, ConversionPool
+
+PATH_FIELDS = ('source_workbook', 'template_powerpoint', 'target_bizplan_powerpoint')
+TRUE_VALUES = ('1', 'true', 'yes', 'y')
+FALSE_VALUES = ('0', 'false', 'no', 'n', '')
+
+
+def _coerce(field, value):
+    """Convert a CSV cell to the type of its job field."""
+    field_type = JOB_FIELD_TYPES.get(field)
+    if field_type is bool:
+        if value.strip().lower() in TRUE_VALUES:
+            return True
+        if value.strip().lower() in FALSE_VALUES:
+            return False
+        raise ValueError(f"Invalid value for {field}: {value}. Must be true or false")
+    if field_type is int:
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"Invalid value for {field}: {value}. Must be a whole number")
+    return value
+
+
+def _read_jobs(manifest_path):
+    extension = os.path.splitext(manifest_path)[1].lower()
+    if extension == '.csv':
+        with open(manifest_path, newline='') as f:
+            # Empty cells keep the default of their argument
+            return [{field: _coerce(field, value) for field, value in row.items() if field and value not in ('', None)}
+                    for row in csv.DictReader(f)]
+    with open(manifest_path) as f:
+        if extension == '.json':
+            try:
+                return json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON manifest {manifest_path}: {e}")
+        if extension in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("YAML manifests need PyYAML: pip install pyyaml")
+            try:
+                return yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Invalid YAML manifest {manifest_path}: {e}")
+    raise ValueError(f"Unsupported manifest format: {manifest_path}. Must be .json, .yaml, .yml or .csv")
+
+
+def load_batch_manifest(manifest_path):
+    """
+    Load the jobs of a batch manifest.
+
+    Args:
+        manifest_path (str): Path to a .json, .yaml, .yml or .csv manifest.
+
+    Raises:
+        ValueError: If the manifest cannot be read or is not a list of jobs.
+
+    Returns:
+        list: The jobs, as dicts of keyword arguments for Make_Biz_Plan.main, with relative
+            paths resolved against the directory of the manifest.
+    """
+    jobs = _read_jobs(manifest_path)
+    if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+        raise ValueError(f"Invalid manifest {manifest_path}: must be a list of jobs")
+    base_dir = os.path.dirname(manifest_path)
+    for job in jobs:
+        for field in PATH_FIELDS:
+            if isinstance(job.get(field), str):
+                job[field] = os.path.join(base_dir, job[field])
+    return jobs
+
+
+def run_batch(jobs, pool_jobs=DEFAULT_JOBS, cache_dir=None, cache_max_bytes=DEFAULT_MAX_BYTES, report=None):
+    """
+    Run conversion jobs in a pool of worker processes.
+
+    Args:
+        jobs (list): The jobs, as returned by load_batch_manifest.
+        pool_jobs (int, optional): Number of jobs run at once. Defaults to DEFAULT_JOBS.
+        cache_dir (str, optional): Cache directory shared by the jobs, or None to run without a cache.
+            Defaults to None.
+        cache_max_bytes (int, optional): Size limit of the cache directory. Defaults to DEFAULT_MAX_BYTES.
+        report (callable, optional): Called with each result, in job order, as soon as it is known.
+            Defaults to None.
+
+    Returns:
+        list: One result per job, in job order: the result of run_job with 'job' (its 1-based
+            position) and 'status' 'ok', or 'job', 'status' 'failed' and 'error'.
+    """
+    results = []
+    with ConversionPool(min(pool_jobs, max(1, len(jobs))), cache_dir=cache_dir,
+                        cache_max_bytes=cache_max_bytes) as pool:
+        futures = [pool.submit(job) for job in jobs]
+        for number, (job, future) in enumerate(zip(jobs, futures), start=1):
+            try:
+                result = dict(future.result(), job=number, status='ok')
+            except Exception as e:
+                result = {'job': number, 'target': job.get('target_bizplan_powerpoint'), 'status': 'failed',
+                          'error': f"{type(e).__name__}: {e}"}
+            results.append(result)
+            if report is not None:
+                report(result)
+    return results
+
+
+def _print_result(result):
+    if result['status'] == 'ok':
+        print(f"Job {result['job']}: wrote {result['target']} in {result['timings']['total']:.2f}s")
+    else:
+        print(f"Job {result['job']}: failed: {result['error']}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the Make_Biz_Plan conversions listed in a manifest.')
+    parser.add_argument('manifest', type=str, help='Path to a .json, .yaml, .yml or .csv manifest of jobs.')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help='Number of conversions run at once.')
+    parser.add_argument('--report', type=str, default=None, help='Write the results of all jobs to this JSON file.')
+    parser.add_argument('--cache_dir', type=str, default=DEFAULT_CACHE_DIR, help='Directory caching parsed workbooks and rendered slides between jobs.')
+    parser.add_argument('--cache_size_mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), help='Size limit of the cache directory in MB.')
+    parser.add_argument('--no_cache', '--no-cache', action='store_true', help='Run jobs without reading or writing the cache.')
+    args = parser.parse_args()
+
+    jobs = load_batch_manifest(args.manifest)
+    results = run_batch(jobs, args.jobs, None if args.no_cache else args.cache_dir, args.cache_size_mb * 1024 * 1024,
+                        report=_print_result)
+    failed = sum(result['status'] == 'failed' for result in results)
+    print(f"{len(results) - failed} of {len(results)} jobs succeeded")
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(results, f, indent=2)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
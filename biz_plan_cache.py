@@ -0,0 +1,152 @@
+"""
+On-disk cache for Make_Biz_Plan.
+
+Values are pickled to one file per key in a cache directory. When the files
+take more than the size limit, the least recently used ones are deleted.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                                 'make_biz_plan')
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+ENTRY_SUFFIX = '.pickle'
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """
+    Return the SHA-256 hex digest of a file's contents.
+
+    Args:
+        path (str): Path to the file.
+        chunk_size (int, optional): Bytes read at a time. Defaults to 1 MiB.
+
+    Returns:
+        str: The hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    Pickled values stored in a directory with least-recently-used eviction.
+
+    Args:
+        directory (str, optional): The cache directory, created when needed. Defaults to DEFAULT_CACHE_DIR.
+        max_bytes (int, optional): Size limit for all entries together. Defaults to DEFAULT_MAX_BYTES.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        if max_bytes < 0:
+            raise ValueError(f"Invalid cache size: {max_bytes}. Must not be negative")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, name + ENTRY_SUFFIX)
+
+    def get(self, key, default=None):
+        """
+        Return the value stored for a key, marking it as recently used.
+        Unreadable entries are deleted and count as misses.
+
+        Args:
+            key (str): The cache key.
+            default (optional): Returned when the key is not cached. Defaults to None.
+
+        Returns:
+            The cached value, or default.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            self._remove(path)
+            self.misses += 1
+            return default
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def set(self, key, value, evict=True):
+        """
+        Store a value for a key, then evict the least recently used entries over the size limit.
+
+        Args:
+            key (str): The cache key.
+            value: A picklable value.
+            evict (bool, optional): Whether to evict now. Callers storing many entries in a row
+                can pass False and call evict once at the end. Defaults to True.
+
+        Returns:
+            int: The size of the stored entry in bytes.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            os.replace(temp_path, path)
+        except BaseException:
+            self._remove(temp_path)
+            raise
+        if evict:
+            self.evict()
+        return size
+
+    def evict(self):
+        """Delete the least recently used entries until the cache fits its size limit."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        """Delete every entry."""
+        saved, self.max_bytes = self.max_bytes, 0
+        try:
+            self.evict()
+        finally:
+            self.max_bytes = saved
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
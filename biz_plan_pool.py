@@ -0,0 +1,213 @@
+"""
+Pool of warm worker processes running Make_Biz_Plan conversions.
+
+Each worker imports python-pptx and openpyxl once and keeps every template it
+has parsed, so a job only pays for reading its workbook and rendering its
+slides. Used by the conversion server and by batch runs.
+"""
+
+import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+from biz_plan_cache import DEFAULT_MAX_BYTES
+
+DEFAULT_JOBS = 2
+# Seconds warm_up waits for every worker to start before giving up
+WARM_UP_TIMEOUT = 120
+
+# Fields a job may set and their types; they are passed to Make_Biz_Plan.main as keyword arguments
+JOB_FIELD_TYPES = {
+    'source_workbook': str,
+    'template_powerpoint': str,
+    'target_bizplan_powerpoint': str,
+    'theme_slide_master': int,
+    'theme_slide_master_layout': int,
+    'okr_slide_master': int,
+    'okr_slide_master_layout': int,
+    'reader': str,
+    'render_engine': str,
+    'stream': bool,
+    'incremental': bool,
+    'split_themes': bool,
+    'cache_slides': bool,
+}
+JOB_FIELDS = tuple(JOB_FIELD_TYPES)
+
+# Parsed templates of this worker process by path, with the (mtime, size) they were parsed at
+_templates = {}
+_cache_settings = {}
+# Barrier that every worker of the pool waits on in warm_up
+_warm_up_barrier = None
+
+
+def _load_template(path):
+    """Return a copy of the parsed template at path, parsing it only the first time or after it changed."""
+    import copy
+    from pptx import Presentation
+
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _templates.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = _templates[path] = (stamp, Presentation(path))
+    return copy.deepcopy(cached[1])
+
+
+def _init_worker(templates, cache_dir, cache_max_bytes, warm_up_barrier):
+    """Import the conversion code and parse the templates in a new worker process."""
+    import Make_Biz_Plan
+
+    global _warm_up_barrier
+    _warm_up_barrier = warm_up_barrier
+    Make_Biz_Plan.import_dependencies()
+    _cache_settings.update(cache_dir=cache_dir, cache_max_bytes=cache_max_bytes)
+    for path in templates:
+        try:
+            _load_template(path)
+        except Exception:
+            pass  # Reported by the first job that uses the template, instead of breaking the pool
+
+
+def _wait_for_workers(timeout):
+    """Block until every worker of the pool runs this, so none can take two of the calls."""
+    _warm_up_barrier.wait(timeout)
+
+
+def run_job(job, submitted=None):
+    """
+    Run one conversion in a worker process.
+
+    Args:
+        job (dict): Keyword arguments for Make_Biz_Plan.main, from JOB_FIELDS.
+        submitted (float, optional): time.time() when the job was submitted, to report the time
+            it waited for a worker. Defaults to None.
+
+    Raises:
+        ValueError: If the job has unknown fields, or the conversion rejects its input.
+
+    Returns:
+        dict: The target path, what the conversion printed, what Make_Biz_Plan.main returned
+            under 'summary', and the timings in seconds.
+    """
+    import Make_Biz_Plan
+
+    started = time.time()
+    unknown = sorted(set(job) - set(JOB_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown job fields: {', '.join(unknown)}. Must be among {JOB_FIELDS}")
+    options = dict(job)
+    options.setdefault('template_powerpoint', Make_Biz_Plan.TEMPLATE_POWERPOINT)
+    options.setdefault('target_bizplan_powerpoint', Make_Biz_Plan.TARGET_BIZPLAN_POWERPOINT)
+
+    timings = {}
+    if submitted is not None:
+        timings['queued'] = started - submitted
+    start = time.perf_counter()
+    prs = _load_template(options['template_powerpoint'])
+    timings['template'] = time.perf_counter() - start
+
+    output = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(output):
+        summary = Make_Biz_Plan.main(prs=prs, **_cache_settings, **options)
+    timings['convert'] = time.perf_counter() - start
+    timings['total'] = time.time() - (submitted if submitted is not None else started)
+    return {
+        'target': options['target_bizplan_powerpoint'],
+        'output': output.getvalue(),
+        'summary': summary,
+        'timings': {stage: round(seconds, 4) for stage, seconds in timings.items()},
+    }
+
+
+class ConversionPool:
+    """
+    A pool of warm worker processes running conversion jobs.
+
+    Args:
+        jobs (int, optional): Number of jobs run at once. Defaults to DEFAULT_JOBS.
+        templates (list, optional): Template paths each worker parses up front. Templates not
+            listed are parsed by a worker the first time a job uses them. Defaults to None.
+        cache_dir (str, optional): Cache directory for parsed workbooks and rendered slides,
+            or None to run without a cache. Defaults to None.
+        cache_max_bytes (int, optional): Size limit of the cache directory. Defaults to DEFAULT_MAX_BYTES.
+
+    Raises:
+        ValueError: If jobs is less than 1.
+    """
+
+    def __init__(self, jobs=DEFAULT_JOBS, templates=None, cache_dir=None, cache_max_bytes=DEFAULT_MAX_BYTES):
+        if jobs < 1:
+            raise ValueError(f"Invalid number of jobs: {jobs}. Must be at least 1")
+        self.jobs = jobs
+        context = multiprocessing.get_context()
+        self._executor = ProcessPoolExecutor(max_workers=jobs, mp_context=context, initializer=_init_worker,
+                                             initargs=(list(templates or []), cache_dir, cache_max_bytes,
+                                                       context.Barrier(jobs)))
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def warm_up(self):
+        """
+        Start every worker process now rather than on the first jobs, and wait until each has
+        imported the libraries and parsed the templates.
+
+        Raises:
+            threading.BrokenBarrierError: If the workers did not all start within WARM_UP_TIMEOUT seconds.
+        """
+        for future in [self._executor.submit(_wait_for_workers, WARM_UP_TIMEOUT) for _ in range(self.jobs)]:
+            future.result()
+
+    def _count(self, future):
+        with self._lock:
+            if future.exception() is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def submit(self, job):
+        """
+        Queue a conversion job.
+
+        Args:
+            job (dict): The job, as accepted by run_job.
+
+        Returns:
+            concurrent.futures.Future: The future result of run_job.
+        """
+        future = self._executor.submit(run_job, job, time.time())
+        future.add_done_callback(self._count)
+        return future
+
+    def convert(self, job):
+        """
+        Run a conversion job and wait for it to finish.
+
+        Args:
+            job (dict): The job, as accepted by run_job.
+
+        Returns:
+            dict: The result of run_job.
+        """
+        return self.submit(job).result()
+
+    def status(self):
+        """Return the number of job slots and of completed and failed jobs."""
+        with self._lock:
+            return {'jobs': self.jobs, 'completed': self.completed, 'failed': self.failed}
+
+    def shutdown(self):
+        self._executor.shutdown()
@@ -0,0 +1,191 @@
+"""
+Profiling for Make_Biz_Plan conversions.
+
+ConversionProfiler subscribes to the ConversionHooks of a conversion and
+records the wall and CPU time and peak traced memory of each phase, the
+render time and shape count of each slide by slide type, and the counts of
+hot-path operations. Its report is JSON, and it can also run the conversion
+under cProfile.
+
+Usage:
+    profiler = ConversionProfiler(cprofile=True)
+    with profiler:
+        Make_Biz_Plan.main('VivaGoals.xlsx', hooks=profiler.hooks)
+    profiler.write_report('profile.json')
+    profiler.dump_stats('profile.prof')
+"""
+
+import json
+import time
+import tracemalloc
+
+from Make_Biz_Plan import (OPERATIONS, PHASE_FINISHED_EVENT, PHASE_STARTED_EVENT, SLIDE_RENDERED_EVENT, THEME_TAG,
+                           ConversionHooks, count_operations)
+
+REPORT_VERSION = 1
+# Upper bounds in milliseconds of the buckets of the slide render time histograms
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+def slide_type(goal):
+    """Return the slide type of a goal: THEME_TAG for Theme slides, and otherwise its object type."""
+    return THEME_TAG if goal.tag == THEME_TAG else goal.object_type
+
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def _histogram(seconds):
+    """Count render times into the buckets of HISTOGRAM_BOUNDS_MS, plus one for longer times."""
+    labels = [f'<={bound}ms' for bound in HISTOGRAM_BOUNDS_MS] + [f'>{HISTOGRAM_BOUNDS_MS[-1]}ms']
+    counts = dict.fromkeys(labels, 0)
+    for value in seconds:
+        milliseconds = value * 1000
+        for bound, label in zip(HISTOGRAM_BOUNDS_MS, labels):
+            if milliseconds <= bound:
+                counts[label] += 1
+                break
+        else:
+            counts[labels[-1]] += 1
+    return counts
+
+
+class ConversionProfiler:
+    """
+    Record where the time and memory of a conversion go.
+
+    Pass hooks to Make_Biz_Plan.main, and start the profiler before the conversion and stop it
+    after, or use it as a context manager. Slides rendered by worker processes have no render
+    times, and their CPU time is not counted.
+
+    Args:
+        hooks (ConversionHooks, optional): Hooks to subscribe to. Defaults to None, which makes new ones.
+        trace_memory (bool, optional): Whether to trace memory with tracemalloc, which slows Python
+            down, so the phase and slide times are those of a traced run. Defaults to True.
+        cprofile (bool, optional): Whether to run cProfile while started, for dump_stats. Defaults to False.
+    """
+
+    def __init__(self, hooks=None, trace_memory=True, cprofile=False):
+        self.hooks = hooks if hooks is not None else ConversionHooks()
+        self.trace_memory = trace_memory
+        self.phases = {}
+        self.slide_seconds = {}
+        self.slide_shapes = {}
+        self.peak_memory = 0
+        self.operations = None
+        self._counting = None
+        self.wall_seconds = None
+        self.cpu_seconds = None
+        self._profile = None
+        if cprofile:
+            import cProfile
+
+            self._profile = cProfile.Profile()
+        self._started_tracing = False
+        self.hooks.subscribe(PHASE_STARTED_EVENT, self._phase_started)
+        self.hooks.subscribe(PHASE_FINISHED_EVENT, self._phase_finished)
+        self.hooks.subscribe(SLIDE_RENDERED_EVENT, self._slide_rendered)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        """Start counting operations, tracing memory and, if enabled, cProfile."""
+        self._counting = count_operations()
+        self.operations = self._counting.__enter__()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._wall_start, self._cpu_start = time.perf_counter(), time.process_time()
+        if self._profile is not None:
+            self._profile.enable()
+
+    def stop(self):
+        """Stop what start started and record the total times."""
+        if self._profile is not None:
+            self._profile.disable()
+        self.wall_seconds = time.perf_counter() - self._wall_start
+        self.cpu_seconds = time.process_time() - self._cpu_start
+        if tracemalloc.is_tracing():
+            self.peak_memory = max(self.peak_memory, tracemalloc.get_traced_memory()[1])
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        self._counting.__exit__(None, None, None)
+
+    def _phase_started(self, phase):
+        if tracemalloc.is_tracing():
+            self.peak_memory = max(self.peak_memory, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+    def _phase_finished(self, phase, wall_seconds, cpu_seconds):
+        record = {'wall_seconds': round(wall_seconds, 6), 'cpu_seconds': round(cpu_seconds, 6)}
+        if tracemalloc.is_tracing():
+            record['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+            self.peak_memory = max(self.peak_memory, record['peak_memory_bytes'])
+        self.phases[phase] = record
+
+    def _slide_rendered(self, goal, slide, seconds):
+        kind = slide_type(goal)
+        self.slide_seconds.setdefault(kind, []).append(seconds)
+        self.slide_shapes[kind] = self.slide_shapes.get(kind, 0) + len(slide.shapes)
+
+    def report(self):
+        """
+        Return the profile of the conversion.
+
+        Returns:
+            dict: The total and per-phase times and peak traced memory, the count, shape count and
+                render time statistics and histogram of the slides of each slide type, and the
+                count of each of Make_Biz_Plan.OPERATIONS.
+        """
+        by_type = {}
+        for kind, seconds in self.slide_seconds.items():
+            ordered = sorted(seconds)
+            by_type[kind] = {
+                'count': len(ordered),
+                'shapes': self.slide_shapes[kind],
+                'total_seconds': round(sum(ordered), 6),
+                'mean_ms': round(sum(ordered) * 1000 / len(ordered), 3),
+                'p50_ms': round(_percentile(ordered, 0.5) * 1000, 3),
+                'p90_ms': round(_percentile(ordered, 0.9) * 1000, 3),
+                'max_ms': round(ordered[-1] * 1000, 3),
+                'histogram': _histogram(ordered),
+            }
+        report = {
+            'version': REPORT_VERSION,
+            'wall_seconds': None if self.wall_seconds is None else round(self.wall_seconds, 6),
+            'cpu_seconds': None if self.cpu_seconds is None else round(self.cpu_seconds, 6),
+            'phases': self.phases,
+            'slides': {
+                'count': sum(kind['count'] for kind in by_type.values()),
+                'shapes': sum(kind['shapes'] for kind in by_type.values()),
+                'by_type': by_type,
+            },
+            'operations': {operation: (self.operations or {}).get(operation, 0) for operation in OPERATIONS},
+        }
+        if self.trace_memory:
+            report['peak_memory_bytes'] = self.peak_memory
+        return report
+
+    def write_report(self, path):
+        """Write the report to a JSON file."""
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+            f.write('\n')
+
+    def dump_stats(self, path):
+        """
+        Write the cProfile stats to a file that pstats can load.
+
+        Raises:
+            ValueError: If the profiler was made without cprofile.
+        """
+        if self._profile is None:
+            raise ValueError("The profiler was made without cprofile, so it has no stats to dump")
+        self._profile.dump_stats(path)
@@ -0,0 +1,208 @@
+"""
+Long-running conversion server for Make_Biz_Plan.
+
+Conversions run in a ConversionPool of warm worker processes. Jobs are posted
+as JSON over HTTP, on a Unix socket only the server's user can open or on a
+localhost port, and several run at once. Requests must carry the server's token
+when it has one, which it must on a port, and targets can be restricted to an
+output directory.
+
+Usage:
+    BIZ_PLAN_SERVER_TOKEN=secret python biz_plan_server.py --port 8765 --template template.pptx
+    curl -X POST localhost:8765/convert -H 'Content-Type: application/json' -H 'X-Biz-Plan-Token: secret' \
+        -d '{"source_workbook": "VivaGoals.xlsx", "target_bizplan_powerpoint": "bizplan.pptx"}'
+"""
+
+import argparse
+import hmac
+import json
+import os
+import socketserver
+import stat
+import tempfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from biz_plan_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from biz_plan_pool import DEFAULT_JOBS, ConversionPool
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_SOCKET = os.path.join(os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir(),
+                              f'biz_plan_server-{os.getuid() if hasattr(os, "getuid") else "user"}.sock')
+TOKEN_HEADER = 'X-Biz-Plan-Token'
+TOKEN_ENVIRONMENT_VARIABLE = 'BIZ_PLAN_SERVER_TOKEN'
+JSON_CONTENT_TYPE = 'application/json'
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler for a ConversionPool.
+
+    POST /convert runs the JSON job in the request body and answers with the result of run_job.
+    GET /status answers with ConversionPool.status. Invalid jobs get a 400 answer, failed
+    conversions a 500 answer, both with an "error" message.
+
+    When the server has a token, every request must send it in TOKEN_HEADER or gets a 401
+    answer. Jobs must be sent as application/json, which a browser page cannot post to
+    another origin without asking first, or get a 415 answer. When the server has an output
+    directory, jobs whose target is outside it get a 403 answer.
+    """
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def _reply(self, code, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self):
+        token = self.server.token
+        if token is not None and not hmac.compare_digest(self.headers.get(TOKEN_HEADER, '').encode('utf-8'),
+                                                         token.encode('utf-8')):
+            self._reply(401, {'error': f"Missing or wrong {TOKEN_HEADER} header"})
+            return False
+        return True
+
+    def _allowed_target(self, job):
+        output_dir = self.server.output_dir
+        if output_dir is None:
+            return True
+        target = os.path.realpath(str(job.get('target_bizplan_powerpoint', 'bizplan.pptx')))
+        if os.path.commonpath([output_dir, target]) != output_dir:
+            self._reply(403, {'error': f"Target must be in the output directory {output_dir}"})
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path != '/status':
+            self._reply(404, {'error': f"Not found: {self.path}"})
+            return
+        self._reply(200, self.server.conversion_pool.status())
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if self.path != '/convert':
+            self._reply(404, {'error': f"Not found: {self.path}"})
+            return
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type != JSON_CONTENT_TYPE:
+            self._reply(415, {'error': f"Jobs must be sent as {JSON_CONTENT_TYPE}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            job = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(job, dict):
+                raise ValueError("A job must be a JSON object")
+        except ValueError as e:
+            self._reply(400, {'error': f"Invalid job: {e}"})
+            return
+        if not self._allowed_target(job):
+            return
+        try:
+            result = self.server.conversion_pool.convert(job)
+        except (ValueError, FileNotFoundError) as e:
+            self._reply(400, {'error': str(e)})
+        except Exception as e:
+            self._reply(500, {'error': f"{type(e).__name__}: {e}"})
+        else:
+            self._reply(200, result)
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server on a Unix socket, handling each request in its own thread."""
+    daemon_threads = True
+
+
+def make_http_server(conversion_pool, host=DEFAULT_HOST, port=None, socket_path=DEFAULT_SOCKET, token=None,
+                     output_dir=None):
+    """
+    Create the HTTP server for a ConversionPool, on host and port if port is given, else on a
+    Unix socket that only this user can open.
+
+    Args:
+        conversion_pool (ConversionPool): Runs the jobs.
+        host (str, optional): Address to listen on with a port. Defaults to DEFAULT_HOST.
+        port (int, optional): Port to listen on; 0 picks a free port. Defaults to None.
+        socket_path (str, optional): Path of the Unix socket. Defaults to DEFAULT_SOCKET.
+        token (str, optional): Token every request must send in TOKEN_HEADER. Required with a
+            port, since any local process can connect to one. Defaults to None.
+        output_dir (str, optional): Directory that job targets must be in. Defaults to None,
+            which allows any target the server's user can write.
+
+    Raises:
+        ValueError: If a port is given without a token, the token is empty, or socket_path is
+            taken by something other than a socket.
+
+    Returns:
+        socketserver.BaseServer: The server; call serve_forever to handle requests.
+    """
+    if token is not None and not token:
+        raise ValueError("Invalid server token: must not be empty")
+    if port is not None:
+        if token is None:
+            raise ValueError("A server listening on a port needs a token")
+        httpd = ThreadingHTTPServer((host, port), ConversionRequestHandler)
+    else:
+        if os.path.exists(socket_path):
+            if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                raise ValueError(f"Not a socket, so it is not replaced: {socket_path}")
+            os.remove(socket_path)
+        # Created with no permissions for others, so no other user can connect in between
+        umask = os.umask(0o177)
+        try:
+            httpd = ThreadingUnixHTTPServer(socket_path, ConversionRequestHandler)
+        finally:
+            os.umask(umask)
+    httpd.conversion_pool = conversion_pool
+    httpd.token = token
+    httpd.output_dir = os.path.realpath(output_dir) if output_dir is not None else None
+    return httpd
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve Make_Biz_Plan conversions from warm worker processes.')
+    parser.add_argument('--host', type=str, default=DEFAULT_HOST, help='Address to listen on with --port.')
+    parser.add_argument('--port', type=int, default=None, help=f'Listen on this port instead of a Unix socket; needs a token in ${TOKEN_ENVIRONMENT_VARIABLE} or --token_file.')
+    parser.add_argument('--socket', type=str, default=DEFAULT_SOCKET, help='Path of the Unix socket to listen on.')
+    parser.add_argument('--token_file', '--token-file', type=str, default=None, help=f'File holding the token requests must send in the {TOKEN_HEADER} header.')
+    parser.add_argument('--output_dir', '--output-dir', type=str, default=None, help='Only accept jobs whose target is in this directory.')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS, help='Number of conversions run at once.')
+    parser.add_argument('--template', action='append', default=[], help='Template to parse up front; may be repeated.')
+    parser.add_argument('--cache_dir', type=str, default=DEFAULT_CACHE_DIR, help='Directory caching parsed workbooks, and rendered slides for jobs with cache_slides, between jobs.')
+    parser.add_argument('--cache_size_mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), help='Size limit of the cache directory in MB.')
+    parser.add_argument('--no_cache', '--no-cache', action='store_true', help='Run jobs without reading or writing the cache.')
+    args = parser.parse_args()
+    token = os.environ.get(TOKEN_ENVIRONMENT_VARIABLE) or None
+    if args.token_file is not None:
+        with open(args.token_file) as f:
+            token = f.read().strip()
+        if not token:
+            parser.error(f"The token file is empty: {args.token_file}")
+    if args.port is not None and not token:
+        parser.error(f"--port needs a token in ${TOKEN_ENVIRONMENT_VARIABLE} or --token_file")
+
+    conversion_pool = ConversionPool(args.jobs, args.template, None if args.no_cache else args.cache_dir,
+                                     args.cache_size_mb * 1024 * 1024)
+    conversion_pool.warm_up()
+    httpd = make_http_server(conversion_pool, args.host, args.port, args.socket, token, args.output_dir)
+    print(f"Serving conversions on {f'http://{args.host}:{httpd.server_address[1]}' if args.port is not None else args.socket}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        conversion_pool.shutdown()
+        if args.port is None and os.path.exists(args.socket):
+            os.remove(args.socket)
+
+
+if __name__ == '__main__':
+    main()
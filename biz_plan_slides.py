@@ -0,0 +1,360 @@
+"""
+Slide plans for Make_Biz_Plan.
+
+A slide plan is the deck a conversion makes, as plain data: one SlideSpec per
+slide, in slide order, with its layout, title, text blocks, icon, hyperlink and
+decorations. build_slide_plan makes a plan from ordered goals without python-pptx,
+and SpecRenderer turns specs back into slides, the same slides as the shapes
+engine makes from the goals. A plan can be computed once, saved as JSON Lines,
+inspected or diffed, and rendered in chunks by other processes or machines.
+
+Usage:
+    python biz_plan_slides.py plan --source_workbook VivaGoals.xlsx --output plan.jsonl
+    python biz_plan_slides.py render plan.jsonl --target_bizplan_powerpoint part1.pptx --start 0 --stop 5000
+"""
+
+import argparse
+import itertools
+import json
+from operator import attrgetter
+
+from Make_Biz_Plan import (GOAL_DETAILS_BLOCK, OBJECTIVE_TYPE, OKR_SLIDE_MASTER, OKR_SLIDE_MASTER_LAYOUT,
+                           OPENPYXL_READER, TEMPLATE_POWERPOINT, THEME_SLIDE_MASTER, THEME_SLIDE_MASTER_LAYOUT,
+                           THEME_TAG, WORKBOOK_READERS, ImagePartCache, add_alignment_to_slide, add_description_to_slide,
+                           add_details_to_slide, add_image_to_slide, add_title_bar, alignment_paragraphs, create_slide,
+                           get_goal_image_path, load_conversion_context)
+
+PLAN_VERSION = 1
+PLAN_FILE = 'plan.jsonl'
+
+TITLE_BAR_DECORATION = 'title_bar'
+DECORATIONS = (TITLE_BAR_DECORATION,)
+
+_detail_values = attrgetter(*GOAL_DETAILS_BLOCK.fields)
+
+
+class SlideSpec:
+    """
+    Everything a slide shows, as plain data that can be pickled or written as JSON.
+
+    Theme slides only have a layout and a title; goal slides also have a details text block,
+    alignment lines, a description and an icon linking to the goal.
+
+    Args:
+        goal_id (str): Id of the goal the slide is for.
+        slide_type (str): THEME_TAG, or the object type of the goal.
+        layout (tuple): Slide master index and layout index of the slide.
+        title (str): The title of the slide.
+        details (dict, optional): The text for each field of GOAL_DETAILS_BLOCK, or None for a slide
+            without goal details. Defaults to None.
+        alignment (tuple, optional): Alignment lines under the details, as returned by
+            Make_Biz_Plan.alignment_paragraphs. Defaults to ().
+        description (str, optional): The goal description. Defaults to "".
+        icon (str, optional): Path to the icon image, or None for no icon. Defaults to None.
+        hyperlink (str, optional): Address the icon links to. Defaults to "".
+        decorations (tuple, optional): Names from DECORATIONS of shapes added to the slide. Defaults to ().
+    """
+    __slots__ = ('goal_id', 'slide_type', 'layout', 'title', 'details', 'alignment', 'description', 'icon',
+                 'hyperlink', 'decorations')
+
+    def __init__(self, goal_id, slide_type, layout, title, details=None, alignment=(), description="", icon=None,
+                 hyperlink="", decorations=()):
+        self.goal_id = goal_id
+        self.slide_type = slide_type
+        self.layout = layout
+        self.title = title
+        self.details = details
+        self.alignment = alignment
+        self.description = description
+        self.icon = icon
+        self.hyperlink = hyperlink
+        self.decorations = decorations
+
+    def __eq__(self, other):
+        if not isinstance(other, SlideSpec):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"SlideSpec({self.goal_id!r}, {self.slide_type!r}, {self.title!r})"
+
+    def to_dict(self):
+        """Return the spec as a dict of JSON types."""
+        return {
+            'goal_id': self.goal_id, 'slide_type': self.slide_type, 'layout': list(self.layout), 'title': self.title,
+            'details': self.details,
+            'alignment': [None if line is None else [line[0], line[1], list(line[2]) if line[2] else None]
+                          for line in self.alignment],
+            'description': self.description, 'icon': self.icon, 'hyperlink': self.hyperlink,
+            'decorations': list(self.decorations),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Make a spec from a dict, as returned by to_dict.
+
+        Raises:
+            ValueError: If the dict has unknown or missing fields, or a malformed layout,
+                alignment line or decoration.
+        """
+        if not isinstance(data, dict):
+            raise ValueError("A slide spec must be an object")
+        unknown = sorted(set(data) - set(cls.__slots__))
+        if unknown:
+            raise ValueError(f"Unknown slide spec fields: {', '.join(unknown)}")
+        for field in ('goal_id', 'slide_type', 'layout', 'title'):
+            if field not in data:
+                raise ValueError(f"Slide spec has no {field}")
+        layout = data['layout']
+        if not isinstance(layout, (list, tuple)) or len(layout) != 2 or not all(isinstance(i, int) for i in layout):
+            raise ValueError(f"Invalid slide spec layout: {layout}. Must be [slide master, layout]")
+        alignment = []
+        for line in data.get('alignment') or []:
+            if line is not None and (not isinstance(line, (list, tuple)) or len(line) != 3):
+                raise ValueError(f"Invalid slide spec alignment line: {line}. Must be [label, text, color] or null")
+            alignment.append(None if line is None else (line[0], line[1], tuple(line[2]) if line[2] else None))
+        decorations = tuple(data.get('decorations') or ())
+        unknown = sorted(set(decorations) - set(DECORATIONS))
+        if unknown:
+            raise ValueError(f"Unknown slide decorations: {', '.join(unknown)}. Must be among {DECORATIONS}")
+        return cls(data['goal_id'], data['slide_type'], tuple(layout), data['title'], data.get('details'), tuple(alignment),
+                   data.get('description', ""), data.get('icon'), data.get('hyperlink', ""), decorations)
+
+
+def goal_slide_spec(goal, theme_layout, okr_layout, alignment_cache=None):
+    """
+    Return the spec of the slide for a goal.
+
+    Args:
+        goal (VivaGoal): The goal object.
+        theme_layout (tuple): Slide master index and layout index for Theme slides.
+        okr_layout (tuple): Slide master index and layout index for Objective, Outcome and Action slides.
+        alignment_cache (dict, optional): Alignment lines by object type and alignment, shared by
+            the specs of a plan because sibling goals have the same alignment. Defaults to None.
+
+    Returns:
+        SlideSpec: The spec of the slide render_goal_slide makes for the goal.
+    """
+    if goal.tag == THEME_TAG:
+        return SlideSpec(goal.goal_id, THEME_TAG, theme_layout, goal.title)
+    is_objective = goal.object_type == OBJECTIVE_TYPE
+    if alignment_cache is None:
+        alignment = tuple(alignment_paragraphs(goal))
+    else:
+        alignment = alignment_cache.get((is_objective, goal.alignment))
+        if alignment is None:
+            alignment = alignment_cache[is_objective, goal.alignment] = tuple(alignment_paragraphs(goal))
+    return SlideSpec(goal.goal_id, goal.object_type, okr_layout, goal.title,
+                     dict(zip(GOAL_DETAILS_BLOCK.fields, _detail_values(goal))), alignment, goal.description,
+                     get_goal_image_path(goal), goal.okr_link, (TITLE_BAR_DECORATION,) if is_objective else ())
+
+
+def build_slide_plan(goals, theme_layout=(THEME_SLIDE_MASTER, THEME_SLIDE_MASTER_LAYOUT),
+                     okr_layout=(OKR_SLIDE_MASTER, OKR_SLIDE_MASTER_LAYOUT)):
+    """
+    Return the slide plan of goals.
+
+    Args:
+        goals (list): The goal objects, in slide order.
+        theme_layout (tuple, optional): Slide master index and layout index for Theme slides.
+            Defaults to the Make_Biz_Plan defaults.
+        okr_layout (tuple, optional): Slide master index and layout index for Objective, Outcome and
+            Action slides. Defaults to the Make_Biz_Plan defaults.
+
+    Returns:
+        list: A SlideSpec per goal, in slide order.
+    """
+    theme_layout, okr_layout = tuple(theme_layout), tuple(okr_layout)
+    alignment_cache = {}
+    return [goal_slide_spec(goal, theme_layout, okr_layout, alignment_cache) for goal in goals]
+
+
+def plan_workbook(workbook_path, theme_layout=(THEME_SLIDE_MASTER, THEME_SLIDE_MASTER_LAYOUT),
+                  okr_layout=(OKR_SLIDE_MASTER, OKR_SLIDE_MASTER_LAYOUT), reader=OPENPYXL_READER, cache=None):
+    """
+    Load, order and plan the goals of a workbook.
+
+    Args:
+        workbook_path (str): Path to the Excel workbook.
+        theme_layout (tuple, optional): Slide master index and layout index for Theme slides.
+        okr_layout (tuple, optional): Slide master index and layout index for goal slides.
+        reader (str, optional): OPENPYXL_READER or NATIVE_READER. Defaults to OPENPYXL_READER.
+        cache (DiskCache, optional): Cache of parsed and ordered goals. Defaults to None.
+
+    Raises:
+        ValueError: If the workbook cannot be loaded or its goals cannot be ordered.
+
+    Returns:
+        list: The slide plan.
+    """
+    context = load_conversion_context(workbook_path, reader, cache)
+    return build_slide_plan(context.ordered_goals, theme_layout, okr_layout)
+
+
+def write_slide_plan(path, specs):
+    """
+    Write a slide plan as JSON Lines: a header line with the plan version and slide count, then one line per slide.
+
+    Args:
+        path (str): Where to write the plan.
+        specs (list): The slide specs, in slide order.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'version': PLAN_VERSION, 'slides': len(specs)}) + '\n')
+        for spec in specs:
+            f.write(json.dumps(spec.to_dict(), ensure_ascii=False) + '\n')
+
+
+def read_slide_plan(path, start=0, stop=None):
+    """
+    Read slides of a plan written by write_slide_plan, without parsing the lines outside the chunk.
+
+    Args:
+        path (str): Path to the plan.
+        start (int, optional): Index of the first slide to read. Defaults to 0.
+        stop (int, optional): Index after the last slide to read, or None to read to the end.
+            Defaults to None.
+
+    Raises:
+        ValueError: If the plan has another version, or a line is not a valid slide spec.
+
+    Returns:
+        list: The slide specs from start to stop.
+    """
+    with open(path, encoding='utf-8') as f:
+        try:
+            header = json.loads(f.readline())
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid slide plan {path}: {e}")
+        if not isinstance(header, dict) or header.get('version') != PLAN_VERSION:
+            raise ValueError(f"Unsupported slide plan {path}: version must be {PLAN_VERSION}")
+        specs = []
+        for number, line in enumerate(itertools.islice(f, start, stop), start=start + 2):
+            try:
+                specs.append(SlideSpec.from_dict(json.loads(line)))
+            except (json.JSONDecodeError, ValueError) as e:
+                raise ValueError(f"Invalid slide spec on line {number} of {path}: {e}")
+        return specs
+
+
+class SpecRenderer:
+    """
+    Render slide specs as slides, building every shape with python-pptx.
+
+    Args:
+        prs (Presentation): The PowerPoint presentation object.
+    """
+
+    def __init__(self, prs):
+        self.prs = prs
+        self.image_cache = ImagePartCache()
+
+    def render(self, spec):
+        """Add the slide of a spec to the presentation and return it."""
+        slide = create_slide(self.prs, spec.layout, spec.title)
+        if spec.details is None:
+            return slide
+        add_details_to_slide(slide, spec.details)
+        add_alignment_to_slide(slide, spec.alignment)
+        if TITLE_BAR_DECORATION in spec.decorations:
+            add_title_bar(slide)
+        if spec.icon:
+            add_image_to_slide(slide, spec.icon, spec.hyperlink, self.image_cache)
+        add_description_to_slide(slide, spec.description)
+        return slide
+
+
+def render_slide_plan(prs, specs, writer=None, on_slide=None):
+    """
+    Add the slides of a plan to the presentation, in order.
+
+    Args:
+        prs (Presentation): The PowerPoint presentation object.
+        specs (list): The slide specs.
+        writer (StreamingPresentationWriter, optional): Writer to stream each slide to. Defaults to None.
+        on_slide (callable, optional): Called with the number of slides added so far, after each
+            slide. Defaults to None.
+    """
+    renderer = SpecRenderer(prs)
+    for done, spec in enumerate(specs, start=1):
+        slide = renderer.render(spec)
+        if writer is not None:
+            writer.add_slide(slide)
+        if on_slide is not None:
+            on_slide(done)
+
+
+def render_plan_file(plan_path, template_powerpoint, target_path, start=0, stop=None, stream=False):
+    """
+    Render a chunk of a plan file into a new deck made from the template.
+
+    Args:
+        plan_path (str): Path to the plan.
+        template_powerpoint (str): Path to the template PowerPoint file.
+        target_path (str): Where to save the deck.
+        start (int, optional): Index of the first slide to render. Defaults to 0.
+        stop (int, optional): Index after the last slide to render, or None for the end. Defaults to None.
+        stream (bool, optional): Whether to write each slide as soon as it is rendered. Defaults to False.
+
+    Raises:
+        ValueError: If the plan is invalid or a slide cannot be rendered.
+
+    Returns:
+        int: The number of slides rendered.
+    """
+    from pptx import Presentation
+
+    specs = read_slide_plan(plan_path, start, stop)
+    prs = Presentation(template_powerpoint)
+    writer = None
+    if stream:
+        from pptx_writer import StreamingPresentationWriter
+
+        writer = StreamingPresentationWriter(prs, target_path)
+    try:
+        render_slide_plan(prs, specs, writer)
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    if writer is not None:
+        writer.close()
+    else:
+        prs.save(target_path)
+    return len(specs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Plan the slides of a Viva Goals export, or render a planned chunk of slides.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    plan = commands.add_parser('plan', help='Write the slide plan of a workbook.')
+    plan.add_argument('--source_workbook', type=str, default='VivaGoals.xlsx', help='Path to the source Excel workbook.')
+    plan.add_argument('--output', type=str, default=PLAN_FILE, help='Where to write the plan.')
+    plan.add_argument('--theme_slide_master', type=int, default=THEME_SLIDE_MASTER, help='Index of the theme slide master.')
+    plan.add_argument('--theme_slide_master_layout', type=int, default=THEME_SLIDE_MASTER_LAYOUT, help='Index of the theme slide master layout.')
+    plan.add_argument('--okr_slide_master', type=int, default=OKR_SLIDE_MASTER, help='Index of the OKR slide master.')
+    plan.add_argument('--okr_slide_master_layout', type=int, default=OKR_SLIDE_MASTER_LAYOUT, help='Index of the OKR slide master layout.')
+    plan.add_argument('--reader', type=str, choices=WORKBOOK_READERS, default=OPENPYXL_READER, help='Workbook reader: openpyxl, or native to parse the sheet XML directly.')
+    render = commands.add_parser('render', help='Render slides of a plan into a deck.')
+    render.add_argument('plan', type=str, help='Path to a plan written by the plan command.')
+    render.add_argument('--template_powerpoint', type=str, default=TEMPLATE_POWERPOINT, help='Path to the template PowerPoint file.')
+    render.add_argument('--target_bizplan_powerpoint', type=str, default='bizplan.pptx', help='Path to the target PowerPoint file.')
+    render.add_argument('--start', type=int, default=0, help='Index of the first slide to render.')
+    render.add_argument('--stop', type=int, default=None, help='Index after the last slide to render. Defaults to the end of the plan.')
+    render.add_argument('--stream', action='store_true', help='Write each slide to the output file as soon as it is rendered.')
+    args = parser.parse_args()
+
+    if args.command == 'plan':
+        specs = plan_workbook(args.source_workbook, (args.theme_slide_master, args.theme_slide_master_layout),
+                              (args.okr_slide_master, args.okr_slide_master_layout), args.reader)
+        write_slide_plan(args.output, specs)
+        print(f"Planned {len(specs)} slides to {args.output}")
+    else:
+        count = render_plan_file(args.plan, args.template_powerpoint, args.target_bizplan_powerpoint, args.start,
+                                 args.stop, args.stream)
+        print(f"Rendered {count} slides to {args.target_bizplan_powerpoint}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""
+Streaming writer for .pptx packages, and a reader for copying slides back out of them.
+
+Slides are written to the output zip as soon as they are finished and are then
+detached from the presentation, so memory stays flat however many slides the
+deck gets. The presentation part, the parts that came with the template and the
+content types are written when the writer is closed.
+"""
+
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+import zipfile
+from lxml import etree
+
+PACKAGE_RELS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+PRESENTATION_NS = 'http://schemas.openxmlformats.org/presentationml/2006/main'
+OFFICE_RELS_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+OFFICE_DOCUMENT_RELTYPE = OFFICE_RELS_NS + '/officeDocument'
+SLIDE_RELTYPE = OFFICE_RELS_NS + '/slide'
+IMAGE_RELTYPE = OFFICE_RELS_NS + '/image'
+CT_SLIDE = 'application/vnd.openxmlformats-officedocument.presentationml.slide+xml'
+NUMBERED_PARTNAME = re.compile(r'^(.*?)(\d*)(\.\w+)$')
+
+
+class _WrittenPart:
+    """The partname and content type of a part already in the zip, for [Content_Types].xml."""
+    __slots__ = ('partname', 'content_type')
+
+    def __init__(self, partname, content_type):
+        self.partname = partname
+        self.content_type = content_type
+
+
+class StreamingPresentationWriter:
+    """
+    Write a presentation to a .pptx file one slide at a time.
+
+    Call add_slide right after each slide is added to the presentation; the slide must be the
+    last one in the deck. Slides that were in the presentation before the writer was created are
+    written by close along with the rest of the template. The package is built in a temporary
+    file next to path, which replaces path only once it is complete.
+
+    Args:
+        prs (Presentation): The PowerPoint presentation object.
+        path (str): Where to write the .pptx file.
+    """
+
+    def __init__(self, prs, path):
+        self.prs = prs
+        self.path = path
+        sldIdLst = prs.slides._sldIdLst  # first access renames the template slides to slide1.xml and up
+        self._template_partnames = {str(part.partname) for part in prs.part.package.iter_parts()}
+        # Streamed slides are numbered consecutively, so only where they start and how many there are is kept
+        self._first_slide_number = len(sldIdLst) + 1
+        self._first_slide_id = sldIdLst._next_id
+        self._slide_count = 0
+        self._written = {}
+        self._shared_parts = {}
+        fd, self._temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.pptx.tmp')
+        os.close(fd)
+        self._zip = zipfile.ZipFile(self._temp_path, 'w', compression=zipfile.ZIP_DEFLATED, strict_timestamps=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _write_part(self, part, record=True):
+        self._zip.writestr(part.partname.membername, part.blob)
+        if part._rels:
+            self._zip.writestr(part.partname.rels_uri.membername, part.rels.xml)
+        if record:
+            self._written[str(part.partname)] = _WrittenPart(part.partname, part.content_type)
+
+    def _slide_partname(self, index):
+        from pptx.opc.packuri import PackURI
+
+        return PackURI("/ppt/slides/slide%d.xml" % (self._first_slide_number + index))
+
+    def _unique_partname(self, partname):
+        """Return partname, or the next free partname with the same stem and extension."""
+        from pptx.opc.packuri import PackURI
+
+        taken = self._template_partnames.union(self._written)
+        if str(partname) not in taken:
+            return partname
+        stem, _, ext = NUMBERED_PARTNAME.match(str(partname)).groups()
+        number = 1
+        while f"{stem}{number}{ext}" in taken:
+            number += 1
+        return PackURI(f"{stem}{number}{ext}")
+
+    def add_slide(self, slide):
+        """
+        Write a slide and the new parts it uses to the zip, and take it out of the presentation.
+
+        Args:
+            slide (Slide): The slide object, the last slide in the presentation.
+
+        Raises:
+            ValueError: If the slide is not the last slide in the presentation.
+        """
+        slide_part = slide.part
+        sldIdLst = self.prs.slides._sldIdLst
+        if not len(sldIdLst) or self.prs.part.related_part(sldIdLst[-1].rId) is not slide_part:
+            raise ValueError("Only the last slide of the presentation can be streamed")
+        sldId = sldIdLst[-1]
+        sldIdLst.remove(sldId)
+        self.prs.part.drop_rel(sldId.rId)
+
+        # Parts made while rendering (pictures) are not reachable from the template, so they are
+        # written the first time a slide uses them. python-pptx picks partnames among the parts it
+        # can still reach, so a new part may repeat the name of one already written.
+        for rel in slide_part.rels.values():
+            if rel.is_external:
+                continue
+            part = rel.target_part
+            partname = str(part.partname)
+            if partname in self._template_partnames or self._shared_parts.get(partname) is part:
+                continue
+            part.partname = self._unique_partname(part.partname)
+            self._shared_parts[str(part.partname)] = part
+            self._write_part(part)
+
+        slide_part.partname = self._slide_partname(self._slide_count)
+        self._write_part(slide_part, record=False)
+        self._slide_count += 1
+
+    def close(self):
+        """Write the presentation part, the rest of the template and the content types, and close the file."""
+        from pptx.opc.packuri import PACKAGE_URI, CONTENT_TYPES_URI
+        from pptx.opc.oxml import serialize_part_xml
+        from pptx.opc.serialized import _ContentTypesItem
+
+        prs_part = self.prs.part
+        sldIdLst = self.prs.slides._sldIdLst
+        rels = etree.fromstring(prs_part.rels.xml)
+        next_rId = max([0] + [int(rId[3:]) for rId in prs_part.rels if rId[3:].isdigit()]) + 1
+        added, written = [], []
+        for index in range(self._slide_count):
+            rId = "rId%d" % (next_rId + index)
+            partname = self._slide_partname(index)
+            added.append(sldIdLst._add_sldId(id=self._first_slide_id + index, rId=rId))
+            etree.SubElement(rels, '{%s}Relationship' % PACKAGE_RELS_NS, Id=rId, Type=SLIDE_RELTYPE,
+                             Target=partname.relative_ref(prs_part.partname.baseURI))
+            written.append(_WrittenPart(partname, CT_SLIDE))
+        try:
+            self._zip.writestr(prs_part.partname.membername, prs_part.blob)
+        finally:
+            for sldId in added:
+                sldIdLst.remove(sldId)
+        self._zip.writestr(prs_part.partname.rels_uri.membername, serialize_part_xml(rels))
+        written.append(_WrittenPart(prs_part.partname, prs_part.content_type))
+
+        for part in prs_part.package.iter_parts():
+            if part is prs_part or self._shared_parts.get(str(part.partname)) is part:
+                continue
+            self._write_part(part)
+        self._zip.writestr(PACKAGE_URI.rels_uri.membername, prs_part.package._rels.xml)
+        written.extend(self._written.values())
+        self._zip.writestr(CONTENT_TYPES_URI.membername, serialize_part_xml(_ContentTypesItem.xml_for(written)))
+        self._zip.close()
+        os.replace(self._temp_path, self.path)
+
+    def abort(self):
+        """Close and delete the unfinished file, leaving any existing file at path as it was."""
+        self._zip.close()
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+
+
+def _rels_membername(partname):
+    """Return the zip member holding the relationships of a partname such as '/ppt/slides/slide1.xml'."""
+    return posixpath.join(posixpath.dirname(partname), '_rels', posixpath.basename(partname) + '.rels')[1:]
+
+
+class SlideArchive:
+    """
+    Read slides of a .pptx file straight from its zip archive, without loading the whole package.
+
+    Args:
+        path (str): Path to the .pptx file.
+
+    Raises:
+        ValueError: If the file is not a presentation package.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        try:
+            presentation = self._target('/', self._read_rels('/'), OFFICE_DOCUMENT_RELTYPE)
+            presentation_rels = {rel.get('Id'): rel for rel in self._read_rels(presentation)}
+            root = etree.fromstring(self._zip.read(presentation[1:]))
+        except (KeyError, etree.XMLSyntaxError) as e:
+            self._zip.close()
+            raise ValueError(f"Not a presentation package: {path}: {e}")
+        self.slide_partnames = []
+        for sldId in root.iterfind('{%s}sldIdLst/{%s}sldId' % (PRESENTATION_NS, PRESENTATION_NS)):
+            rel = presentation_rels[sldId.get('{%s}id' % OFFICE_RELS_NS)]
+            self.slide_partnames.append(self._resolve(presentation, rel.get('Target')))
+        self._images = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self.slide_partnames)
+
+    def close(self):
+        self._zip.close()
+
+    @staticmethod
+    def _resolve(source_partname, target):
+        if target.startswith('/'):
+            return target
+        return posixpath.normpath(posixpath.join(posixpath.dirname(source_partname), target))
+
+    def _read_rels(self, partname):
+        membername = '_rels/.rels' if partname == '/' else _rels_membername(partname)
+        try:
+            return list(etree.fromstring(self._zip.read(membername)))
+        except KeyError:
+            return []
+
+    def _target(self, source_partname, rels, reltype):
+        for rel in rels:
+            if rel.get('Type') == reltype:
+                return self._resolve(source_partname, rel.get('Target'))
+        raise KeyError(reltype)
+
+    def export(self, indices):
+        """
+        Return the slides at the given positions, in the format of Make_Biz_Plan.render_shard.
+
+        Args:
+            indices (list): Zero-based slide positions.
+
+        Returns:
+            tuple: A list of (slide XML, relationships) per slide and a dict of image bytes by SHA1.
+        """
+        slides, images = [], {}
+        for index in indices:
+            partname = self.slide_partnames[index]
+            rels = []
+            for rel in self._read_rels(partname):
+                rId, reltype, target = rel.get('Id'), rel.get('Type'), rel.get('Target')
+                if rel.get('TargetMode') == 'External':
+                    rels.append((rId, reltype, 'external', target))
+                    continue
+                target = self._resolve(partname, target)
+                if reltype == IMAGE_RELTYPE:
+                    image = self._images.get(target)
+                    if image is None:
+                        blob = self._zip.read(target[1:])
+                        image = self._images[target] = (hashlib.sha1(blob).hexdigest(), blob)
+                    images[image[0]] = image[1]
+                    rels.append((rId, reltype, 'image', image[0]))
+                else:
+                    rels.append((rId, reltype, 'part', target))
+            rels.sort(key=lambda rel: int(rel[0][3:]) if rel[0][3:].isdigit() else 0)
+            slides.append((self._zip.read(partname[1:]), rels))
+        return slides, images
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from Make_Biz_Plan import OKR_ID_PATTERN, ALIGNMENT_PATTERN
+from bench_make_biz_plan import (PIPELINE_STAGES, bench_pipeline_sizes, bench_plan, compare_pipeline, iter_synthetic_rows,
+                                 write_synthetic_workbook)
+
+
+class TestSyntheticWorkbook(unittest.TestCase):
+    def test_rows_form_goal_trees(self):
+        rows = list(iter_synthetic_rows(500, seed=1))
+        self.assertEqual(len(rows), 501)
+        ids = {OKR_ID_PATTERN.findall(row[0])[-1] for row in rows[1:]}
+        types = {row[11] for row in rows[1:]}
+        self.assertEqual(types, {'Objective', 'Outcome', 'Action'})
+        for row in rows[1:]:
+            for parent_id in ALIGNMENT_PATTERN.findall(row[8]):
+                self.assertIn(parent_id, ids)
+        self.assertEqual(rows, list(iter_synthetic_rows(500, seed=1)))
+
+
+class TestPipelineBenchmark(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_stages_are_timed_and_traced(self):
+        results = bench_pipeline_sizes([20, 40], self.temp_dir.name)
+        self.assertEqual([result['goals'] for result in results], [20, 40])
+        for result in results:
+            self.assertEqual(result['slides'], result['goals'])
+            self.assertEqual(list(result['seconds']), list(PIPELINE_STAGES) + ['total'])
+            self.assertTrue(all(seconds >= 0 for seconds in result['seconds'].values()))
+            self.assertAlmostEqual(sum(result['seconds'][stage] for stage in PIPELINE_STAGES),
+                                   result['seconds']['total'], delta=0.001)
+            self.assertEqual(list(result['peak_memory_bytes']), list(PIPELINE_STAGES))
+            self.assertGreater(result['peak_memory_bytes']['render'], 0)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, 'bizplan40.pptx')))
+
+        untraced = bench_pipeline_sizes([20], self.temp_dir.name, trace_memory=False)
+        self.assertNotIn('peak_memory_bytes', untraced[0])
+
+    def test_plan_is_timed(self):
+        result = bench_plan(write_synthetic_workbook(os.path.join(self.temp_dir.name, 'goals.xlsx'), 50), repeat=2)
+        self.assertEqual(result['goals'], 50)
+        self.assertGreater(result['goals_per_second'], 0)
+
+    def test_compare_pipeline(self):
+        baseline = [{'goals': 1000, 'seconds': {'load': 2.0, 'render': 0.0, 'total': 4.0}}]
+        results = [{'goals': 1000, 'seconds': {'load': 3.0, 'render': 1.0, 'save': 1.0, 'total': 5.0}},
+                   {'goals': 10000, 'seconds': {'load': 30.0}}]
+        self.assertEqual(compare_pipeline(baseline, results), {'1000': {'load': 1.5, 'render': None, 'total': 1.25}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from openpyxl import Workbook
+from pptx import Presentation
+from Make_Biz_Plan import GOAL_COLUMNS
+from biz_plan_async import ProgressEvent, convert
+
+
+class TestAsyncConvert(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.template_path = os.path.join(self.temp_dir.name, 'template.pptx')
+        Presentation().save(self.template_path)
+        self.workbook_path = os.path.join(self.temp_dir.name, 'goals.xlsx')
+        wb = Workbook()
+        ws = wb.active
+        ws.append(GOAL_COLUMNS)
+        rows = [('1', 'Theme 1', 'Theme', '', 'Objective')]
+        for objective in range(2, 12):
+            rows.append((str(objective), f'Objective {objective}', '', 'Theme 1 (weight: 100%, Id: 1)', 'Objective'))
+        for goal_id, title, tag, alignment, object_type in rows:
+            ws.append([f'=HYPERLINK("http://example.com/{goal_id}", "{goal_id}")', title, tag, 'Owner', 'Q1',
+                       '2024-01-01', '2024-03-31', f'Description {goal_id}', alignment, 'Metric', '50%',
+                       object_type, 'On Track'])
+        wb.save(self.workbook_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def convert(self, name, **options):
+        return convert(self.workbook_path, self.template_path, os.path.join(self.temp_dir.name, name),
+                       theme_slide_master=0, theme_slide_master_layout=0, okr_slide_master=0,
+                       okr_slide_master_layout=1, **options)
+
+    def test_progress_events(self):
+        events = []
+        asyncio.run(self.convert('out.pptx', progress=events.append))
+        expected = [ProgressEvent('loaded', 11, 11), ProgressEvent('sorted', 11, 11)]
+        expected += [ProgressEvent('rendered', done, 11) for done in range(1, 12)]
+        expected.append(ProgressEvent('saved', 11, 11))
+        self.assertEqual(events, expected)
+        self.assertEqual(len(Presentation(os.path.join(self.temp_dir.name, 'out.pptx')).slides), 11)
+
+        events = []
+        asyncio.run(self.convert('out.pptx', progress=events.append, slides_per_event=4))
+        self.assertEqual([event.done for event in events if event.stage == 'rendered'], [4, 8, 11])
+
+    def test_event_loop_keeps_running(self):
+        async def run():
+            ticks = 0
+            task = asyncio.ensure_future(self.convert('out.pptx'))
+            while not task.done():
+                await asyncio.sleep(0.001)
+                ticks += 1
+            await task
+            return ticks
+
+        self.assertGreater(asyncio.run(run()), 1)
+
+    def test_cancelled_conversion_stops_and_leaves_no_file(self):
+        async def run():
+            events = []
+
+            def progress(event):
+                events.append(event)
+                if event.stage == 'rendered':
+                    task.cancel()
+
+            task = asyncio.ensure_future(self.convert('cancelled.pptx', progress=progress, stream=True))
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            return events
+
+        events = asyncio.run(run())
+        self.assertLess(max(event.done for event in events if event.stage == 'rendered'), 11)
+        self.assertNotIn('saved', [event.stage for event in events])
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir.name, 'cancelled.pptx')))
+        self.assertEqual([name for name in os.listdir(self.temp_dir.name) if name.endswith('.tmp')], [])
+
+    def test_limit_runs_conversions_one_at_a_time(self):
+        async def run():
+            limit = asyncio.Semaphore(1)
+            events = []
+            await asyncio.gather(*(self.convert(f'out{index}.pptx', limit=limit,
+                                                progress=lambda event, index=index: events.append((index, event.stage)))
+                                   for index in range(3)))
+            return events
+
+        events = asyncio.run(run())
+        # Each conversion reports all its stages before the next one starts
+        indices = [index for index, _ in events]
+        self.assertEqual(indices, sorted(indices))
+        self.assertEqual(events.count((0, 'saved')), 1)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(self.convert('out.pptx', slides_per_event=0))
+        with self.assertRaises(ValueError):
+            asyncio.run(self.convert('out.pptx', workers=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
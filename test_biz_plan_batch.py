@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+import unittest
+from openpyxl import Workbook
+from pptx import Presentation
+from Make_Biz_Plan import GOAL_COLUMNS
+from biz_plan_batch import load_batch_manifest, run_batch
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = self.temp_dir.name
+        Presentation().save(os.path.join(self.dir, 'template.pptx'))
+        for unit in ('north', 'south'):
+            wb = Workbook()
+            ws = wb.active
+            ws.append(GOAL_COLUMNS)
+            rows = [
+                ('1', f'Theme {unit}', 'Theme', '', 'Objective'),
+                ('2', f'Objective {unit}', '', f'Theme {unit} (weight: 100%, Id: 1)', 'Objective'),
+            ]
+            for goal_id, title, tag, alignment, object_type in rows:
+                ws.append([f'=HYPERLINK("http://example.com/{goal_id}", "{goal_id}")', title, tag, 'Owner', 'Q1',
+                           '2024-01-01', '2024-03-31', f'Description {goal_id}', alignment, 'Metric', '50%',
+                           object_type, 'On Track'])
+            wb.save(os.path.join(self.dir, f'{unit}.xlsx'))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def job(self, unit, **options):
+        job = {'source_workbook': f'{unit}.xlsx', 'template_powerpoint': 'template.pptx',
+               'target_bizplan_powerpoint': f'{unit}.pptx', 'theme_slide_master': 0, 'theme_slide_master_layout': 0,
+               'okr_slide_master': 0, 'okr_slide_master_layout': 1}
+        job.update(options)
+        return job
+
+    def titles(self, unit):
+        return [slide.shapes.title.text for slide in Presentation(os.path.join(self.dir, f'{unit}.pptx')).slides]
+
+    def test_failed_job_does_not_stop_batch(self):
+        manifest_path = os.path.join(self.dir, 'jobs.json')
+        with open(manifest_path, 'w') as f:
+            json.dump([self.job('north'), self.job('missing'), self.job('south', stream=True),
+                       self.job('west', workers=2)], f)
+        reported = []
+        results = run_batch(load_batch_manifest(manifest_path), pool_jobs=2, report=reported.append)
+        self.assertEqual(reported, results)
+        self.assertEqual([result['status'] for result in results], ['ok', 'failed', 'ok', 'failed'])
+        self.assertEqual([result['job'] for result in results], [1, 2, 3, 4])
+        self.assertIn('does not exist', results[1]['error'])
+        self.assertIn('Unknown job fields: workers', results[3]['error'])
+        self.assertEqual(results[0]['target'], os.path.join(self.dir, 'north.pptx'))
+        self.assertEqual(self.titles('north'), ['Theme north', 'Objective north'])
+        self.assertEqual(self.titles('south'), ['Theme south', 'Objective south'])
+
+    def test_csv_manifest(self):
+        csv_path = os.path.join(self.dir, 'jobs.csv')
+        with open(csv_path, 'w') as f:
+            f.write('source_workbook,target_bizplan_powerpoint,okr_slide_master_layout,stream,render_engine\n')
+            f.write('north.xlsx,north.pptx,1,yes,prototype\n')
+            f.write('south.xlsx,south.pptx,2,,\n')
+        self.assertEqual(load_batch_manifest(csv_path), [
+            {'source_workbook': os.path.join(self.dir, 'north.xlsx'),
+             'target_bizplan_powerpoint': os.path.join(self.dir, 'north.pptx'),
+             'okr_slide_master_layout': 1, 'stream': True, 'render_engine': 'prototype'},
+            {'source_workbook': os.path.join(self.dir, 'south.xlsx'),
+             'target_bizplan_powerpoint': os.path.join(self.dir, 'south.pptx'), 'okr_slide_master_layout': 2},
+        ])
+
+    @unittest.skipIf(yaml is None, 'PyYAML is not installed')
+    def test_yaml_manifest(self):
+        yaml_path = os.path.join(self.dir, 'jobs.yaml')
+        with open(yaml_path, 'w') as f:
+            f.write('- source_workbook: north.xlsx\n  okr_slide_master_layout: 1\n  incremental: true\n')
+        self.assertEqual(load_batch_manifest(yaml_path), [
+            {'source_workbook': os.path.join(self.dir, 'north.xlsx'), 'okr_slide_master_layout': 1, 'incremental': True}])
+
+    def test_invalid_manifests(self):
+        contents = {
+            'jobs.txt': '',
+            'jobs.json': '{"source_workbook": "north.xlsx"}',
+            'broken.json': '[{',
+            'jobs.csv': 'source_workbook,stream\nnorth.xlsx,maybe\n',
+        }
+        for name, content in contents.items():
+            path = os.path.join(self.dir, name)
+            with open(path, 'w') as f:
+                f.write(content)
+            with self.assertRaises(ValueError):
+                load_batch_manifest(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
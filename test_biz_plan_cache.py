@@ -0,0 +1,72 @@
+import os
+import tempfile
+import time
+import unittest
+from biz_plan_cache import DiskCache, file_digest
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, 'cache')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def entries(self):
+        return sorted(name for name in os.listdir(self.cache_dir) if name.endswith('.pickle'))
+
+    def test_get_and_set(self):
+        cache = DiskCache(self.cache_dir)
+        self.assertIsNone(cache.get('missing'))
+        self.assertEqual(cache.get('missing', 'default'), 'default')
+        cache.set('key', {'goals': [1, 2, 3]})
+        self.assertEqual(cache.get('key'), {'goals': [1, 2, 3]})
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertEqual(DiskCache(self.cache_dir).get('key'), {'goals': [1, 2, 3]})
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = DiskCache(self.cache_dir)
+        cache.set('a', b'x' * 1000)
+        cache.set('b', b'x' * 1000)
+        entry_size = os.path.getsize(os.path.join(self.cache_dir, self.entries()[0]))
+        for name in self.entries():
+            os.utime(os.path.join(self.cache_dir, name), (time.time() - 100, time.time() - 100))
+        cache.get('a')
+        cache.max_bytes = entry_size * 2
+        cache.set('c', b'x' * 1000)
+        self.assertEqual(cache.get('a'), b'x' * 1000)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), b'x' * 1000)
+        self.assertEqual(len(self.entries()), 2)
+
+    def test_corrupt_entry_is_a_miss(self):
+        cache = DiskCache(self.cache_dir)
+        cache.set('key', 'value')
+        with open(os.path.join(self.cache_dir, self.entries()[0]), 'wb') as f:
+            f.write(b'not a pickle')
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(self.entries(), [])
+
+    def test_clear(self):
+        cache = DiskCache(self.cache_dir)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.clear()
+        self.assertEqual(self.entries(), [])
+        self.assertIsNone(cache.get('a'))
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            DiskCache(self.cache_dir, -1)
+
+    def test_file_digest(self):
+        path = os.path.join(self.temp_dir.name, 'data.bin')
+        with open(path, 'wb') as f:
+            f.write(b'abc')
+        self.assertEqual(file_digest(path, chunk_size=2),
+                         'ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import json
+import os
+import pstats
+import subprocess
+import sys
+import tempfile
+import unittest
+from openpyxl import Workbook
+from pptx import Presentation
+import Make_Biz_Plan
+from Make_Biz_Plan import GOAL_COLUMNS, PHASES, ConversionHooks
+from biz_plan_profile import ConversionProfiler
+
+
+class TestConversionProfiler(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.template_path = os.path.join(self.temp_dir.name, 'template.pptx')
+        Presentation().save(self.template_path)
+        self.workbook_path = os.path.join(self.temp_dir.name, 'goals.xlsx')
+        wb = Workbook()
+        ws = wb.active
+        ws.append(GOAL_COLUMNS)
+        rows = [('1', 'Theme 1', 'Theme', '', 'Objective'),
+                ('2', 'Objective 2', '', 'Theme 1 (weight: 100%, Id: 1)', 'Objective'),
+                ('3', 'Outcome 3', '', 'Objective 2 (weight: 100%, Id: 2)', 'Outcome'),
+                ('4', 'Outcome 4', '', 'Objective 2 (weight: 100%, Id: 2)', 'Outcome'),
+                ('5', 'Action 5', '', 'Objective 2 (weight: 100%, Id: 2)', 'Action')]
+        for goal_id, title, tag, alignment, object_type in rows:
+            ws.append([f'=HYPERLINK("http://example.com/{goal_id}", "{goal_id}")', title, tag, 'Owner', 'Q1',
+                       '2024-01-01', '2024-03-31', f'Description {goal_id}', alignment, 'Metric', '50%',
+                       object_type, 'On Track'])
+        wb.save(self.workbook_path)
+        self.target_path = os.path.join(self.temp_dir.name, 'out.pptx')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def convert(self, hooks, **options):
+        Make_Biz_Plan.main(self.workbook_path, self.template_path, self.target_path, 0, 0, 0, 1, hooks=hooks, **options)
+
+    def test_report(self):
+        profiler = ConversionProfiler(cprofile=True)
+        with profiler:
+            self.convert(profiler.hooks)
+        report = profiler.report()
+        self.assertEqual(list(report['phases']), list(PHASES))
+        for phase in report['phases'].values():
+            self.assertGreaterEqual(phase['wall_seconds'], 0)
+            self.assertGreaterEqual(phase['cpu_seconds'], 0)
+            self.assertGreater(phase['peak_memory_bytes'], 0)
+        self.assertGreaterEqual(report['peak_memory_bytes'], max(phase['peak_memory_bytes'] for phase in report['phases'].values()))
+        slides = report['slides']
+        self.assertEqual(slides['count'], 5)
+        self.assertEqual(report['operations']['file_reads'], 5)
+        self.assertGreater(report['operations']['shapes_created'], slides['count'])
+        self.assertEqual({kind: stats['count'] for kind, stats in slides['by_type'].items()},
+                         {'Theme': 1, 'Objective': 1, 'Outcome': 2, 'Action': 1})
+        self.assertEqual(slides['shapes'], sum(len(slide.shapes) for slide in Presentation(self.target_path).slides))
+        for stats in slides['by_type'].values():
+            self.assertEqual(sum(stats['histogram'].values()), stats['count'])
+            self.assertLessEqual(stats['p50_ms'], stats['max_ms'])
+
+        stats_path = os.path.join(self.temp_dir.name, 'profile.prof')
+        profiler.dump_stats(stats_path)
+        self.assertTrue(any(function[2] == 'main' for function in pstats.Stats(stats_path).stats))
+
+    def test_hooks(self):
+        hooks = ConversionHooks()
+        events = []
+        hooks.subscribe('phase_started', lambda phase: events.append(('started', phase)))
+        hooks.subscribe('phase_finished', lambda phase, wall_seconds, cpu_seconds: events.append(('finished', phase)))
+        titles = hooks.subscribe('slide_rendered', lambda goal, slide, seconds: events.append(('slide', goal.title)))
+        self.convert(hooks, render_engine='prototype')
+        expected = [('started', 'load'), ('finished', 'load'), ('started', 'sort'), ('finished', 'sort'),
+                    ('started', 'template'), ('finished', 'template'), ('started', 'render')]
+        expected += [('slide', title) for title in ('Theme 1', 'Objective 2', 'Outcome 3', 'Outcome 4', 'Action 5')]
+        expected += [('finished', 'render'), ('started', 'save'), ('finished', 'save')]
+        self.assertEqual(events, expected)
+
+        hooks.unsubscribe('slide_rendered', titles)
+        events.clear()
+        self.convert(hooks)
+        self.assertNotIn('slide', [kind for kind, _ in events])
+        with self.assertRaises(ValueError):
+            hooks.subscribe('unknown', print)
+
+    def test_failed_phase_is_not_finished(self):
+        hooks = ConversionHooks()
+        events = []
+        hooks.subscribe('phase_finished', lambda phase, wall_seconds, cpu_seconds: events.append(phase))
+        with self.assertRaises(ValueError):
+            Make_Biz_Plan.main(os.path.join(self.temp_dir.name, 'missing.xlsx'), self.template_path, self.target_path,
+                               hooks=hooks)
+        self.assertEqual(events, [])
+
+    def test_dump_stats_needs_cprofile(self):
+        with self.assertRaises(ValueError):
+            ConversionProfiler().dump_stats(os.path.join(self.temp_dir.name, 'profile.prof'))
+
+    def run_command_line(self, *options):
+        subprocess.run([sys.executable, 'Make_Biz_Plan.py', '--source_workbook', self.workbook_path,
+                        '--template_powerpoint', self.template_path, '--target_bizplan_powerpoint', self.target_path,
+                        '--theme_slide_master', '0', '--theme_slide_master_layout', '0', '--okr_slide_master', '0',
+                        '--okr_slide_master_layout', '1', '--no-cache', *options],
+                       check=True, capture_output=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+
+    @staticmethod
+    def traced_memory(stats_path):
+        return any('get_traced_memory' in name for _, _, name in pstats.Stats(stats_path).stats)
+
+    def test_command_line(self):
+        report_path = os.path.join(self.temp_dir.name, 'profile.json')
+        stats_path = os.path.join(self.temp_dir.name, 'profile.prof')
+        self.run_command_line('--profile', report_path, '--profile_dump', stats_path)
+        with open(report_path) as f:
+            report = json.load(f)
+        self.assertEqual(report['slides']['count'], 5)
+        self.assertIn('peak_memory_bytes', report)
+        self.assertTrue(self.traced_memory(stats_path))
+
+    def test_profile_dump_alone_does_not_trace_memory(self):
+        stats_path = os.path.join(self.temp_dir.name, 'untraced.prof')
+        self.run_command_line('--profile_dump', stats_path)
+        self.assertFalse(self.traced_memory(stats_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
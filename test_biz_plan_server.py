@@ -0,0 +1,156 @@
+import http.client
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from openpyxl import Workbook
+from pptx import Presentation
+from Make_Biz_Plan import GOAL_COLUMNS
+from biz_plan_pool import ConversionPool
+from biz_plan_server import JSON_CONTENT_TYPE, TOKEN_HEADER, make_http_server
+
+TOKEN = 'test-token'
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path):
+        super().__init__('localhost')
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+class TestConversionPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.template_path = os.path.join(cls.temp_dir.name, 'template.pptx')
+        Presentation().save(cls.template_path)
+        cls.workbook_path = os.path.join(cls.temp_dir.name, 'goals.xlsx')
+        wb = Workbook()
+        ws = wb.active
+        ws.append(GOAL_COLUMNS)
+        rows = [
+            ('1', 'Theme 1', 'Theme', '', 'Objective'),
+            ('2', 'Objective 1', '', 'Theme 1 (weight: 100%, Id: 1)', 'Objective'),
+            ('3', 'Action 1', '', 'Objective 1 (weight: 100%, Id: 2)', 'Action'),
+        ]
+        for goal_id, title, tag, alignment, object_type in rows:
+            ws.append([f'=HYPERLINK("http://example.com/{goal_id}", "{goal_id}")', title, tag, 'Owner', 'Q1',
+                       '2024-01-01', '2024-03-31', f'Description {goal_id}', alignment, 'Metric', '50%',
+                       object_type, 'On Track'])
+        wb.save(cls.workbook_path)
+        cls.conversion_pool = ConversionPool(jobs=2, templates=[cls.template_path])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conversion_pool.shutdown()
+        cls.temp_dir.cleanup()
+
+    def serve(self, **options):
+        httpd = make_http_server(self.conversion_pool, **options)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(httpd.server_close)
+        self.addCleanup(httpd.shutdown)
+        return httpd
+
+    @staticmethod
+    def request(connection, method, path, body=None, token=TOKEN, content_type=JSON_CONTENT_TYPE):
+        headers = {'Content-Type': content_type}
+        if token is not None:
+            headers[TOKEN_HEADER] = token
+        connection.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+        response = connection.getresponse()
+        result = json.loads(response.read())
+        connection.close()
+        return response.status, result
+
+    def job(self, name, **options):
+        job = dict(source_workbook=self.workbook_path, template_powerpoint=self.template_path,
+                   target_bizplan_powerpoint=os.path.join(self.temp_dir.name, name), theme_slide_master=0,
+                   theme_slide_master_layout=0, okr_slide_master=0, okr_slide_master_layout=1)
+        job.update(options)
+        return job
+
+    def test_concurrent_jobs_over_http(self):
+        port = self.serve(port=0, token=TOKEN).server_address[1]
+        jobs = [self.job(f'out{i}.pptx', stream=i % 2 == 1) for i in range(4)]
+        with ThreadPoolExecutor(len(jobs)) as executor:
+            results = list(executor.map(
+                lambda job: self.request(http.client.HTTPConnection('127.0.0.1', port), 'POST', '/convert', job), jobs))
+        for job, (status, result) in zip(jobs, results):
+            self.assertEqual(status, 200, result)
+            self.assertEqual(result['target'], job['target_bizplan_powerpoint'])
+            self.assertEqual(set(result['timings']), {'queued', 'template', 'convert', 'total'})
+            self.assertEqual((result['summary']['slides'], result['summary']['rendered']), (3, 3))
+            self.assertEqual([slide.shapes.title.text for slide in Presentation(result['target']).slides],
+                             ['Theme 1', 'Objective 1', 'Action 1'])
+        status, result = self.request(http.client.HTTPConnection('127.0.0.1', port), 'GET', '/status')
+        self.assertEqual(status, 200)
+        self.assertGreaterEqual(result['completed'], 4)
+
+    def test_invalid_jobs_over_unix_socket(self):
+        socket_path = os.path.join(self.temp_dir.name, 'server.sock')
+        self.serve(socket_path=socket_path)
+        status, result = self.request(UnixHTTPConnection(socket_path), 'POST', '/convert', self.job('ok.pptx'))
+        self.assertEqual(status, 200, result)
+
+        for job in (self.job('bad.pptx', workers=4), self.job('bad.pptx', render_engine='unknown'),
+                    self.job('bad.pptx', source_workbook=os.path.join(self.temp_dir.name, 'missing.xlsx')), []):
+            status, result = self.request(UnixHTTPConnection(socket_path), 'POST', '/convert', job)
+            self.assertEqual(status, 400)
+            self.assertIn('error', result)
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir.name, 'bad.pptx')))
+        status, _ = self.request(UnixHTTPConnection(socket_path), 'GET', '/missing')
+        self.assertEqual(status, 404)
+
+    def test_requests_need_token_json_and_allowed_target(self):
+        port = self.serve(port=0, token=TOKEN, output_dir=os.path.join(self.temp_dir.name, 'out')).server_address[1]
+        connect = lambda: http.client.HTTPConnection('127.0.0.1', port)
+        job = self.job(os.path.join('out', 'allowed.pptx'))
+        os.makedirs(os.path.join(self.temp_dir.name, 'out'), exist_ok=True)
+        self.assertEqual(self.request(connect(), 'POST', '/convert', job, token=None)[0], 401)
+        self.assertEqual(self.request(connect(), 'POST', '/convert', job, token='wrong')[0], 401)
+        self.assertEqual(self.request(connect(), 'GET', '/status', token=None)[0], 401)
+        # A browser page can post text/plain across origins without asking first
+        self.assertEqual(self.request(connect(), 'POST', '/convert', job, content_type='text/plain')[0], 415)
+        for name in ('escaped.pptx', os.path.join('out', '..', 'escaped.pptx')):
+            self.assertEqual(self.request(connect(), 'POST', '/convert', self.job(name))[0], 403)
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir.name, 'escaped.pptx')))
+        status, result = self.request(connect(), 'POST', '/convert', job)
+        self.assertEqual(status, 200, result)
+
+        with self.assertRaises(ValueError):
+            make_http_server(self.conversion_pool, port=0)
+        not_a_socket = os.path.join(self.temp_dir.name, 'not-a-socket')
+        open(not_a_socket, 'w').close()
+        with self.assertRaises(ValueError):
+            make_http_server(self.conversion_pool, socket_path=not_a_socket)
+        self.assertTrue(os.path.exists(not_a_socket))
+
+    def test_unix_socket_is_private(self):
+        socket_path = os.path.join(self.temp_dir.name, 'private.sock')
+        self.serve(socket_path=socket_path)
+        self.assertEqual(os.stat(socket_path).st_mode & 0o077, 0)
+        # Without a server token, socket requests need none
+        self.assertEqual(self.request(UnixHTTPConnection(socket_path), 'GET', '/status', token=None)[0], 200)
+
+    def test_warm_up_starts_every_worker(self):
+        with ConversionPool(jobs=3) as conversion_pool:
+            conversion_pool.warm_up()
+            pids = {process.pid for process in conversion_pool._executor._processes.values()}
+            self.assertEqual(len(pids), 3)
+
+    def test_invalid_jobs_count(self):
+        with self.assertRaises(ValueError):
+            ConversionPool(jobs=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
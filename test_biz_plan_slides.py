@@ -0,0 +1,98 @@
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from pptx import Presentation
+import Make_Biz_Plan
+from bench_make_biz_plan import write_synthetic_template, write_synthetic_workbook
+from biz_plan_slides import (PLAN_VERSION, TITLE_BAR_DECORATION, SlideSpec, build_slide_plan, plan_workbook,
+                             read_slide_plan, render_plan_file, render_slide_plan, write_slide_plan)
+
+LAYOUTS = ((0, 0), (0, 1))
+
+
+class TestSlidePlan(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.template_path = write_synthetic_template(os.path.join(cls.temp_dir.name, 'template.pptx'))
+        cls.workbook_path = write_synthetic_workbook(os.path.join(cls.temp_dir.name, 'goals.xlsx'), 60)
+        cls.goals = Make_Biz_Plan.ConversionContext.from_workbook(cls.workbook_path).ordered_goals
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+    def test_plan_describes_each_slide(self):
+        plan = build_slide_plan(self.goals, *LAYOUTS)
+        self.assertEqual([spec.title for spec in plan], [goal.title for goal in self.goals])
+        theme = plan[0]
+        self.assertEqual((theme.slide_type, theme.layout, theme.details, theme.icon), ('Theme', (0, 0), None, None))
+        objective = next(spec for spec in plan if spec.slide_type == Make_Biz_Plan.OBJECTIVE_TYPE)
+        goal = next(goal for goal in self.goals if goal.goal_id == objective.goal_id)
+        self.assertEqual(objective.layout, (0, 1))
+        self.assertEqual(objective.details['owner'], goal.owner)
+        self.assertEqual(objective.alignment[0][0], "Parent plan theme: ")
+        self.assertEqual((objective.icon, objective.hyperlink), (Make_Biz_Plan.OBJECTIVE_IMAGE, goal.okr_link))
+        self.assertEqual(objective.decorations, (TITLE_BAR_DECORATION,))
+        self.assertTrue(any(spec.alignment and spec.alignment[-1][2] == Make_Biz_Plan.MWB_COLOR for spec in plan))
+        self.assertEqual(pickle.loads(pickle.dumps(plan)), plan)
+        self.assertEqual(plan_workbook(self.workbook_path, *LAYOUTS), plan)
+
+    def test_rendered_plan_matches_goal_slides(self):
+        from_goals = Presentation(self.template_path)
+        Make_Biz_Plan.render_goals(from_goals, self.goals, self.template_path, *LAYOUTS)
+        from_plan = Presentation(self.template_path)
+        done = []
+        render_slide_plan(from_plan, build_slide_plan(self.goals, *LAYOUTS), on_slide=done.append)
+        self.assertEqual(done, list(range(1, len(self.goals) + 1)))
+        self.assertEqual(len(from_plan.slides), len(from_goals.slides))
+        for expected, actual in zip(from_goals.slides, from_plan.slides):
+            self.assertEqual(actual.part.blob, expected.part.blob)
+            self.assertEqual(sorted(rel.target_ref for rel in actual.part.rels.values()),
+                             sorted(rel.target_ref for rel in expected.part.rels.values()))
+
+    def test_plan_file_round_trip_and_chunks(self):
+        plan = build_slide_plan(self.goals, *LAYOUTS)
+        plan_path = self.path('plan.jsonl')
+        write_slide_plan(plan_path, plan)
+        with open(plan_path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(json.loads(lines[0]), {'version': PLAN_VERSION, 'slides': len(plan)})
+        self.assertEqual(len(lines), len(plan) + 1)
+        self.assertEqual(read_slide_plan(plan_path), plan)
+        self.assertEqual(read_slide_plan(plan_path, 10, 25), plan[10:25])
+
+        titles = []
+        for number, start in enumerate(range(0, len(plan), 25)):
+            target = self.path(f'chunk{number}.pptx')
+            self.assertEqual(render_plan_file(plan_path, self.template_path, target, start, start + 25, stream=number == 1),
+                             len(plan[start:start + 25]))
+            titles.extend(slide.shapes.title.text for slide in Presentation(target).slides)
+        self.assertEqual(titles, [spec.title for spec in plan])
+
+    def test_invalid_plans(self):
+        valid = build_slide_plan(self.goals[:2], *LAYOUTS)[1].to_dict()
+        cases = {
+            'version.jsonl': [{'version': PLAN_VERSION + 1, 'slides': 0}],
+            'layout.jsonl': [{'version': PLAN_VERSION, 'slides': 1}, dict(valid, layout=[1])],
+            'field.jsonl': [{'version': PLAN_VERSION, 'slides': 1}, dict(valid, colour='red')],
+            'decoration.jsonl': [{'version': PLAN_VERSION, 'slides': 1}, dict(valid, decorations=['sparkles'])],
+            'missing.jsonl': [{'version': PLAN_VERSION, 'slides': 1}, {'goal_id': '1'}],
+        }
+        for name, lines in cases.items():
+            with open(self.path(name), 'w') as f:
+                f.write(''.join(json.dumps(line) + '\n' for line in lines))
+            with self.assertRaises(ValueError):
+                read_slide_plan(self.path(name))
+        with self.assertRaisesRegex(ValueError, 'line 2'):
+            read_slide_plan(self.path('layout.jsonl'))
+        self.assertEqual(SlideSpec.from_dict(valid).to_dict(), valid)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,17 @@
 import unittest
+import hashlib
 import json
+import random
+import os
+import subprocess
+import sys
+import tempfile
+import zipfile
+from openpyxl import Workbook
 from pptx.util import Inches
 from unittest.mock import patch, MagicMock
-from Make_Biz_Plan import OKRId, add_goal_image, flip_bool_attribute, SquareDimensions, LineDimensions, VivaGoal, get_goal_by_id, get_parent_goals_from_alignment, get_theme_goal_by_id, create_slide, add_goal_details_to_slide, add_text_block_to_slide, ACTION_TYPE, OUTCOME_TYPE, goal_sort_key, load_goals_from_workbook
+import Make_Biz_Plan
+from Make_Biz_Plan import OKRId, add_goal_image, flip_bool_attribute, SquareDimensions, LineDimensions, VivaGoal, get_goal_by_id, get_parent_goals_from_alignment, get_theme_goal_by_id, create_slide, add_goal_details_to_slide, add_text_block_to_slide, TextBlock, ACTION_TYPE, OUTCOME_TYPE, goal_sort_key, load_goals_from_workbook, iter_goals_from_workbook, ColumnMap, create_goal, GoalGraph
 
 class TestUtilityFunctions(unittest.TestCase):
     def test_flip_bool_attribute(self):
@@ -142,6 +151,29 @@ class TestVivaGoal(unittest.TestCase):
         with self.assertRaises(IndexError):
             VivaGoal(['1'], self.headers, 0)
 
+    def test_viva_goal_from_column_map(self):
+        headers = ['Extra'] + list(reversed(self.headers))
+        row = ['x'] + list(reversed(self.row))
+        columns = ColumnMap(headers)
+        goal = VivaGoal(row, columns, 3)
+        self.assertEqual(goal.title, 'Test Goal')
+        self.assertEqual(goal.status, 'On Track')
+        self.assertEqual(goal.row_number, 3)
+        self.assertFalse(hasattr(goal, '__dict__'))
+
+    def test_column_map_missing_column(self):
+        with self.assertRaises(ValueError) as context:
+            ColumnMap(self.headers[:-1])
+        self.assertIn('Status', str(context.exception))
+
+    def test_viva_goal_parses_okr_id_once(self):
+        row = self.row.copy()
+        row[0] = '=HYPERLINK("http://example.com/1", "1")'
+        goal = VivaGoal(row, self.headers, 0)
+        self.assertEqual(goal.okr_link, 'http://example.com/1')
+        self.assertEqual(goal.goal_id, '1')
+        self.assertEqual(create_goal(row, ColumnMap(self.headers), 0)[0], '1')
+
 class TestOKRId(unittest.TestCase):
     def test_valid_okr_id(self):
         okr = OKRId('"http://example.com" "123"')
@@ -248,6 +280,179 @@ class TestSorting(unittest.TestCase):
         actual_order = [goal.title for goal in sorted_goals]
         self.assertEqual(actual_order, expected_order)
 
+class TestGoalGraph(unittest.TestCase):
+    def setUp(self):
+        self.headers = ['Id', 'Title', 'Tag', 'Owner', 'Period', 'Start Date', 'End Date',
+                        'Description', 'Aligned To (weight, Objective ID)', 'Metric Name',
+                        'Target', 'Object Type', 'Status']
+        self.original_goals_dict = Make_Biz_Plan.goals_dict
+
+    def tearDown(self):
+        Make_Biz_Plan.goals_dict = self.original_goals_dict
+
+    def make_goals(self, specs):
+        """Build goals from (id, tag, object_type, parent ids) tuples, in row order."""
+        goals, goals_by_id = [], {}
+        for idx, (goal_id, tag, object_type, parent_ids) in enumerate(specs):
+            alignment = ''.join(f'(weight: 100%, Id: {parent_id})' for parent_id in parent_ids)
+            row = [f'"http://example.com/{goal_id}" "{goal_id}"', f'Goal {goal_id}', tag, 'Owner', 'Q1', '', '',
+                   'Description', alignment, 'Metric', 'Target', object_type, 'On Track']
+            goal = VivaGoal(row, self.headers, idx)
+            goals.append(goal)
+            goals_by_id[goal.goal_id] = goal
+        return goals, goals_by_id
+
+    def random_specs(self, rng, count):
+        """Random valid hierarchy: themes, objectives, outcomes and actions aligned to earlier ids, shuffled."""
+        specs = []
+        for goal_id in range(1, count + 1):
+            earlier = [spec for spec in specs]
+            themes = [spec[0] for spec in earlier if spec[1] == 'Theme']
+            choice = rng.random()
+            if not earlier or choice < 0.1:
+                specs.append((str(goal_id), 'Theme', 'Objective', []))
+            elif choice < 0.35:
+                parents = rng.sample([spec[0] for spec in earlier], min(len(earlier), rng.randint(0, 2)))
+                specs.append((str(goal_id), '', 'Objective', parents))
+            elif choice < 0.65:
+                parents = [rng.choice(earlier)[0]]
+                if themes and rng.random() < 0.3:
+                    parents.append(rng.choice(themes))
+                specs.append((str(goal_id), '', 'Outcome', parents))
+            else:
+                specs.append((str(goal_id), '', 'Action', [rng.choice(earlier)[0]]))
+        rng.shuffle(specs)
+        return specs
+
+    def test_conversion_context_does_not_use_goals_dict(self):
+        rng = random.Random(11)
+        goals, goals_by_id = self.make_goals(self.random_specs(rng, 40))
+        Make_Biz_Plan.goals_dict = {}
+        expected = GoalGraph(goals, goals_by_id).ordered()
+        context = Make_Biz_Plan.ConversionContext(goals)
+        self.assertEqual(context.ordered_goals, expected)
+        for goal in goals:
+            self.assertEqual(goal_sort_key(goal, context), context.sort_key(goal))
+            self.assertIs(get_goal_by_id(goal.goal_id, context), goal)
+            self.assertEqual(get_parent_goals_from_alignment(goal, context), context.parents_of(goal))
+        self.assertEqual(Make_Biz_Plan.goals_dict, {})
+
+    def test_ordered_matches_goal_sort_key(self):
+        rng = random.Random(7)
+        for _ in range(50):
+            goals, goals_by_id = self.make_goals(self.random_specs(rng, rng.randint(1, 60)))
+            Make_Biz_Plan.goals_dict = goals_by_id
+            expected = [goal.goal_id for goal in sorted(goals, key=goal_sort_key)]
+            graph = GoalGraph(goals, goals_by_id)
+            self.assertEqual([goal.goal_id for goal in graph.ordered()], expected)
+            for goal in goals:
+                self.assertEqual(graph.sort_key(goal), goal_sort_key(goal))
+
+    def test_ordered_matches_fixture_order(self):
+        fixture = TestVivaGoal()
+        fixture.setUp()
+        goals, goals_by_id = [], {}
+        for idx, row in enumerate(fixture.rows):
+            goal = VivaGoal(row, fixture.headers, idx)
+            goals.append(goal)
+            goals_by_id[row[0]] = goal
+        titles = [goal.title for goal in GoalGraph(goals, goals_by_id).ordered()]
+        self.assertEqual(titles[:4], ['Theme 1', 'Outcome 1', 'Objective 1', 'Action 1'])
+        self.assertEqual(titles[-5:], ['Theme 3', 'Outcome 3A', 'Objective 3A', 'Outcome 3B', 'Action 3A'])
+
+    def test_children_and_parents(self):
+        goals, goals_by_id = self.make_goals([('1', 'Theme', 'Objective', []), ('2', '', 'Objective', ['1']),
+                                              ('3', '', 'Action', ['2']), ('4', '', 'Outcome', ['2'])])
+        graph = GoalGraph(goals, goals_by_id)
+        self.assertEqual([goal.goal_id for goal in graph.children_of(goals[1])], ['3', '4'])
+        self.assertEqual(graph.parents_of(goals[2]), [goals[1]])
+        self.assertEqual(graph.children_of(goals[3]), [])
+
+    def test_alignments_parsed_once(self):
+        goals, goals_by_id = self.make_goals([('1', 'Theme', 'Objective', []), ('2', '', 'Objective', ['1']),
+                                              ('3', '', 'Outcome', ['2']), ('4', '', 'Action', ['3'])])
+        with patch('Make_Biz_Plan.ALIGNMENT_PATTERN', wraps=Make_Biz_Plan.ALIGNMENT_PATTERN) as pattern:
+            GoalGraph(goals, goals_by_id).ordered()
+        self.assertEqual(pattern.findall.call_count, len(goals))
+
+    def test_ordered_errors(self):
+        for specs in ([('1', '', 'Action', [])],
+                      [('1', 'Theme', 'Objective', []), ('2', '', 'Objective', []), ('3', '', 'Action', ['1', '2'])],
+                      [('1', '', 'Objective', []), ('2', '', 'Objective', []), ('3', '', 'Outcome', ['1', '2'])],
+                      [('1', '', 'Outcome', [])],
+                      [('1', '', 'Goal', [])]):
+            goals, goals_by_id = self.make_goals(specs)
+            with self.assertRaises(ValueError):
+                GoalGraph(goals, goals_by_id).ordered()
+
+class TestDeepAlignmentChains(unittest.TestCase):
+    DEPTH = 12000
+
+    def setUp(self):
+        self.graph_test = TestGoalGraph()
+        self.graph_test.setUp()
+        self.original_goals_dict = Make_Biz_Plan.goals_dict
+
+    def tearDown(self):
+        Make_Biz_Plan.goals_dict = self.original_goals_dict
+
+    def chain_specs(self, depth):
+        """Theme -> Objective -> Outcome -> Outcome -> ... -> Action, in reverse row order."""
+        specs = [('1', 'Theme', 'Objective', []), ('2', '', 'Objective', ['1'])]
+        for level in range(depth):
+            specs.append((str(level + 3), '', 'Outcome', [str(level + 2)]))
+        specs.append((str(depth + 3), '', 'Action', [str(depth + 2)]))
+        return list(reversed(specs))
+
+    def test_deep_chain_orders_without_recursion(self):
+        goals, goals_by_id = self.graph_test.make_goals(self.chain_specs(self.DEPTH))
+        ordered = GoalGraph(goals, goals_by_id).ordered()
+        self.assertEqual(len(ordered), len(goals))
+        self.assertEqual([goal.goal_id for goal in ordered[:2]], ['1', '2'])
+        # Outcomes under the objective are shown by row, then the action
+        self.assertEqual(ordered[2].goal_id, str(self.DEPTH + 2))
+        self.assertEqual(ordered[-1].goal_id, str(self.DEPTH + 3))
+
+    def test_deep_chain_goal_sort_key(self):
+        goals, goals_by_id = self.graph_test.make_goals(self.chain_specs(self.DEPTH))
+        Make_Biz_Plan.goals_dict = goals_by_id
+        deepest = goals[0]
+        self.assertEqual(goal_sort_key(deepest), GoalGraph(goals, goals_by_id).sort_key(deepest))
+
+    def test_deep_chain_memoizes_ancestors(self):
+        goals, goals_by_id = self.graph_test.make_goals(self.chain_specs(self.DEPTH))
+        graph = GoalGraph(goals, goals_by_id)
+        with patch.object(graph, 'parents_of', wraps=graph.parents_of) as parents_of:
+            graph.ordered()
+        self.assertEqual(parents_of.call_count, len(goals))
+
+    def test_cycle_names_goal_ids(self):
+        goals, goals_by_id = self.graph_test.make_goals([('1', 'Theme', 'Objective', []),
+                                                         ('2', '', 'Outcome', ['3']),
+                                                         ('3', '', 'Action', ['2'])])
+        with self.assertRaises(ValueError) as context:
+            GoalGraph(goals, goals_by_id).ordered()
+        self.assertIn('cycle', str(context.exception))
+        self.assertIn('2 -> 3 -> 2', str(context.exception))
+
+    def test_cycle_in_deep_chain(self):
+        specs = self.chain_specs(self.DEPTH)
+        # Point the first outcome back at the deepest one
+        specs[-3] = ('3', '', 'Outcome', [str(self.DEPTH + 2)])
+        goals, goals_by_id = self.graph_test.make_goals(specs)
+        Make_Biz_Plan.goals_dict = goals_by_id
+        with self.assertRaises(ValueError) as context:
+            GoalGraph(goals, goals_by_id).ordered()
+        self.assertIn('cycle', str(context.exception))
+        with self.assertRaises(ValueError):
+            goal_sort_key(goals[0])
+
+    def test_self_alignment_is_a_cycle(self):
+        goals, goals_by_id = self.graph_test.make_goals([('1', '', 'Action', ['1'])])
+        with self.assertRaises(ValueError) as context:
+            GoalGraph(goals, goals_by_id).sort_key(goals[0])
+        self.assertIn('1 -> 1', str(context.exception))
+
 class TestExceptionHandling(unittest.TestCase):
     def setUp(self):
         # Initialize test data
@@ -352,6 +557,854 @@ class TestVivaGoalValidation(unittest.TestCase):
         self.assertEqual(goal.start_date, 'not a date')
         self.assertEqual(goal.end_date, 'also not a date')
 
+class TestStreamingIngestion(unittest.TestCase):
+    def setUp(self):
+        self.headers = ['Id', 'Title', 'Tag', 'Owner', 'Period', 'Start Date', 'End Date',
+                        'Description', 'Aligned To (weight, Objective ID)', 'Metric Name',
+                        'Target', 'Object Type', 'Status']
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.workbook_path = os.path.join(self.temp_dir.name, 'goals.xlsx')
+        wb = Workbook()
+        ws = wb.active
+        ws.append(self.headers)
+        ws.append(['=HYPERLINK("http://example.com/1", "1")', 'Theme 1', 'Theme', 'John', 'Q1', '2024-01-01',
+                   '2024-03-31', 'Theme Description', '', 'Metric1', '100%', 'Objective', 'On Track'])
+        ws.append(['=HYPERLINK("http://example.com/2", "2")', 'Objective 1', '', 'Jane', 'Q1', '2024-01-01',
+                   '2024-03-31', 'Objective Description', '(weight: 100%, Id: 1)', 'Metric2', '50%', 'Objective', 'At Risk'])
+        ws.append(['=HYPERLINK("http://example.com/3", "3")', 'Action 1', '', 'Bob', 'Q1', '2024-01-01',
+                   '2024-03-31', 'Action Description', '(weight: 100%, Id: 2)', 'Metric3', '75%', 'Action', 'On Track'])
+        wb.save(self.workbook_path)
+
+        self.original_goals_dict = Make_Biz_Plan.goals_dict
+
+    def tearDown(self):
+        Make_Biz_Plan.goals_dict = self.original_goals_dict
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def goal_values(goals):
+        return [(goal.okr_id, goal.title, goal.alignment, goal.object_type, goal.row_number) for goal in goals]
+
+    def test_streaming_matches_full_load(self):
+        full_goals, full_dict = load_goals_from_workbook(self.workbook_path, read_only=False)
+        full_values = self.goal_values(full_goals)
+        full_ids = list(full_dict)
+        streamed_goals, streamed_dict = load_goals_from_workbook(self.workbook_path, read_only=True)
+        self.assertEqual(self.goal_values(streamed_goals), full_values)
+        self.assertEqual(list(streamed_dict), full_ids)
+        self.assertEqual(full_ids, ['1', '2', '3'])
+
+    def test_iter_goals_is_lazy(self):
+        goals = iter_goals_from_workbook(self.workbook_path, read_only=True)
+        first = next(goals)
+        self.assertEqual(first.title, 'Theme 1')
+        self.assertEqual(first.row_number, 0)
+        self.assertEqual([goal.row_number for goal in goals], [1, 2])
+
+    def test_large_workbooks_stream_by_default(self):
+        with patch('Make_Biz_Plan.LARGE_WORKBOOK_BYTES', 0), patch('Make_Biz_Plan.load_workbook') as mock_load:
+            Make_Biz_Plan.get_workbook(self.workbook_path)
+        mock_load.assert_called_once_with(self.workbook_path, read_only=True)
+
+    def test_cached_goals_skip_parsing(self):
+        from biz_plan_cache import DiskCache
+        cache = DiskCache(os.path.join(self.temp_dir.name, 'cache'))
+        goals, _ = Make_Biz_Plan.load_ordered_goals(self.workbook_path, cache=cache)
+        expected = self.goal_values(goals)
+        with patch('Make_Biz_Plan.load_goals_from_workbook', side_effect=AssertionError('workbook parsed')):
+            cached_goals, cached_dict = Make_Biz_Plan.load_ordered_goals(self.workbook_path, cache=cache)
+        self.assertEqual(self.goal_values(cached_goals), expected)
+        self.assertEqual([goal.goal_id for goal in cached_goals], ['1', '2', '3'])
+        self.assertIs(cached_dict['2'], cached_goals[1])
+        self.assertIs(Make_Biz_Plan.goals_dict, cached_dict)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_cached_goals_keep_their_resolved_alignments(self):
+        from biz_plan_cache import DiskCache
+        cache = DiskCache(os.path.join(self.temp_dir.name, 'cache'))
+        parsed = Make_Biz_Plan.load_conversion_context(self.workbook_path, cache=cache)
+        with Make_Biz_Plan.count_operations() as counts:
+            context = Make_Biz_Plan.load_conversion_context(self.workbook_path, cache=cache)
+            goals = context.ordered_goals
+            keys = [context.sort_key(goal) for goal in goals]
+            children = [[child.goal_id for child in context.children_of(goal)] for goal in goals]
+        self.assertEqual(counts[Make_Biz_Plan.REGEX_EVALUATIONS], 0)
+        self.assertEqual(counts[Make_Biz_Plan.GOAL_LOOKUPS], 0)
+        self.assertEqual(keys, [parsed.sort_key(goal) for goal in parsed.ordered_goals])
+        self.assertEqual(children, [[child.goal_id for child in parsed.children_of(goal)] for goal in parsed.ordered_goals])
+        self.assertIs(context.parents_of(goals[1])[0], goals[0])
+
+    def test_cached_goals_report_row_errors_again(self):
+        from openpyxl import load_workbook
+        from biz_plan_cache import DiskCache
+        wb = load_workbook(self.workbook_path)
+        wb.active.append([12345, 'Broken', '', 'Bob', 'Q1', '2024-01-01', '2024-03-31', 'Broken Description',
+                          '(weight: 100%, Id: 2)', 'Metric4', '10%', 'Action', 'On Track'])
+        wb.save(self.workbook_path)
+        cache = DiskCache(os.path.join(self.temp_dir.name, 'cache'))
+        for _ in range(2):
+            with patch('builtins.print') as mock_print:
+                context = Make_Biz_Plan.load_conversion_context(self.workbook_path, cache=cache)
+            self.assertEqual(len(context.ordered_goals), 3)
+            self.assertEqual(mock_print.call_count, 1)
+            self.assertTrue(mock_print.call_args.args[0].startswith('Error processing row 5: '))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        errors = []
+        Make_Biz_Plan.load_conversion_context(self.workbook_path, cache=cache, errors=errors)
+        self.assertEqual(len(errors), 1)
+
+    def test_changed_workbook_misses_cache(self):
+        from biz_plan_cache import DiskCache
+        cache = DiskCache(os.path.join(self.temp_dir.name, 'cache'))
+        Make_Biz_Plan.load_ordered_goals(self.workbook_path, cache=cache)
+        wb = Workbook()
+        wb.active.append(self.headers)
+        wb.active.append(['=HYPERLINK("http://example.com/9", "9")', 'Theme 9', 'Theme', 'John', 'Q1', '2024-01-01',
+                          '2024-03-31', 'Theme Description', '', 'Metric1', '100%', 'Objective', 'On Track'])
+        wb.save(self.workbook_path)
+        goals, _ = Make_Biz_Plan.load_ordered_goals(self.workbook_path, cache=cache)
+        self.assertEqual([goal.title for goal in goals], ['Theme 9'])
+        self.assertEqual(cache.misses, 2)
+        with patch('Make_Biz_Plan.PARSER_VERSION', Make_Biz_Plan.PARSER_VERSION + 1):
+            Make_Biz_Plan.load_ordered_goals(self.workbook_path, cache=cache)
+        self.assertEqual(cache.misses, 3)
+
+    def test_small_workbooks_load_fully_by_default(self):
+        with patch('Make_Biz_Plan.load_workbook') as mock_load:
+            Make_Biz_Plan.get_workbook(self.workbook_path)
+        mock_load.assert_called_once_with(self.workbook_path)
+
+
+class TestTextBlock(unittest.TestCase):
+    @staticmethod
+    def new_text_frame():
+        from pptx.oxml.text import CT_TextBody
+        from pptx.text.text import TextFrame
+        return TextFrame(CT_TextBody.new_a_txBody(), None)
+
+    @staticmethod
+    def xml(text_frame):
+        from lxml import etree
+        return etree.tostring(text_frame._txBody)
+
+    def test_json_block_matches_imperative_calls(self):
+        expected = self.new_text_frame()
+        p = Make_Biz_Plan.add_paragraph_with_text(expected, "Owner: ", True, 18, 1)
+        p.font.fill.solid()
+        p.font.fill.fore_color.rgb = Make_Biz_Plan.RGBColor(1, 2, 3)
+        run = Make_Biz_Plan.add_run_with_text(p, "Jane", False, 12)
+        run.font.fill.solid()
+        run.font.fill.fore_color.rgb = Make_Biz_Plan.RGBColor(4, 5, 6)
+        Make_Biz_Plan.add_paragraph_with_text(expected, "Status")
+
+        text_frame = self.new_text_frame()
+        add_text_block_to_slide(text_frame, json.dumps({"elements": [
+            {"text": "Owner: ", "bold": True, "font_size": 18, "level": 1, "font_color": [1, 2, 3]},
+            {"field": "owner", "font_size": 12, "is_run": True, "font_color": [4, 5, 6]},
+            {"text": "Status"},
+        ]}), {"owner": "Jane"})
+        self.assertEqual(self.xml(text_frame), self.xml(expected))
+
+    def test_block_is_reused_with_new_values(self):
+        block = TextBlock([{"text": "Owner: ", "bold": True}, {"field": "owner", "is_run": True}])
+        self.assertEqual(block.fields, ("owner",))
+        first, second = self.new_text_frame(), self.new_text_frame()
+        block.add_to(first, {"owner": "Jane"})
+        block.add_to(second, {"owner": "Bob"})
+        self.assertEqual(first.text, "\nOwner: Jane")
+        self.assertEqual(second.text, "\nOwner: Bob")
+
+    def test_invalid_blocks(self):
+        with self.assertRaises(ValueError):
+            TextBlock([{"text": "run", "is_run": True}])
+        with self.assertRaises(ValueError):
+            TextBlock([{"text": "both", "field": "owner"}])
+        with self.assertRaises(ValueError):
+            TextBlock([{"bold": True}])
+        with self.assertRaises(ValueError):
+            TextBlock([{"text": "color", "font_color": [1, 2]}])
+
+    def test_missing_field_value(self):
+        block = TextBlock([{"field": "owner"}])
+        with self.assertRaises(ValueError):
+            block.add_to(self.new_text_frame(), {})
+
+
+class TestSlideRendering(unittest.TestCase):
+    def setUp(self):
+        from pptx import Presentation
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.template_path = os.path.join(self.temp_dir.name, 'template.pptx')
+        Presentation().save(self.template_path)
+        self.workbook_path = os.path.join(self.temp_dir.name, 'goals.xlsx')
+        self.rows = [
+            ('1', 'Theme 1', 'Theme', '', 'Objective'),
+            ('2', 'Outcome 1', '', 'Theme 1 (weight: 100%, Id: 1)', 'Outcome'),
+            ('3', 'Objective 1', '', 'Theme 1 (weight: 100%, Id: 1)', 'Objective'),
+            ('4', 'Objective 2', '', 'Theme 1 (weight: 50%, Id: 1) / MWB: Grow (weight: 50%, Id: 9)', 'Objective'),
+            ('5', 'Action 1', '', 'Objective 1 (weight: 100%, Id: 3)', 'Action'),
+            ('6', 'Outcome 2', '', 'Objective 2 (weight: 100%, Id: 4)', 'Outcome'),
+            ('7', 'Action 2', '', 'Objective 2 (weight: 100%, Id: 4)', 'Action'),
+            ('8', 'Theme 2', 'Theme', '', 'Objective'),
+            ('9', 'Objective 3', '', 'MWB: Grow (weight: 100%, Id: 8)', 'Objective'),
+        ]
+        self.write_workbook(self.rows)
+        self.original_goals_dict = Make_Biz_Plan.goals_dict
+
+    def write_workbook(self, rows, owners=None):
+        headers = ['Id', 'Title', 'Tag', 'Owner', 'Period', 'Start Date', 'End Date',
+                   'Description', 'Aligned To (weight, Objective ID)', 'Metric Name',
+                   'Target', 'Object Type', 'Status']
+        owners = owners or {}
+        wb = Workbook()
+        ws = wb.active
+        ws.append(headers)
+        for goal_id, title, tag, alignment, object_type in rows:
+            link = '' if goal_id == '7' else f'http://example.com/{goal_id}'
+            okr_id = f'=HYPERLINK("{link}", "{goal_id}")'
+            ws.append([okr_id, title, tag, owners.get(goal_id, f'Owner {goal_id}'), 'Q1', '2024-01-01', '2024-03-31',
+                       f'Description {goal_id}\nsecond line', alignment, f'Metric {goal_id}', f'{goal_id}0%',
+                       object_type, 'On Track'])
+        wb.save(self.workbook_path)
+
+    def tearDown(self):
+        Make_Biz_Plan.goals_dict = self.original_goals_dict
+        self.temp_dir.cleanup()
+
+    def render(self, render_engine, workers=1):
+        from pptx import Presentation
+        output_path = os.path.join(self.temp_dir.name, f'{render_engine}-{workers}.pptx')
+        Make_Biz_Plan.main(self.workbook_path, self.template_path, output_path, 0, 0, 0, 1,
+                           render_engine=render_engine, workers=workers)
+        return Presentation(output_path)
+
+    @staticmethod
+    def slide_contents(prs, images_by_content=False):
+        from lxml import etree
+
+        def target(rel):
+            if rel.is_external:
+                return rel.target_ref
+            if images_by_content and rel.reltype.endswith('/image'):
+                return rel.target_part.sha1
+            return rel.target_part.partname
+
+        contents = []
+        for slide in prs.slides:
+            rels = sorted((rel.rId, rel.reltype, target(rel)) for rel in slide.part.rels.values())
+            contents.append((str(slide.part.partname), etree.tostring(slide.part._element), rels))
+        return contents
+
+    def test_prototype_slides_match_shapes_slides(self):
+        expected = self.slide_contents(self.render(Make_Biz_Plan.SHAPES_ENGINE))
+        self.assertEqual(len(expected), 9)
+        self.assertEqual(self.slide_contents(self.render(Make_Biz_Plan.PROTOTYPE_ENGINE)), expected)
+
+    def test_prototypes_are_not_saved(self):
+        prs = self.render(Make_Biz_Plan.PROTOTYPE_ENGINE)
+        partnames = [str(part.partname) for part in prs.part.package.iter_parts() if 'slides/slide' in str(part.partname)]
+        self.assertEqual(sorted(partnames), [f'/ppt/slides/slide{i}.xml' for i in range(1, 10)])
+        self.assertEqual(len({slide.slide_id for slide in prs.slides}), 9)
+
+    def test_icons_are_read_once_per_run(self):
+        from pptx.parts.image import Image
+        for render_engine in Make_Biz_Plan.RENDER_ENGINES:
+            with patch('pptx.parts.image.Image.from_file', side_effect=Image.from_file) as mock_from_file:
+                prs = self.render(render_engine)
+            self.assertEqual(sorted(call.args[0] for call in mock_from_file.call_args_list),
+                             sorted([Make_Biz_Plan.OBJECTIVE_IMAGE, Make_Biz_Plan.OUTCOME_IMAGE, Make_Biz_Plan.INITIATIVE_IMAGE]))
+            image_parts = {rel.target_part.partname for slide in prs.slides for rel in slide.part.rels.values()
+                           if rel.reltype.endswith('/image')}
+            self.assertEqual(len(image_parts), 3)
+
+    def test_workers_match_serial_run(self):
+        for render_engine in Make_Biz_Plan.RENDER_ENGINES:
+            expected = self.slide_contents(self.render(render_engine))
+            prs = self.render(render_engine, workers=4)
+            self.assertEqual(self.slide_contents(prs), expected)
+            self.assertEqual([slide.slide_id for slide in prs.slides], list(range(256, 265)))
+            image_parts = [part for part in prs.part.package.iter_parts() if part.partname.startswith('/ppt/media/')]
+            self.assertEqual(len(image_parts), 3)
+
+    def test_workers_bound_shards_in_flight(self):
+        from concurrent.futures import ProcessPoolExecutor
+        events = []
+        submit, merge = ProcessPoolExecutor.submit, Make_Biz_Plan.SlideMerger.merge
+
+        def counting_submit(executor, *args, **kwargs):
+            events.append(1)
+            return submit(executor, *args, **kwargs)
+
+        def counting_merge(merger, exported):
+            events.append(-1)
+            return merge(merger, exported)
+
+        expected = self.slide_contents(self.render(Make_Biz_Plan.SHAPES_ENGINE))
+        with patch('Make_Biz_Plan.WORKER_SHARD_GOALS', 1), \
+                patch.object(ProcessPoolExecutor, 'submit', counting_submit), \
+                patch.object(Make_Biz_Plan.SlideMerger, 'merge', counting_merge):
+            prs = self.render(Make_Biz_Plan.SHAPES_ENGINE, workers=2)
+        self.assertEqual(self.slide_contents(prs), expected)
+        self.assertEqual((events.count(1), events.count(-1)), (9, 9))
+        in_flight = [sum(events[:end]) for end in range(1, len(events) + 1)]
+        self.assertEqual(max(in_flight), 2 * Make_Biz_Plan.SHARDS_IN_FLIGHT_PER_WORKER)
+
+    def render_counting(self, output_path, **options):
+        rendered = []
+        make_renderer = Make_Biz_Plan.make_renderer
+
+        def counting_renderer(*args):
+            renderer = make_renderer(*args)
+            render = renderer.render
+            renderer.render = lambda goal: rendered.append(goal.title) or render(goal)
+            return renderer
+
+        with patch('Make_Biz_Plan.make_renderer', side_effect=counting_renderer), patch('builtins.print'):
+            Make_Biz_Plan.main(self.workbook_path, self.template_path, output_path, 0, 0, 0, 1, **options)
+        return rendered
+
+    def render_incrementally(self, output_path, render_engine=Make_Biz_Plan.SHAPES_ENGINE, stream=False):
+        return self.render_counting(output_path, render_engine=render_engine, stream=stream, incremental=True)
+
+    def test_incremental_run_renders_only_changed_goals(self):
+        from pptx import Presentation
+        for render_engine in Make_Biz_Plan.RENDER_ENGINES:
+            for stream in (False, True):
+                self.write_workbook(self.rows)
+                output_path = os.path.join(self.temp_dir.name, f'incremental-{render_engine}-{stream}.pptx')
+                self.assertEqual(len(self.render_incrementally(output_path, render_engine, stream)), 9)
+                self.assertTrue(os.path.exists(output_path + Make_Biz_Plan.MANIFEST_SUFFIX))
+
+                # Change one goal, drop one and move another to a different theme
+                rows = [row for row in self.rows if row[0] != '6']
+                rows[-1] = ('9', 'Objective 3', '', 'MWB: Grow (weight: 100%, Id: 1)', 'Objective')
+                self.write_workbook(rows, owners={'5': 'New owner'})
+                self.assertEqual(self.render_incrementally(output_path, render_engine, stream), ['Action 1'])
+
+                # Copied slides can reach an icon first, so image partnames may be numbered differently
+                expected = self.slide_contents(self.render(render_engine), images_by_content=True)
+                self.assertEqual(self.slide_contents(Presentation(output_path), images_by_content=True), expected)
+                self.assertEqual(self.render_incrementally(output_path, render_engine, stream), [])
+
+    def test_incremental_run_returns_its_counts(self):
+        output_path = os.path.join(self.temp_dir.name, 'incremental-counts.pptx')
+        with patch('builtins.print') as mock_print:
+            first = Make_Biz_Plan.main(self.workbook_path, self.template_path, output_path, 0, 0, 0, 1, incremental=True)
+            self.write_workbook(self.rows, owners={'5': 'New owner'})
+            second = Make_Biz_Plan.main(self.workbook_path, self.template_path, output_path, 0, 0, 0, 1, incremental=True)
+        mock_print.assert_not_called()
+        self.assertEqual((first['rendered'], first['copied']), (9, 0))
+        self.assertEqual((second['rendered'], second['copied']), (1, 8))
+
+    def test_incremental_run_rerenders_after_template_change(self):
+        from pptx import Presentation
+        output_path = os.path.join(self.temp_dir.name, 'incremental.pptx')
+        self.render_incrementally(output_path)
+        template = Presentation(self.template_path)
+        template.core_properties.title = 'Changed'
+        template.save(self.template_path)
+        self.assertEqual(len(self.render_incrementally(output_path)), 9)
+
+        with open(output_path, 'ab') as f:
+            f.write(b'edited')
+        self.assertEqual(len(self.render_incrementally(output_path)), 9)
+
+    def test_slide_cache_skips_rendering_cached_goals(self):
+        from pptx import Presentation
+        cache_dir = os.path.join(self.temp_dir.name, 'cache')
+        for render_engine in Make_Biz_Plan.RENDER_ENGINES:
+            expected = self.slide_contents(self.render(render_engine))
+            for stream in (False, True):
+                output_path = os.path.join(self.temp_dir.name, f'cached-{render_engine}-{stream}.pptx')
+                self.render_counting(output_path, render_engine=render_engine, stream=stream, cache_dir=cache_dir,
+                                     cache_slides=True)
+                self.assertEqual(self.render_counting(output_path, render_engine=render_engine, stream=stream,
+                                                      cache_dir=cache_dir, cache_slides=True), [])
+                self.assertEqual(self.slide_contents(Presentation(output_path)), expected)
+
+        # A changed goal misses; goals with the same fields hit whatever deck they are in
+        self.write_workbook(self.rows, owners={'5': 'New owner'})
+        output_path = os.path.join(self.temp_dir.name, 'changed.pptx')
+        self.assertEqual(self.render_counting(output_path, cache_dir=cache_dir, cache_slides=True), ['Action 1'])
+        self.assertEqual(self.slide_contents(Presentation(output_path)),
+                         self.slide_contents(self.render(Make_Biz_Plan.SHAPES_ENGINE)))
+
+    def test_slide_cache_is_opt_in(self):
+        cache_dir = os.path.join(self.temp_dir.name, 'goals-only')
+        output_path = os.path.join(self.temp_dir.name, 'goals-only.pptx')
+        with patch('builtins.print') as mock_print:
+            result = Make_Biz_Plan.main(self.workbook_path, self.template_path, output_path, 0, 0, 0, 1,
+                                        cache_dir=cache_dir)
+        mock_print.assert_not_called()
+        self.assertEqual(result, {'slides': 9, 'rendered': 9, 'copied': 0, 'theme_decks': [], 'slide_cache_hits': 0,
+                                  'slide_cache_misses': 0, 'slide_cache_skipped': 0})
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+        result = Make_Biz_Plan.main(self.workbook_path, self.template_path, output_path, 0, 0, 0, 1,
+                                    cache_dir=cache_dir, cache_slides=True)
+        self.assertEqual((result['slide_cache_hits'], result['slide_cache_misses']), (0, 9))
+        result = Make_Biz_Plan.main(self.workbook_path, self.template_path, output_path, 0, 0, 0, 1,
+                                    cache_dir=cache_dir, cache_slides=True)
+        self.assertEqual((result['slide_cache_hits'], result['slide_cache_misses']), (9, 0))
+
+    def test_slide_cache_counts_hits_and_misses(self):
+        from pptx import Presentation
+        from biz_plan_cache import DiskCache
+        goals, _ = Make_Biz_Plan.load_ordered_goals(self.workbook_path)
+        settings = Make_Biz_Plan.render_settings(self.template_path, (0, 0), (0, 1))
+        slide_cache = Make_Biz_Plan.SlideCache(DiskCache(os.path.join(self.temp_dir.name, 'cache')), settings)
+        for _ in range(2):
+            Make_Biz_Plan.render_goals(Presentation(self.template_path), goals, self.template_path, (0, 0), (0, 1),
+                                       slide_cache=slide_cache)
+        self.assertEqual((slide_cache.hits, slide_cache.misses), (9, 9))
+
+        # Slides of another template are not shared, and a slide whose image was evicted is a miss
+        other = Make_Biz_Plan.SlideCache(slide_cache.cache, dict(settings, template='other'))
+        self.assertIsNone(other.get(goals[0]))
+        with open(Make_Biz_Plan.OBJECTIVE_IMAGE, 'rb') as f:
+            os.remove(slide_cache.cache._path(f"image:{hashlib.sha1(f.read()).hexdigest()}"))
+        slide_cache = Make_Biz_Plan.SlideCache(slide_cache.cache, settings)
+        objective = next(goal for goal in goals if goal.object_type == 'Objective' and goal.tag != 'Theme')
+        self.assertIsNone(slide_cache.get(objective))
+        self.assertIsNotNone(slide_cache.get(next(goal for goal in goals if goal.object_type == 'Action')))
+        self.assertEqual((slide_cache.hits, slide_cache.misses), (1, 1))
+
+    def test_slide_cache_stops_storing_at_half_its_size_limit(self):
+        from pptx import Presentation
+        from biz_plan_cache import DiskCache
+        goals, _ = Make_Biz_Plan.load_ordered_goals(self.workbook_path)
+        settings = Make_Biz_Plan.render_settings(self.template_path, (0, 0), (0, 1))
+        cache = DiskCache(os.path.join(self.temp_dir.name, 'small-cache'), 40 * 1024)
+        slide_cache = Make_Biz_Plan.SlideCache(cache, settings)
+        Make_Biz_Plan.render_goals(Presentation(self.template_path), goals, self.template_path, (0, 0), (0, 1),
+                                   slide_cache=slide_cache)
+        self.assertGreater(slide_cache.skipped, 0)
+        self.assertLess(slide_cache.stored_bytes, cache.max_bytes)
+        # The slides stored first are not evicted by the ones after them
+        self.assertIsNotNone(Make_Biz_Plan.SlideCache(cache, settings).get(goals[0]))
+        shared = slide_cache.share(4)
+        self.assertEqual((shared.budget_bytes, shared.stored_bytes, shared.prefix), (0, 0, slide_cache.prefix))
+
+    def test_conversions_run_in_parallel_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from pptx import Presentation
+        workbooks = []
+        for index, rows in enumerate((self.rows, self.rows[7:] + self.rows[:7], self.rows[:4])):
+            self.workbook_path = os.path.join(self.temp_dir.name, f'goals{index}.xlsx')
+            self.write_workbook(rows)
+            workbooks.append(self.workbook_path)
+
+        def convert(job):
+            index, workbook_path = job
+            output_path = os.path.join(self.temp_dir.name, f'parallel{index}.pptx')
+            Make_Biz_Plan.main(workbook_path, self.template_path, output_path, 0, 0, 0, 1)
+            return [slide.shapes.title.text for slide in Presentation(output_path).slides]
+
+        expected = [[goal.title for goal in Make_Biz_Plan.load_conversion_context(path).ordered_goals]
+                    for path in workbooks]
+        Make_Biz_Plan.goals_dict = {}
+        jobs = list(enumerate(workbooks * 4))
+        with ThreadPoolExecutor(4) as executor:
+            self.assertEqual(list(executor.map(convert, jobs)), [expected[index % 3] for index, _ in jobs])
+        self.assertEqual(Make_Biz_Plan.goals_dict, {})
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            Make_Biz_Plan.main(self.workbook_path, self.template_path, os.path.join(self.temp_dir.name, 'out.pptx'), workers=0)
+
+    def test_invalid_render_engine(self):
+        with self.assertRaises(ValueError):
+            Make_Biz_Plan.make_renderer('unknown', MagicMock(), (0, 0), (0, 1))
+
+
+class TestOperationScaling(unittest.TestCase):
+    # Ten times the goals may cost at most about eleven times the work of any hot-path operation
+    SCALE = 10
+    ALLOWED_RATIO = 11
+
+    @classmethod
+    def setUpClass(cls):
+        from bench_make_biz_plan import write_synthetic_template, write_synthetic_workbook
+
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.template_path = write_synthetic_template(os.path.join(cls.temp_dir.name, 'template.pptx'))
+        cls.workbooks = {}
+        for goal_count in (30, 100, 300, 1000):
+            cls.workbooks[goal_count] = write_synthetic_workbook(
+                os.path.join(cls.temp_dir.name, f'goals{goal_count}.xlsx'), goal_count)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def count(self, goal_count, **options):
+        with patch('builtins.print'), Make_Biz_Plan.count_operations() as counts:
+            Make_Biz_Plan.main(self.workbooks[goal_count], self.template_path,
+                               os.path.join(self.temp_dir.name, 'out.pptx'), 0, 0, 0, 1, **options)
+        return counts
+
+    def assert_scales_linearly(self, small_goals, **options):
+        small = self.count(small_goals, **options)
+        large = self.count(small_goals * self.SCALE, **options)
+        for operation in (Make_Biz_Plan.REGEX_EVALUATIONS, Make_Biz_Plan.GOAL_LOOKUPS, Make_Biz_Plan.SHAPES_CREATED):
+            self.assertGreater(small[operation], 0, operation)
+            self.assertLessEqual(large[operation], small[operation] * self.ALLOWED_RATIO, operation)
+        # Files and the slide list are read a fixed number of times, whatever the number of goals
+        self.assertEqual(large[Make_Biz_Plan.FILE_READS], small[Make_Biz_Plan.FILE_READS])
+        self.assertEqual(large[Make_Biz_Plan.SLIDE_LIST_SCANS], small[Make_Biz_Plan.SLIDE_LIST_SCANS])
+        return small, large
+
+    def test_shapes_engine_scales_linearly(self):
+        self.assert_scales_linearly(30)
+
+    def test_prototype_engine_scales_linearly(self):
+        self.assert_scales_linearly(100, render_engine='prototype')
+
+    def test_streamed_prototype_engine_scales_linearly(self):
+        self.assert_scales_linearly(100, render_engine='prototype', stream=True)
+
+    def test_load_and_sort_scale_linearly(self):
+        counts = {}
+        for goal_count in (100, 1000):
+            with Make_Biz_Plan.count_operations() as counts[goal_count]:
+                Make_Biz_Plan.load_conversion_context(self.workbooks[goal_count]).ordered_goals
+        for operation in (Make_Biz_Plan.REGEX_EVALUATIONS, Make_Biz_Plan.GOAL_LOOKUPS):
+            self.assertGreater(counts[100][operation], 0, operation)
+            self.assertLessEqual(counts[1000][operation], counts[100][operation] * self.ALLOWED_RATIO, operation)
+        self.assertEqual(counts[1000][Make_Biz_Plan.FILE_READS], 1)
+
+    def test_nested_counts(self):
+        with Make_Biz_Plan.count_operations() as outer:
+            Make_Biz_Plan.count_operation(Make_Biz_Plan.FILE_READS)
+            with Make_Biz_Plan.count_operations() as inner:
+                Make_Biz_Plan.count_operation(Make_Biz_Plan.FILE_READS, 2)
+            self.assertEqual(inner[Make_Biz_Plan.FILE_READS], 2)
+        self.assertEqual(outer[Make_Biz_Plan.FILE_READS], 3)
+        Make_Biz_Plan.count_operation(Make_Biz_Plan.FILE_READS)
+        self.assertEqual(outer[Make_Biz_Plan.FILE_READS], 3)
+
+
+class TestStartup(unittest.TestCase):
+    # Importing these took about 300 ms of startup; checking that they are not imported does not depend on the
+    # speed of the machine, unlike a time budget
+    HEAVY_MODULES = ('pptx', 'openpyxl', 'lxml')
+
+    def import_times(self, *args):
+        """Run Python with -X importtime and return the cumulative import time of each top-level module."""
+        result = subprocess.run([sys.executable, '-X', 'importtime', *args], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        times = {}
+        for line in result.stderr.splitlines():
+            if line.startswith('import time:') and '|' in line:
+                _, cumulative, name = line.split('|')
+                if cumulative.strip().isdigit():
+                    times[name.strip()] = int(cumulative)
+        return result, times
+
+    def test_import_does_not_load_heavy_libraries(self):
+        _, times = self.import_times('-c', 'import Make_Biz_Plan')
+        self.assertEqual([name for name in self.HEAVY_MODULES if name in times], [])
+        self.assertIn('Make_Biz_Plan', times)
+
+    def test_help_does_not_load_heavy_libraries(self):
+        result, times = self.import_times('Make_Biz_Plan.py', '--help')
+        self.assertEqual(result.returncode, 0)
+        self.assertIn('--source_workbook', result.stdout)
+        self.assertEqual([name for name in self.HEAVY_MODULES if name in times], [])
+
+    def test_lazy_names_resolve_on_first_use(self):
+        from pptx.util import Pt
+
+        self.assertEqual(Make_Biz_Plan.Pt(12), Pt(12))
+        self.assertIs(Make_Biz_Plan.Pt, Pt)
+        Make_Biz_Plan.import_dependencies()
+        self.assertFalse(any(isinstance(value, Make_Biz_Plan.LazyImport) for value in vars(Make_Biz_Plan).values()))
+
+
+class TestSelection(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from bench_make_biz_plan import write_synthetic_template, write_synthetic_workbook
+
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.template_path = write_synthetic_template(os.path.join(cls.temp_dir.name, 'template.pptx'))
+        cls.workbook_path = write_synthetic_workbook(os.path.join(cls.temp_dir.name, 'goals.xlsx'), 80)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def setUp(self):
+        self.context = Make_Biz_Plan.ConversionContext.from_workbook(self.workbook_path)
+        self.themes = [goal for goal in self.context.goals if goal.tag == Make_Biz_Plan.THEME_TAG]
+
+    def ancestors_and_self(self, goal):
+        found = {goal.row_number}
+        for parent in self.context.parents_of(goal):
+            found |= self.ancestors_and_self(parent)
+        return found
+
+    def assert_in_full_order(self, selected):
+        # A selection keeps the order of the full deck
+        expected = [goal for goal in Make_Biz_Plan.ConversionContext(self.context.goals).ordered_goals
+                    if goal in selected]
+        self.assertEqual(selected, expected)
+
+    def test_theme_selects_its_subtree(self):
+        theme = self.themes[1]
+        selected = self.context.select(themes=[f'  {theme.title.upper()} '])
+        self.assertEqual(selected[0], theme)
+        self.assertTrue(all(theme.row_number in self.ancestors_and_self(goal) for goal in selected))
+        self.assertEqual(self.context.select(themes=[theme.goal_id]), selected)
+        self.assert_in_full_order(selected)
+
+    def test_goal_id_selects_descendants_and_ancestors(self):
+        objective = next(goal for goal in self.context.goals if goal.object_type == 'Objective' and not goal.tag)
+        selected = self.context.select(goal_ids=[objective.goal_id])
+        children = self.context.children_of(objective)
+        self.assertTrue(children)
+        self.assertEqual({goal.row_number for goal in selected},
+                         self.ancestors_and_self(objective) | {goal.row_number for goal in children})
+        self.assert_in_full_order(selected)
+
+    def test_owner_selection_adds_ancestors(self):
+        selected = self.context.select(owners=['ana diaz'])
+        owned = [goal for goal in self.context.goals if goal.owner == 'Ana Diaz']
+        self.assertTrue(owned)
+        expected = set()
+        for goal in owned:
+            expected |= self.ancestors_and_self(goal)
+        self.assertEqual({goal.row_number for goal in selected}, expected)
+        self.assertLess(len(selected), len(self.context.goals))
+        self.assert_in_full_order(selected)
+
+    def test_filters_combine(self):
+        theme = self.themes[0]
+        selected = self.context.select(themes=[theme.title], statuses=['On Track', 'At Risk'], periods=['FY25 Q1'])
+        matching = [goal for goal in self.context.goals
+                    if theme.row_number in self.ancestors_and_self(goal)
+                    and goal.status in ('On Track', 'At Risk') and goal.schedule == 'FY25 Q1']
+        self.assertTrue(matching)
+        self.assertTrue(set(matching) <= set(selected))
+        self.assertTrue(all(goal in matching or goal.row_number in set().union(
+            *(self.ancestors_and_self(match) for match in matching)) for goal in selected))
+        self.assertEqual(self.context.select(), self.context.ordered_goals)
+
+    def test_selection_uses_known_order(self):
+        ordered = self.context.ordered_goals
+        with patch.object(self.context.graph, 'ordered', side_effect=AssertionError):
+            selected = self.context.select(statuses=['Behind'])
+        self.assertEqual(selected, [goal for goal in ordered if goal in selected])
+
+    def test_unknown_values(self):
+        with self.assertRaises(ValueError):
+            self.context.select(themes=['No such theme'])
+        with self.assertRaises(ValueError):
+            self.context.select(goal_ids=['999999'])
+        with self.assertRaises(ValueError):
+            self.context.select(owners=['Nobody'])
+
+    def test_main_renders_selection(self):
+        from pptx import Presentation
+
+        theme = self.themes[0]
+        target = os.path.join(self.temp_dir.name, 'selected.pptx')
+        events = []
+        with patch('builtins.print'):
+            Make_Biz_Plan.main(self.workbook_path, self.template_path, target, 0, 0, 0, 1,
+                               progress=lambda stage, done, total: events.append((stage, done)),
+                               select={'themes': [theme.title]})
+        expected = len(self.context.select(themes=[theme.title]))
+        self.assertEqual(len(Presentation(target).slides), expected)
+        self.assertIn((Make_Biz_Plan.SORTED_STAGE, expected), events)
+        self.assertLess(expected, len(self.context.goals))
+
+
+class TestSplitThemes(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from bench_make_biz_plan import write_synthetic_template, write_synthetic_workbook
+
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.template_path = write_synthetic_template(os.path.join(cls.temp_dir.name, 'template.pptx'))
+        cls.workbook_path = write_synthetic_workbook(os.path.join(cls.temp_dir.name, 'goals.xlsx'), 90)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def convert(self, name, **options):
+        target = os.path.join(self.temp_dir.name, name)
+        os.makedirs(target)
+        target = os.path.join(target, 'plan.pptx')
+        with patch('builtins.print') as mock_print:
+            self.result = Make_Biz_Plan.main(self.workbook_path, self.template_path, target, 0, 0, 0, 1, **options)
+        mock_print.assert_not_called()
+        return target
+
+    def titles(self, path):
+        from pptx import Presentation
+
+        return [slide.shapes.title.text for slide in Presentation(path).slides]
+
+    def test_split_goals_by_theme(self):
+        theme1, theme2 = MagicMock(tag='Theme'), MagicMock(tag='Theme')
+        objective1, objective2, orphan = MagicMock(tag=''), MagicMock(tag=''), MagicMock(tag='')
+        keys = {id(theme1): (1,), id(objective1): (1,), id(orphan): (3,), id(theme2): (4,), id(objective2): (4,)}
+        parts = Make_Biz_Plan.split_goals_by_theme([theme1, objective1, orphan, theme2, objective2],
+                                                   lambda goal: keys[id(goal)])
+        self.assertEqual(parts, [(theme1, [theme1, objective1]), (theme2, [theme2, objective2]), (None, [orphan])])
+
+    def test_theme_deck_path(self):
+        theme = MagicMock(title='Grow: Revenue & Reach!', tag='Theme')
+        self.assertEqual(Make_Biz_Plan.theme_deck_path(os.path.join('out', 'plan.pptx'), 3, theme, 12),
+                         os.path.join('out', 'plan-03-grow-revenue-reach.pptx'))
+        self.assertEqual(Make_Biz_Plan.theme_deck_path('plan.pptx', 7, None, 120), 'plan-007-other.pptx')
+
+    def test_decks_follow_slide_order(self):
+        from pptx import Presentation
+
+        target = self.convert('serial', split_themes=True)
+        context = Make_Biz_Plan.ConversionContext.from_workbook(self.workbook_path)
+        themes = [goal for goal in context.ordered_goals if goal.tag == Make_Biz_Plan.THEME_TAG]
+        paths = sorted(os.path.join(os.path.dirname(target), name) for name in os.listdir(os.path.dirname(target))
+                       if name != 'plan.pptx')
+        self.assertEqual(len(paths), len(themes))
+        self.assertEqual(self.result['theme_decks'], paths)
+        titles = []
+        for path in paths:
+            titles.extend(self.titles(path))
+        self.assertEqual(titles, [goal.title for goal in context.ordered_goals])
+
+        index = Presentation(target)
+        self.assertEqual([slide.shapes.title.text for slide in index.slides], [theme.title for theme in themes])
+        links = [slide.shapes.title.text_frame.paragraphs[0].runs[0].hyperlink.address for slide in index.slides]
+        self.assertEqual(links, [os.path.basename(path) for path in paths])
+
+    def test_output_does_not_depend_on_workers(self):
+        serial = os.path.dirname(self.convert('one', split_themes=True))
+        parallel = os.path.dirname(self.convert('three', split_themes=True, workers=3))
+        streamed = os.path.dirname(self.convert('streamed', split_themes=True, workers=2, stream=True,
+                                                render_engine='prototype'))
+        names = sorted(os.listdir(serial))
+        self.assertEqual(sorted(os.listdir(parallel)), names)
+        self.assertEqual(sorted(os.listdir(streamed)), names)
+        for name in names:
+            # Every part of each deck is the same; only the zip timestamps may differ
+            with zipfile.ZipFile(os.path.join(serial, name)) as a, zipfile.ZipFile(os.path.join(parallel, name)) as b:
+                self.assertEqual(a.namelist(), b.namelist(), name)
+                for member in a.namelist():
+                    self.assertEqual(a.read(member), b.read(member), f'{name}: {member}')
+            self.assertEqual(self.titles(os.path.join(streamed, name)), self.titles(os.path.join(serial, name)))
+
+    def test_split_selection_and_progress(self):
+        context = Make_Biz_Plan.ConversionContext.from_workbook(self.workbook_path)
+        theme = next(goal for goal in context.goals if goal.tag == Make_Biz_Plan.THEME_TAG)
+        events = []
+        target = self.convert('selected', split_themes=True, select={'themes': [theme.title]},
+                              progress=lambda stage, done, total: events.append((stage, done, total)))
+        self.assertEqual(self.titles(target), [theme.title])
+        total = len(context.select(themes=[theme.title]))
+        self.assertIn((Make_Biz_Plan.RENDERED_STAGE, total, total), events)
+
+    def test_split_is_not_incremental(self):
+        with self.assertRaises(ValueError):
+            self.convert('incremental', split_themes=True, incremental=True)
+
+
+class TestDryRun(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from bench_make_biz_plan import write_synthetic_template, write_synthetic_workbook
+
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.template_path = write_synthetic_template(os.path.join(cls.temp_dir.name, 'template.pptx'))
+        cls.valid_path = write_synthetic_workbook(os.path.join(cls.temp_dir.name, 'goals.xlsx'), 60)
+        cls.broken_path = os.path.join(cls.temp_dir.name, 'broken.xlsx')
+        wb = Workbook()
+        ws = wb.active
+        ws.append(Make_Biz_Plan.GOAL_COLUMNS)
+        rows = [
+            ('1', 'Theme 1', 'Theme', '', 'Objective'),
+            ('2', 'Objective 2', '', 'Theme 1 (weight: 100%, Id: 1)', 'Objective'),
+            ('3', 'Bad type', '', 'Theme 1 (weight: 100%, Id: 1)', 'Initiative'),
+            ('4', 'Lost action', '', 'Gone (weight: 100%, Id: 99)', 'Action'),
+            ('5', 'Two parents', '', 'Objective 2 (weight: 50%, Id: 2) / Objective 2 (weight: 50%, Id: 2)', 'Outcome'),
+            ('6', 'Loop A', '', 'Loop B (weight: 100%, Id: 7)', 'Action'),
+            ('7', 'Loop B', '', 'Loop A (weight: 100%, Id: 6)', 'Action'),
+            ('2', 'Copy of Objective 2', '', 'Theme 1 (weight: 100%, Id: 1)', 'Objective'),
+        ]
+        for goal_id, title, tag, alignment, object_type in rows:
+            ws.append([f'=HYPERLINK("http://example.com/{goal_id}", "{goal_id}")', title, tag, 'Owner', 'Q1',
+                       '2024-01-01', '2024-03-31', f'Description {goal_id}', alignment, 'Metric', '50%',
+                       object_type, 'On Track'])
+        wb.save(cls.broken_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def test_valid_conversion(self):
+        from pptx import Presentation
+        from bench_make_biz_plan import iter_synthetic_rows
+
+        with Make_Biz_Plan.count_operations() as counts:
+            report = Make_Biz_Plan.validate_conversion(self.valid_path, self.template_path, (0, 0), (0, 1))
+        self.assertEqual(report['problems'], [])
+        self.assertEqual(report['goals'], 60)
+        layouts = Presentation(self.template_path).slide_masters[0].slide_layouts
+        themes = sum(row[2] == 'Theme' for row in iter_synthetic_rows(60))
+        self.assertEqual(report['layouts'], [
+            {'layout': [0, 0], 'name': layouts[0].name, 'slides': themes},
+            {'layout': [0, 1], 'name': layouts[1].name, 'slides': 60 - themes},
+        ])
+        self.assertEqual(counts[Make_Biz_Plan.SHAPES_CREATED], 0)
+
+        selected = Make_Biz_Plan.validate_conversion(self.valid_path, self.template_path, (0, 0), (0, 1),
+                                                     select={'statuses': ['Behind']})
+        self.assertLess(sum(layout['slides'] for layout in selected['layouts']), 60)
+
+    def test_reports_every_problem(self):
+        report = Make_Biz_Plan.validate_conversion(self.broken_path, self.template_path, (0, 0), (3, 40))
+        problems = report['problems']
+        expected = ['Row 4 (Bad type): Invalid object type: Initiative',
+                    'Row 5 (Lost action): Aligned to unknown goal id 99',
+                    'Row 5 (Lost action): No parent goal found',
+                    'Row 6 (Two parents): More than one parent goal',
+                    'Alignment cycle between goals',
+                    'Row 9 (Copy of Objective 2): Duplicate goal id 2, also on row 3',
+                    'Invalid OKR slide master: 3']
+        for text in expected:
+            self.assertEqual(len([problem for problem in problems if text in problem]), 1, (text, problems))
+        self.assertEqual(len(problems), len(expected))
+
+        report = Make_Biz_Plan.validate_conversion(self.valid_path, self.template_path, (0, 0), (0, 40))
+        self.assertEqual(report['problems'], ['Invalid OKR slide layout: 40. Slide master 0 has 11'])
+        report = Make_Biz_Plan.validate_conversion('missing.xlsx', self.valid_path, (0, 0), (0, 1))
+        self.assertEqual(len(report['problems']), 2)
+
+    def test_cli_dry_run_writes_nothing(self):
+        target = os.path.join(self.temp_dir.name, 'dry.pptx')
+        args = ['-X', 'importtime', 'Make_Biz_Plan.py', '--dry-run', '--template_powerpoint', self.template_path,
+                '--target_bizplan_powerpoint', target, '--theme_slide_master_layout', '0',
+                '--okr_slide_master', '0', '--okr_slide_master_layout', '1']
+        cwd = os.path.dirname(os.path.abspath(__file__))
+        result = subprocess.run([sys.executable, *args, '--source_workbook', self.valid_path],
+                                capture_output=True, text=True, cwd=cwd)
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        self.assertIn('60 goals', result.stdout)
+        self.assertIn('layout 1 (Title and Content)', result.stdout)
+        # The template is read straight from its zip and the workbook with the native reader
+        imported = [line.split('|')[-1].strip() for line in result.stderr.splitlines() if '|' in line]
+        self.assertNotIn('pptx', imported)
+        self.assertNotIn('openpyxl', imported)
+        self.assertFalse(os.path.exists(target))
+
+        result = subprocess.run([sys.executable, *args, '--source_workbook', self.broken_path],
+                                capture_output=True, text=True, cwd=cwd)
+        self.assertEqual(result.returncode, 1)
+        self.assertIn('6 problems:', result.stdout)
+
 
 if __name__ == '__main__':
     unittest.main()
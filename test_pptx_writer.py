@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+import zipfile
+from lxml import etree
+from openpyxl import Workbook
+from pptx import Presentation
+import Make_Biz_Plan
+from Make_Biz_Plan import GOAL_COLUMNS, PROTOTYPE_ENGINE, RENDER_ENGINES
+from pptx_writer import StreamingPresentationWriter
+
+
+class TestStreamingPresentationWriter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.template_path = os.path.join(self.temp_dir.name, 'template.pptx')
+        template = Presentation()
+        template.slides.add_slide(template.slide_layouts[6])
+        template.save(self.template_path)
+
+        self.workbook_path = os.path.join(self.temp_dir.name, 'goals.xlsx')
+        wb = Workbook()
+        ws = wb.active
+        ws.append(GOAL_COLUMNS)
+        rows = [
+            ('1', 'Theme 1', 'Theme', '', 'Objective'),
+            ('2', 'Objective 1', '', 'Theme 1 (weight: 100%, Id: 1) / MWB: Grow (weight: 0%, Id: 1)', 'Objective'),
+            ('3', 'Outcome 1', '', 'Objective 1 (weight: 100%, Id: 2)', 'Outcome'),
+            ('4', 'Action 1', '', 'Objective 1 (weight: 100%, Id: 2)', 'Action'),
+            ('5', 'Objective 2', '', 'Theme 1 (weight: 100%, Id: 1)', 'Objective'),
+            ('6', 'Action 2', '', 'Objective 2 (weight: 100%, Id: 5)', 'Action'),
+        ]
+        for goal_id, title, tag, alignment, object_type in rows:
+            ws.append([f'=HYPERLINK("http://example.com/{goal_id}", "{goal_id}")', title, tag, 'Owner', 'Q1',
+                       '2024-01-01', '2024-03-31', f'Description {goal_id}', alignment, 'Metric', '50%',
+                       object_type, 'On Track'])
+        wb.save(self.workbook_path)
+        self.original_goals_dict = Make_Biz_Plan.goals_dict
+
+    def tearDown(self):
+        Make_Biz_Plan.goals_dict = self.original_goals_dict
+        self.temp_dir.cleanup()
+
+    def render(self, name, **options):
+        path = os.path.join(self.temp_dir.name, name)
+        Make_Biz_Plan.main(self.workbook_path, self.template_path, path, 0, 0, 0, 1, **options)
+        return path
+
+    @staticmethod
+    def package_contents(path):
+        prs = Presentation(path)
+        slides = []
+        for slide in prs.slides:
+            rels = sorted((rel.rId, rel.reltype, rel.target_ref if rel.is_external else str(rel.target_part.partname))
+                          for rel in slide.part.rels.values())
+            slides.append((str(slide.part.partname), slide.slide_id, etree.tostring(slide.part._element), rels))
+        parts = sorted((str(part.partname), part.content_type) for part in prs.part.package.iter_parts())
+        return slides, parts
+
+    def test_streamed_deck_matches_saved_deck(self):
+        for render_engine in RENDER_ENGINES:
+            for workers in (1, 2):
+                expected = self.package_contents(self.render('saved.pptx', render_engine=render_engine, workers=workers))
+                streamed = self.render('streamed.pptx', render_engine=render_engine, workers=workers, stream=True)
+                self.assertEqual(self.package_contents(streamed), expected)
+                self.assertEqual(len(expected[0]), 7)
+                with zipfile.ZipFile(streamed) as archive:
+                    names = archive.namelist()
+                    self.assertEqual(len(names), len(set(names)))
+                    self.assertEqual(sum(name.startswith('ppt/media/') for name in names), 3)
+
+    def test_streamed_slides_leave_the_presentation(self):
+        prs = Presentation(self.template_path)
+        with StreamingPresentationWriter(prs, os.path.join(self.temp_dir.name, 'out.pptx')) as writer:
+            for _ in range(3):
+                writer.add_slide(prs.slides.add_slide(prs.slide_layouts[1]))
+                self.assertEqual(len(prs.slides), 1)
+        self.assertEqual(len(Presentation(os.path.join(self.temp_dir.name, 'out.pptx')).slides), 4)
+
+    def test_only_last_slide_can_be_streamed(self):
+        prs = Presentation(self.template_path)
+        first = prs.slides.add_slide(prs.slide_layouts[1])
+        prs.slides.add_slide(prs.slide_layouts[1])
+        writer = StreamingPresentationWriter(prs, os.path.join(self.temp_dir.name, 'out.pptx'))
+        with self.assertRaises(ValueError):
+            writer.add_slide(first)
+        writer.abort()
+
+    def test_failed_run_leaves_no_file(self):
+        path = os.path.join(self.temp_dir.name, 'out.pptx')
+        with self.assertRaises(ValueError):
+            Make_Biz_Plan.main(self.workbook_path, self.template_path, path, 0, 0, 0, 99,
+                               render_engine=PROTOTYPE_ENGINE, stream=True)
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
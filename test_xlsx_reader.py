@@ -0,0 +1,121 @@
+import datetime
+import os
+import tempfile
+import unittest
+import zipfile
+from openpyxl import Workbook, load_workbook
+import Make_Biz_Plan
+from Make_Biz_Plan import GOAL_COLUMNS, NATIVE_READER, load_goals_from_workbook
+from xlsx_reader import iter_sheet_rows
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+</Types>"""
+
+ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="Goals" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+</Relationships>"""
+
+# Inline strings, rich text runs, cells without references and a missing row
+SHEET = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>
+<row r="1"><c t="inlineStr"><is><t>Id</t></is></c><c t="inlineStr"><is><t>Title</t></is></c><c t="inlineStr"><is><t>Score</t></is></c></row>
+<row r="2"><c r="A2"><f>HYPERLINK("http://example.com/1", "1")</f><v>1</v></c><c r="B2" t="inlineStr"><is><r><t>Rich </t></r><r><t>title</t></r></is></c><c r="C2"><v>2.5</v></c></row>
+<row r="4"><c r="A4" t="str"><v>plain</v></c><c r="C4" t="b"><v>1</v></c></row>
+</sheetData></worksheet>"""
+
+
+class TestNativeReaderEquivalence(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.original_goals_dict = Make_Biz_Plan.goals_dict
+
+    def tearDown(self):
+        Make_Biz_Plan.goals_dict = self.original_goals_dict
+        self.temp_dir.cleanup()
+
+    def openpyxl_rows(self, path):
+        wb = load_workbook(path)
+        rows = [list(row) for row in wb.active.iter_rows(values_only=True)]
+        wb.close()
+        return rows
+
+    def write_goal_workbook(self):
+        path = os.path.join(self.temp_dir.name, 'goals.xlsx')
+        wb = Workbook()
+        ws = wb.active
+        ws.append(['Extra'] + GOAL_COLUMNS)
+        ws.append(['x', '=HYPERLINK("http://example.com/1", "1")', 'Theme 1', 'Theme', 'John', 'Q1',
+                   datetime.datetime(2024, 1, 1), datetime.datetime(2024, 3, 31), 'Theme Description', '',
+                   'Metric1', 100, 'Objective', 'On Track'])
+        ws.append(['y', '=HYPERLINK("http://example.com/2", "2")', 'Objective 1', '', 'Jane', 'Q1',
+                   datetime.datetime(2024, 1, 1), datetime.datetime(2024, 3, 31), 'Objective Description',
+                   '(weight: 100%, Id: 1)', 'Metric2', 0.5, 'Objective', True])
+        ws.append([])
+        ws.append(['z', '=HYPERLINK("http://example.com/3", "3")', 'Action 1', None, 'Bob', 'Q1',
+                   '2024-01-01', '2024-03-31', 'Action Description', '(weight: 100%, Id: 2)', 'Metric3',
+                   '75%', 'Action', 'On Track'])
+        wb.save(path)
+        return path
+
+    def write_crafted_workbook(self):
+        path = os.path.join(self.temp_dir.name, 'crafted.xlsx')
+        with zipfile.ZipFile(path, 'w') as archive:
+            archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+            archive.writestr('_rels/.rels', ROOT_RELS)
+            archive.writestr('xl/workbook.xml', WORKBOOK)
+            archive.writestr('xl/_rels/workbook.xml.rels', WORKBOOK_RELS)
+            archive.writestr('xl/worksheets/sheet1.xml', SHEET)
+        return path
+
+    def test_all_columns_match_openpyxl(self):
+        path = self.write_goal_workbook()
+        self.assertEqual([list(row) for row in iter_sheet_rows(path)], self.openpyxl_rows(path))
+
+    def test_selected_columns_match_openpyxl(self):
+        path = self.write_goal_workbook()
+        expected = self.openpyxl_rows(path)
+        positions = [expected[0].index(name) for name in GOAL_COLUMNS]
+        expected = [[row[i] for i in positions] for row in expected]
+        self.assertEqual([list(row) for row in iter_sheet_rows(path, GOAL_COLUMNS)], expected)
+
+    def test_inline_strings_and_missing_rows_match_openpyxl(self):
+        path = self.write_crafted_workbook()
+        self.assertEqual([list(row) for row in iter_sheet_rows(path)], self.openpyxl_rows(path))
+
+    def test_missing_column_raises(self):
+        path = self.write_crafted_workbook()
+        with self.assertRaises(ValueError):
+            list(iter_sheet_rows(path, ['Id', 'Owner']))
+
+    def test_native_reader_loads_same_goals(self):
+        path = self.write_goal_workbook()
+        expected_goals, expected_dict = load_goals_from_workbook(path)
+        expected = [(goal.okr_id, goal.title, goal.start_date, goal.target, goal.row_number) for goal in expected_goals]
+        expected_ids = list(expected_dict)
+        goals, goals_dict = load_goals_from_workbook(path, reader=NATIVE_READER)
+        self.assertEqual([(goal.okr_id, goal.title, goal.start_date, goal.target, goal.row_number) for goal in goals], expected)
+        self.assertEqual(list(goals_dict), expected_ids)
+
+    def test_native_reader_missing_file(self):
+        with self.assertRaises(ValueError):
+            load_goals_from_workbook(os.path.join(self.temp_dir.name, 'missing.xlsx'), reader=NATIVE_READER)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,338 @@
+"""
+Fast reader for the active sheet of an .xlsx workbook.
+
+The sheet XML and the shared-strings part are read straight from the zip
+archive with an incremental XML parser, and only the requested columns are
+decoded. Cell values follow openpyxl's conventions (formulas are returned as
+"=..." strings, numbers are cast to int or float, date-formatted numbers become
+datetimes), so the rows can be used in place of openpyxl's
+iter_rows(values_only=True).
+"""
+
+import posixpath
+import zipfile
+from lxml.etree import iterparse, fromstring
+
+SHEET_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+PACKAGE_RELS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+OFFICE_RELS_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+OFFICE_DOCUMENT_REL = OFFICE_RELS_NS + '/officeDocument'
+SHARED_STRINGS_REL = OFFICE_RELS_NS + '/sharedStrings'
+STYLES_REL = OFFICE_RELS_NS + '/styles'
+
+ROW_TAG = '{%s}row' % SHEET_MAIN_NS
+VALUE_TAG = '{%s}v' % SHEET_MAIN_NS
+FORMULA_TAG = '{%s}f' % SHEET_MAIN_NS
+INLINE_STRING_TAG = '{%s}is' % SHEET_MAIN_NS
+STRING_ITEM_TAG = '{%s}si' % SHEET_MAIN_NS
+TEXT_TAG = '{%s}t' % SHEET_MAIN_NS
+RICH_RUN_TAG = '{%s}r' % SHEET_MAIN_NS
+RELATIONSHIP_TAG = '{%s}Relationship' % PACKAGE_RELS_NS
+
+
+def _cast_number(value):
+    """Convert a number stored as text to an int or float, as openpyxl does."""
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+def _text_content(element):
+    """Return the plain text of a string item or inline string, ignoring phonetic runs."""
+    snippets = []
+    for child in element:
+        if child.tag == TEXT_TAG:
+            snippets.append(child.text or '')
+        elif child.tag == RICH_RUN_TAG:
+            text = child.find(TEXT_TAG)
+            if text is not None:
+                snippets.append(text.text or '')
+    return ''.join(snippets)
+
+
+def _column_index(letters):
+    """Convert a column reference such as 'AB' to its 1-based index."""
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - 64
+    return index
+
+
+class XlsxSheetReader:
+    """
+    Read rows from the active worksheet of an .xlsx file.
+
+    Args:
+        workbook_path (str): Path to the .xlsx file.
+    """
+
+    def __init__(self, workbook_path):
+        self.workbook_path = workbook_path
+        with zipfile.ZipFile(workbook_path) as archive:
+            workbook_part = self._office_document_part(archive)
+            workbook = fromstring(archive.read(workbook_part))
+            rels = self._part_rels(archive, workbook_part)
+
+            self.sheet_part = self._active_sheet_part(workbook, rels)
+            self.date1904 = self._uses_1904_epoch(workbook)
+            self.shared_strings = self._read_shared_strings(archive, rels.get(SHARED_STRINGS_REL))
+            self.date_styles, self.timedelta_styles = self._read_date_styles(archive, rels.get(STYLES_REL))
+
+    @staticmethod
+    def _resolve(source_part, target):
+        if target.startswith('/'):
+            return target[1:]
+        return posixpath.normpath(posixpath.join(posixpath.dirname(source_part), target))
+
+    @classmethod
+    def _part_rels(cls, archive, part):
+        """Return the relationships of a part, keyed by rId and by relationship type."""
+        rels_part = posixpath.join(posixpath.dirname(part), '_rels', posixpath.basename(part) + '.rels')
+        rels = {}
+        try:
+            root = fromstring(archive.read(rels_part))
+        except KeyError:
+            return rels
+        for rel in root.iter(RELATIONSHIP_TAG):
+            if rel.get('TargetMode') == 'External':
+                continue
+            target = cls._resolve(part, rel.get('Target'))
+            rels[rel.get('Id')] = target
+            rels.setdefault(rel.get('Type'), target)
+        return rels
+
+    @classmethod
+    def _office_document_part(cls, archive):
+        return cls._part_rels(archive, '').get(OFFICE_DOCUMENT_REL, 'xl/workbook.xml')
+
+    @staticmethod
+    def _active_sheet_part(workbook, rels):
+        active = 0
+        view = workbook.find('{%s}bookViews/{%s}workbookView' % (SHEET_MAIN_NS, SHEET_MAIN_NS))
+        if view is not None:
+            active = int(view.get('activeTab', 0))
+        sheets = workbook.findall('{%s}sheets/{%s}sheet' % (SHEET_MAIN_NS, SHEET_MAIN_NS))
+        if not sheets:
+            raise ValueError("Workbook does not contain any sheets")
+        sheet = sheets[min(active, len(sheets) - 1)]
+        return rels[sheet.get('{%s}id' % OFFICE_RELS_NS)]
+
+    @staticmethod
+    def _uses_1904_epoch(workbook):
+        properties = workbook.find('{%s}workbookPr' % SHEET_MAIN_NS)
+        return properties is not None and properties.get('date1904') in ('1', 'true')
+
+    @staticmethod
+    def _read_shared_strings(archive, part):
+        strings = []
+        if part is None:
+            return strings
+        with archive.open(part) as source:
+            for _, node in iterparse(source):
+                if node.tag == STRING_ITEM_TAG:
+                    strings.append(_text_content(node).replace('x005F_', ''))
+                    node.clear()
+        return strings
+
+    @staticmethod
+    def _read_date_styles(archive, part):
+        """Return the indices of cell styles that format numbers as dates and as durations."""
+        if part is None:
+            return frozenset(), frozenset()
+        root = fromstring(archive.read(part))
+        num_fmt_ids = [int(xf.get('numFmtId', 0))
+                       for xf in root.iterfind('{%s}cellXfs/{%s}xf' % (SHEET_MAIN_NS, SHEET_MAIN_NS))]
+        if not any(num_fmt_ids):
+            # Every cell style is General, so nothing is a date and openpyxl need not be imported
+            return frozenset(), frozenset()
+        from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
+
+        custom = {}
+        for num_fmt in root.iterfind('{%s}numFmts/{%s}numFmt' % (SHEET_MAIN_NS, SHEET_MAIN_NS)):
+            custom[int(num_fmt.get('numFmtId'))] = num_fmt.get('formatCode')
+        date_styles, timedelta_styles = set(), set()
+        for idx, num_fmt_id in enumerate(num_fmt_ids):
+            fmt = custom[num_fmt_id] if num_fmt_id in custom else builtin_format_code(num_fmt_id)
+            if fmt is None:
+                continue
+            if is_date_format(fmt):
+                date_styles.add(idx)
+            if is_timedelta_format(fmt):
+                timedelta_styles.add(idx)
+        return frozenset(date_styles), frozenset(timedelta_styles)
+
+    def _number_value(self, text, style):
+        value = _cast_number(text)
+        if style and int(style) in self.date_styles:
+            from openpyxl.utils.datetime import from_excel, CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+
+            epoch = CALENDAR_MAC_1904 if self.date1904 else CALENDAR_WINDOWS_1900
+            try:
+                value = from_excel(value, epoch, timedelta=int(style) in self.timedelta_styles)
+            except (OverflowError, ValueError):
+                value = "#VALUE!"
+        return value
+
+    def _formula_value(self, formula, coordinate, shared_formulae):
+        value = "="
+        if formula.text is not None:
+            value += formula.text
+        if formula.get('t') == 'shared':
+            idx = formula.get('si')
+            if idx in shared_formulae:
+                value = shared_formulae[idx].translate_formula(coordinate)
+            elif value != "=":
+                from openpyxl.formula.translate import Translator
+
+                shared_formulae[idx] = Translator(value, coordinate)
+        return value
+
+    def _cell_value(self, cell, shared_formulae):
+        value = formula = inline = None
+        for child in cell:
+            tag = child.tag
+            if tag == VALUE_TAG:
+                value = child.text
+            elif tag == FORMULA_TAG:
+                formula = child
+            elif tag == INLINE_STRING_TAG:
+                inline = child
+        if formula is not None:
+            return self._formula_value(formula, cell.get('r'), shared_formulae)
+        data_type = cell.get('t', 'n')
+        if data_type == 'inlineStr':
+            return _text_content(inline) if inline is not None else None
+        if not value:
+            return None
+        if data_type == 'n':
+            return self._number_value(value, cell.get('s'))
+        if data_type == 's':
+            return self.shared_strings[int(value)]
+        if data_type == 'b':
+            return bool(int(value))
+        if data_type == 'd':
+            from openpyxl.utils.datetime import from_ISO8601
+
+            return from_ISO8601(value)
+        return value
+
+    def iter_rows(self, columns=None):
+        """
+        Yield the rows of the active sheet as tuples of cell values.
+
+        The first row yielded is the header row. Missing rows between populated
+        rows are yielded as empty rows so row positions match openpyxl.
+
+        Args:
+            columns (list, optional): Header names to keep. When given, the header row is
+                returned as these names and every data row holds only these columns, in
+                this order. Defaults to None, which keeps every column of the header row.
+
+        Raises:
+            ValueError: If a requested column is not in the header row.
+
+        Yields:
+            tuple: The values of each row.
+        """
+        shared_formulae = {}
+        wanted = None
+        width = 0
+        row_counter = 0
+        column_cache = {}
+
+        with zipfile.ZipFile(self.workbook_path) as archive, archive.open(self.sheet_part) as source:
+            for _, element in iterparse(source, tag=ROW_TAG):
+                row_number = element.get('r')
+                row_number = int(row_number) if row_number else row_counter + 1
+                if wanted is None:
+                    # The first row decides the column layout; a sheet starting below row 1 has a blank header
+                    header = self._read_cells(element, None, 0, column_cache, shared_formulae) if row_number == 1 else {}
+                    wanted, width = self._select_columns(header, columns)
+                    yield tuple(columns) if columns is not None else tuple(header.get(col) for col in range(1, width + 1))
+                    row_counter = 1
+                    if row_number == 1:
+                        self._release(element)
+                        continue
+
+                empty_row = (None,) * width
+                while row_counter + 1 < row_number:
+                    row_counter += 1
+                    yield empty_row
+                row_counter = row_number
+
+                values = [None] * width
+                cells = self._read_cells(element, wanted, width, column_cache, shared_formulae)
+                for position, value in cells.items():
+                    values[position] = value
+                self._release(element)
+                yield tuple(values)
+
+        if wanted is None:
+            # A sheet without rows still has a (blank) header row, matching openpyxl
+            wanted, width = self._select_columns({}, columns)
+            yield tuple(columns) if columns is not None else ()
+
+    @staticmethod
+    def _release(row):
+        """Free a parsed row and the rows before it so memory stays bounded."""
+        row.clear()
+        parent = row.getparent()
+        while row.getprevious() is not None:
+            del parent[0]
+
+    @staticmethod
+    def _select_columns(header, columns):
+        """Map sheet column indices to output positions."""
+        if columns is None:
+            width = max(header, default=0)
+            return {col: col - 1 for col in range(1, width + 1)}, width
+        by_name = {}
+        for col, name in sorted(header.items()):
+            by_name.setdefault(name, col)
+        wanted = {}
+        for position, name in enumerate(columns):
+            if name not in by_name:
+                raise ValueError(f"Column not found in header row: {name}")
+            wanted[by_name[name]] = position
+        return wanted, len(columns)
+
+    def _read_cells(self, row, wanted, width, column_cache, shared_formulae):
+        """Return {position: value} for the wanted cells of a row, or {column: value} when wanted is None."""
+        values = {}
+        col_counter = 0
+        for cell in row:
+            coordinate = cell.get('r')
+            if coordinate:
+                letters = coordinate.rstrip('0123456789')
+                col_counter = column_cache.get(letters)
+                if col_counter is None:
+                    col_counter = column_cache[letters] = _column_index(letters)
+            else:
+                col_counter += 1
+            if wanted is None:
+                values[col_counter] = self._cell_value(cell, shared_formulae)
+                continue
+            position = wanted.get(col_counter)
+            if position is not None:
+                values[position] = self._cell_value(cell, shared_formulae)
+            else:
+                # Shared formulas are defined on their first cell, which may sit in a skipped column
+                formula = cell.find(FORMULA_TAG)
+                if formula is not None and formula.get('t') == 'shared' and formula.text:
+                    self._formula_value(formula, coordinate, shared_formulae)
+        return values
+
+
+def iter_sheet_rows(workbook_path, columns=None):
+    """
+    Yield the rows of the active sheet of an .xlsx workbook.
+
+    Args:
+        workbook_path (str): Path to the .xlsx file.
+        columns (list, optional): Header names to keep. See XlsxSheetReader.iter_rows.
+
+    Yields:
+        tuple: The header row followed by each data row.
+    """
+    return XlsxSheetReader(workbook_path).iter_rows(columns)